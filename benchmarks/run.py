@@ -0,0 +1,277 @@
+"""
+Benchmark suite: measures the time, the peak memory and the throughput of the main stages of srsparser on synthetic
+data (see synthetic.py). The data is generated locally, so the suite runs offline.
+
+Each stage is run once under tracemalloc (the peak memory of Python allocations), then several times to measure
+the time (the median is reported). The stages are run with the morphological analysis and heading caches disabled,
+so every timed run analyzes the words with pymorphy2 and scores the paragraphs against the template; the stages
+with the suffix _warm are run with the default caches, which are populated by the first run, so their time is the time
+of the cached path. The report can be saved as a baseline and compared with later runs, for example, after an upgrade
+of pymorphy2, gensim or python-docx.
+
+Usage:
+python benchmarks/run.py [--stages parse_docx,parse_docx_warm] [--repeat 3] [--documents 10] [--paragraphs 5]
+                         [--table-density 0.2] [--table-rows 4] [--collection 100] [--keywords-documents 3]
+                         [--index-documents 1000] [--queries 100]
+                         [--save-baseline baseline.json] [--baseline baseline.json] [--tolerance 0.1]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from importlib import metadata
+from typing import Callable, Dict, List, Tuple
+
+# the benchmarks measure the working tree, not the installed package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import (GOST_TEMPLATE, SENTENCES, get_leaf_names, make_collection, make_docx,  # noqa: E402
+                       make_zipf_collection)
+
+PACKAGES = ['python-docx', 'pymorphy2', 'gensim', 'pullenti', 'rusenttokenize', 'numpy', 'scipy']
+
+# stage setup: (arguments, temporary directory) -> (function running the stage, number of processed items, unit)
+StageSetup = Callable[[argparse.Namespace, str], Tuple[Callable[[], None], int, str]]
+
+
+def make_documents(args: argparse.Namespace, tmp_dir: str) -> List[str]:
+    paths = []
+    for i in range(args.documents):
+        path = os.path.join(tmp_dir, f'document_{i}.docx')
+        if not os.path.exists(path):
+            make_docx(path, GOST_TEMPLATE, args.paragraphs, args.table_density, args.table_rows, seed=i)
+        paths.append(path)
+    return paths
+
+
+def make_language_processor(warm=False, init_pullenti=False):
+    from srsparser import LanguageProcessor, configs
+
+    # without the cache the words are analyzed by pymorphy2 in every run
+    return LanguageProcessor(init_pullenti=init_pullenti, morph_cache_size=configs.MORPH_CACHE_SIZE if warm else 0)
+
+
+def setup_parse_docx(args: argparse.Namespace, tmp_dir: str, streaming=False, warm=False):
+    from srsparser import Parser, configs
+
+    paths = make_documents(args, tmp_dir)
+    parser = Parser(GOST_TEMPLATE, heading_cache_size=configs.HEADING_CACHE_SIZE if warm else 0,
+                    nlp=make_language_processor(warm))
+
+    def run():
+        for path in paths:
+            parser.parse_docx(path, streaming=streaming)
+
+    return run, len(paths), 'documents'
+
+
+def setup_parse_docx_streaming(args: argparse.Namespace, tmp_dir: str):
+    return setup_parse_docx(args, tmp_dir, streaming=True)
+
+
+def setup_parse_docx_warm(args: argparse.Namespace, tmp_dir: str):
+    return setup_parse_docx(args, tmp_dir, warm=True)
+
+
+def setup_strings_similarity(args: argparse.Namespace, tmp_dir: str):
+    nlp = make_language_processor()
+    pairs = [(sentence, name) for sentence in SENTENCES for name in get_leaf_names(GOST_TEMPLATE)]
+
+    def run():
+        for s1, s2 in pairs:
+            nlp.strings_similarity(s1, s2)
+
+    return run, len(pairs), 'pairs'
+
+
+def setup_similarity_matrix(args: argparse.Namespace, tmp_dir: str):
+    nlp = make_language_processor()
+    names = get_leaf_names(GOST_TEMPLATE)
+
+    def run():
+        nlp.similarity_matrix(SENTENCES, names)
+
+    return run, len(SENTENCES) * len(names), 'pairs'
+
+
+def setup_get_tf_idf_pairs(args: argparse.Namespace, tmp_dir: str, warm=False):
+    from srsparser import SectionsTree
+
+    nlp = make_language_processor(warm)
+    documents = [SectionsTree(record['structure']).get_content() for record in make_collection(args.collection)]
+
+    def run():
+        nlp.get_tf_idf_pairs(documents)
+
+    return run, len(documents), 'documents'
+
+
+def setup_get_tf_idf_pairs_warm(args: argparse.Namespace, tmp_dir: str):
+    return setup_get_tf_idf_pairs(args, tmp_dir, warm=True)
+
+
+def setup_get_structure_rationized_keywords(args: argparse.Namespace, tmp_dir: str):
+    nlp = make_language_processor(init_pullenti=True)
+    collection = make_collection(args.collection)
+    document_names = [record['name'] for record in collection[:args.keywords_documents]]
+
+    def run():
+        for document_name in document_names:
+            nlp.get_structure_rationized_keywords(collection, document_name)
+
+    return run, len(document_names), 'documents'
+
+
+def setup_get_similar(args: argparse.Namespace, tmp_dir: str):
+    from srsparser import LanguageProcessor, SimilarityIndex
+
+    nlp = LanguageProcessor(init_pullenti=False)
+    collection = make_zipf_collection(args.index_documents)
+    index = SimilarityIndex(nlp)
+    index.add_documents(collection)
+    document_names = [record['name'] for record in collection[:args.queries]]
+
+    def run():
+        for document_name in document_names:
+            index.get_similar(document_name)
+
+    return run, len(document_names), 'queries'
+
+
+STAGES: Dict[str, StageSetup] = {
+    'parse_docx': setup_parse_docx,
+    'parse_docx_streaming': setup_parse_docx_streaming,
+    'parse_docx_warm': setup_parse_docx_warm,
+    'strings_similarity': setup_strings_similarity,
+    'similarity_matrix': setup_similarity_matrix,
+    'get_tf_idf_pairs': setup_get_tf_idf_pairs,
+    'get_tf_idf_pairs_warm': setup_get_tf_idf_pairs_warm,
+    'get_structure_rationized_keywords': setup_get_structure_rationized_keywords,
+    'get_similar': setup_get_similar,
+}
+
+
+def measure(run: Callable[[], None], items: int, unit: str, repeat: int) -> dict:
+    """
+    Measures the stage: the peak memory of the first run and the median time of the next `repeat` runs.
+    """
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    seconds = statistics.median(timings)
+
+    return {
+        'items': items,
+        'unit': unit,
+        'seconds': seconds,
+        'peak_memory_mb': peak / 2 ** 20,
+        'throughput': items / seconds if seconds > 0 else float('inf'),
+    }
+
+
+def get_environment() -> dict:
+    versions = {}
+    for package in PACKAGES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return {'python': platform.python_version(), 'platform': platform.platform(), 'packages': versions}
+
+
+def print_report(results: Dict[str, dict], baseline: dict = None, tolerance=0.1) -> bool:
+    """
+    Prints the results of the stages and their comparison with the baseline.
+
+    :return: True — the time of at least one stage exceeds the baseline time by more than `tolerance`,
+        else — False.
+    """
+    regressed = False
+    header = f'{"stage":<36}{"items":>16}{"time, s":>12}{"peak, MB":>12}{"throughput":>24}'
+    if baseline is not None:
+        header += f'{"baseline, s":>14}{"change":>10}'
+    print(header)
+
+    for name, result in results.items():
+        line = (f'{name:<36}{result["items"]:>6} {result["unit"]:<9}{result["seconds"]:>12.3f}'
+                f'{result["peak_memory_mb"]:>12.1f}{result["throughput"]:>14.1f} {result["unit"]}/s')
+        if baseline is not None and name in baseline['stages']:
+            baseline_seconds = baseline['stages'][name]['seconds']
+            change = result['seconds'] / baseline_seconds - 1
+            line += f'{baseline_seconds:>14.3f}{change:>+10.1%}'
+            if change > tolerance:
+                line += '  REGRESSION'
+                regressed = True
+        print(line)
+    return regressed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--stages', default=','.join(STAGES),
+                            help='comma-separated stages to run (default: all)')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='number of timed runs of each stage')
+    arg_parser.add_argument('--documents', type=int, default=10, help='number of .docx documents to parse')
+    arg_parser.add_argument('--paragraphs', type=int, default=5, help='number of paragraphs of each section')
+    arg_parser.add_argument('--table-density', type=float, default=0.2,
+                            help='probability of a table after each paragraph')
+    arg_parser.add_argument('--table-rows', type=int, default=4, help='number of rows of each table')
+    arg_parser.add_argument('--collection', type=int, default=100, help='number of documents of the collection')
+    arg_parser.add_argument('--keywords-documents', type=int, default=3,
+                            help='number of documents whose rationized keywords are extracted')
+    arg_parser.add_argument('--index-documents', type=int, default=1000,
+                            help="number of documents of the similarity index (words distributed by Zipf's law)")
+    arg_parser.add_argument('--queries', type=int, default=100, help='number of similarity search queries')
+    arg_parser.add_argument('--save-baseline', metavar='PATH', help='save the results to the JSON file')
+    arg_parser.add_argument('--baseline', metavar='PATH', help='compare the results with the saved baseline')
+    arg_parser.add_argument('--tolerance', type=float, default=0.1,
+                            help='allowed relative increase of the time compared to the baseline')
+    args = arg_parser.parse_args()
+
+    stage_names = [name.strip() for name in args.stages.split(',') if name.strip()]
+    unknown = [name for name in stage_names if name not in STAGES]
+    if unknown:
+        arg_parser.error(f'unknown stages: {", ".join(unknown)} (available: {", ".join(STAGES)})')
+
+    parameters = {key: value for key, value in vars(args).items()
+                  if key not in ('stages', 'save_baseline', 'baseline', 'tolerance')}
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+        if baseline['parameters'] != parameters:
+            print(f'warning: the baseline was measured with other parameters: {baseline["parameters"]}',
+                  file=sys.stderr)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in stage_names:
+            run, items, unit = STAGES[name](args, tmp_dir)
+            results[name] = measure(run, items, unit, args.repeat)
+
+    regressed = print_report(results, baseline, args.tolerance)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as file:
+            json.dump({'environment': get_environment(), 'parameters': parameters, 'stages': results}, file,
+                      indent=2)
+
+    if regressed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Startup benchmark: measures the time of importing srsparser and of the first access to its classes.
+
+Each statement is executed in a fresh interpreter, the median of several runs is reported.
+
+Usage: python benchmarks/startup.py [--runs 5]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = {
+    'import srsparser': 'import srsparser',
+    'from srsparser import SectionsTree': 'from srsparser import SectionsTree',
+    'from srsparser import LanguageProcessor': 'from srsparser import LanguageProcessor',
+    'from srsparser import Parser': 'from srsparser import Parser',
+}
+
+TIMER = '''
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+'''
+
+
+def measure(statement: str, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', TIMER.format(statement=statement)],
+                                check=True, capture_output=True, text=True).stdout
+        timings.append(float(output))
+    return statistics.median(timings)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--runs', type=int, default=5, help='number of runs of each statement')
+    args = arg_parser.parse_args()
+
+    for name, statement in STATEMENTS.items():
+        print(f'{name:<45}{measure(statement, args.runs) * 1000:>10.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
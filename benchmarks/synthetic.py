@@ -0,0 +1,215 @@
+"""
+Generators of synthetic data for the benchmarks: a GOST 34.602-89 template, .docx technical assignments built with
+python-docx and collections of parsed documents shaped like the MongoDB records (with the sentences of technical
+assignments or with words of a large vocabulary distributed by Zipf's law).
+
+Usage: python benchmarks/synthetic.py OUTPUT_DIR [--documents 10] [--paragraphs 5] [--table-density 0.2]
+"""
+import argparse
+import os
+import random
+from typing import List
+
+from docx import Document
+
+GOST_TEMPLATE = {
+    'name': 'Техническое задание',
+    'children': [
+        {'name': 'Общие сведения', 'text': ''},
+        {'name': 'Назначение и цели создания (развития) системы', 'text': ''},
+        {'name': 'Характеристика объектов автоматизации', 'text': ''},
+        {'name': 'Требования к системе', 'children': [
+            {'name': 'Требования к системе в целом', 'children': [
+                {'name': 'Требования к структуре и функционированию системы', 'text': ''},
+                {'name': 'Требования к численности и квалификации персонала системы и режиму его работы', 'text': ''},
+                {'name': 'Показатели назначения', 'text': ''},
+                {'name': 'Требования к надежности', 'text': ''},
+                {'name': 'Требования к безопасности', 'text': ''},
+                {'name': 'Требования к эргономике и технической эстетике', 'text': ''},
+                {'name': 'Требования к транспортабельности для подвижных АС', 'text': ''},
+                {'name': 'Требования к эксплуатации, техническому обслуживанию, ремонту и хранению компонентов системы',
+                 'text': ''},
+                {'name': 'Требования к защите информации от несанкционированного доступа', 'text': ''},
+                {'name': 'Требования по сохранности информации при авариях', 'text': ''},
+                {'name': 'Требования к защите от влияния внешних воздействий', 'text': ''},
+                {'name': 'Требования к патентной чистоте', 'text': ''},
+                {'name': 'Требования по стандартизации и унификации', 'text': ''},
+                {'name': 'Дополнительные требования', 'text': ''},
+            ]},
+            {'name': 'Требования к функциям (задачам)', 'text': ''},
+            {'name': 'Требования к видам обеспечения', 'children': [
+                {'name': 'Требования к математическому обеспечению', 'text': ''},
+                {'name': 'Требования к информационному обеспечению', 'text': ''},
+                {'name': 'Требования к лингвистическому обеспечению', 'text': ''},
+                {'name': 'Требования к программному обеспечению', 'text': ''},
+                {'name': 'Требования к техническому обеспечению', 'text': ''},
+                {'name': 'Требования к метрологическому обеспечению', 'text': ''},
+                {'name': 'Требования к организационному обеспечению', 'text': ''},
+                {'name': 'Требования к методическому обеспечению', 'text': ''},
+            ]},
+        ]},
+        {'name': 'Состав и содержание работ по созданию системы', 'text': ''},
+        {'name': 'Порядок контроля и приемки системы', 'text': ''},
+        {'name': 'Требования к составу и содержанию работ по подготовке объекта автоматизации к вводу системы в действие',
+         'text': ''},
+        {'name': 'Требования к документированию', 'text': ''},
+        {'name': 'Источники разработки', 'text': ''},
+    ]
+}
+
+SENTENCES = [
+    'Подсистема оперативного учета должна содержать механизмы ввода и хранения информации о деятельности организации',
+    'Объектом автоматизации является процесс учета расчетов с работниками по оплате труда',
+    'Система должна сохранять работоспособность и обеспечивать восстановление своих функций при возникновении '
+    'внештатных ситуаций',
+    'Для эффективного функционирования системы необходим специалист по технической поддержке',
+    'Уровень хранения данных в системе должен быть построен на основе современных СУБД',
+    'Приемочные испытания должны включать проверку полноты и качества реализации необходимых функций',
+    'Пользователь должен иметь навыки работы с персональным компьютером и офисными приложениями',
+    'Система должна предусматривать возможность масштабирования по производительности и объему обрабатываемой '
+    'информации',
+    'Разработке подлежит следующая документация: инструкция пользователю, инструкция программисту',
+    'Перечень стадий и этапов работ, а также сроки их исполнения представлены в таблице',
+    'Не предъявляются',
+    'Обработка входящих документов выполняется ежедневно оператором подсистемы',
+]
+
+TABLE_CELLS = [
+    'Наименование показателя', 'Значение', 'Не более 5 секунд', 'Не менее 99,5 %', 'Ответственный', 'Срок исполнения',
+    'Заказчик', 'Исполнитель', 'Этап работ', 'Технический проект', 'Рабочая документация', 'Ввод в действие',
+]
+
+
+def get_leaf_names(structure: dict) -> List[str]:
+    """
+    Returns names of the leaf sections of the structure in the pre-order.
+    """
+    names = [structure['name']] if 'text' in structure else []
+    for child in structure.get('children', []):
+        names.extend(get_leaf_names(child))
+    return names
+
+
+def get_text(rnd: random.Random, sentences: int) -> str:
+    return ' '.join(rnd.choice(SENTENCES) + '.' for _ in range(sentences))
+
+
+def make_docx(path: str, template: dict = None, paragraphs_per_section=5, table_density=0.2, table_rows=4,
+              table_cols=3, seed=0):
+    """
+    Creates a .docx technical assignment whose sections correspond to the leaf sections of the template.
+
+    :param paragraphs_per_section: number of paragraphs of each section.
+    :param table_density: probability of a table after each paragraph.
+    """
+    rnd = random.Random(seed)
+    document = Document()
+    document.add_heading(template['name'] if template else GOST_TEMPLATE['name'], level=0)
+
+    for i, name in enumerate(get_leaf_names(template or GOST_TEMPLATE), 1):
+        if rnd.random() < 0.2:
+            # the heading to the left of the colon (see Parser.get_sections_first)
+            document.add_paragraph(f'{i}. {name}: {get_text(rnd, 1)}')
+        else:
+            document.add_paragraph(f'{i}. {name}')
+
+        for _ in range(paragraphs_per_section):
+            document.add_paragraph(get_text(rnd, rnd.randint(1, 3)))
+            if rnd.random() < table_density:
+                table = document.add_table(rows=table_rows, cols=table_cols)
+                for row in table.rows:
+                    for cell in row.cells:
+                        cell.text = rnd.choice(TABLE_CELLS)
+
+    document.save(path)
+
+
+def make_structure(template: dict, rnd: random.Random, fill_ratio=0.8, sentences_per_section=8) -> dict:
+    """
+    Returns a copy of the template with randomly filled leaf sections (empty leaf sections are excluded,
+    like in :py:meth:`SectionsTree.to_dict`).
+    """
+    if 'text' in template:
+        if rnd.random() >= fill_ratio:
+            return {}
+        return {'name': template['name'], 'text': get_text(rnd, rnd.randint(1, sentences_per_section))}
+
+    children = [make_structure(child, rnd, fill_ratio, sentences_per_section) for child in template['children']]
+    structure = {'name': template['name']}
+    children = [child for child in children if child]
+    if children:
+        structure['children'] = children
+    return structure
+
+
+def make_collection(documents=100, template: dict = None, sentences_per_section=8, seed=0) -> List[dict]:
+    """
+    Returns a collection of parsed documents shaped like the MongoDB records (dictionaries with the keys: _id, name
+    and structure).
+    """
+    rnd = random.Random(seed)
+    return [{'_id': f'{i:024x}',
+             'name': f'document_{i}.docx',
+             'structure': make_structure(template or GOST_TEMPLATE, rnd, sentences_per_section=sentences_per_section)}
+            for i in range(documents)]
+
+
+def get_vocabulary(size: int, rnd: random.Random) -> List[str]:
+    """
+    Returns distinct pseudo-words made of russian syllables.
+    """
+    syllables = [consonant + vowel for consonant in 'бвгдклмнпрстхч' for vowel in 'аеиоу']
+    vocabulary = {}
+    while len(vocabulary) < size:
+        word = ''.join(rnd.choice(syllables) for _ in range(rnd.randint(2, 4))) + rnd.choice(['ость', 'ение', 'ство'])
+        vocabulary[word] = None
+    return list(vocabulary)
+
+
+def make_zipf_collection(documents=1000, vocabulary_size=20000, words_per_document=100, exponent=1.1,
+                         documents_per_topic=50, topic_size=30, topic_share=0.3, seed=0) -> List[dict]:
+    """
+    Returns a collection of parsed documents (like :py:func:`make_collection`) with a single leaf section. The words
+    are drawn from the vocabulary by Zipf's law: the frequency of the k-th word is proportional to 1 / k ** exponent,
+    so the most frequent words are shared by most documents, like in real texts. Besides, `topic_share` of the words of
+    each document are drawn from the `topic_size` less frequent words of its topic (there is a topic per
+    `documents_per_topic` documents), so the documents of a topic are similar, like the assignments of similar systems.
+    """
+    rnd = random.Random(seed)
+    vocabulary = get_vocabulary(vocabulary_size, rnd)
+    cum_weights = []
+    total = 0.0
+    for rank in range(1, vocabulary_size + 1):
+        total += 1 / rank ** exponent
+        cum_weights.append(total)
+    topics = [rnd.sample(vocabulary[vocabulary_size // 20:], topic_size)
+              for _ in range(max(documents // documents_per_topic, 1))]
+
+    collection = []
+    for i in range(documents):
+        count = rnd.randint(words_per_document // 2, words_per_document)
+        topic_count = int(count * topic_share)
+        words = rnd.choices(vocabulary, cum_weights=cum_weights, k=count - topic_count)
+        words += rnd.choices(rnd.choice(topics), k=topic_count)
+        structure = {'name': GOST_TEMPLATE['name'], 'children': [{'name': 'Общие сведения', 'text': ' '.join(words)}]}
+        collection.append({'_id': f'{i:024x}', 'name': f'document_{i}.docx', 'structure': structure})
+    return collection
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('output_dir', help='directory of the created .docx files')
+    arg_parser.add_argument('--documents', type=int, default=10, help='number of documents')
+    arg_parser.add_argument('--paragraphs', type=int, default=5, help='number of paragraphs of each section')
+    arg_parser.add_argument('--table-density', type=float, default=0.2,
+                            help='probability of a table after each paragraph')
+    args = arg_parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for i in range(args.documents):
+        make_docx(os.path.join(args.output_dir, f'document_{i}.docx'), paragraphs_per_section=args.paragraphs,
+                  table_density=args.table_density, seed=i)
+
+
+if __name__ == '__main__':
+    main()
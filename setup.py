@@ -1,21 +1,25 @@
+import re
+
 from setuptools import setup, find_packages
 
 requirements = [
-    'nltk>=3.6.7',
     'gensim>=4.1.2',
     'pullenti>=4.1',
     'pymorphy2>=0.9.1',
     'rusenttokenize>=0.0.5',
-    'python-docx>=0.8.11',
-    'anytree>=2.8.0'
+    'python-docx>=0.8.11'
 ]
 
 with open('README.md', 'r', encoding='utf-8') as file:
     description = file.read()
 
+# the version is defined once, in the package
+with open('srsparser/__init__.py', 'r', encoding='utf-8') as file:
+    version = re.search(r"^__version__ = '([^']+)'", file.read(), re.MULTILINE).group(1)
+
 setup(
     name='srsparser',
-    version='1.4.9',
+    version=version,
     author='Kurmyza Pavel',
     author_email='tmrrwnxtsn@gmail.com',
     project_urls={
@@ -28,7 +32,8 @@ setup(
                 'language processing algorithms.',
     long_description=description,
     long_description_content_type='text/markdown',
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
+    package_data={'srsparser': ['data/*.txt']},
     install_requires=requirements,
     classifiers=[
         'Programming Language :: Python :: 3.7',
@@ -1,4 +1,43 @@
+from importlib import import_module as _import_module
+
+__version__ = '1.4.9'
+
 from .configs import *
-from .language_processor import *
+from .cache import *
+from .profiling import *
 from .sections_tree import *
-from .parser import *
+from .extractor import *
+
+# classes depending on the heavy NLP backends are imported on the first access
+_LAZY_ATTRIBUTES = {
+    'LanguageProcessor': 'language_processor',
+    'CorpusIndex': 'corpus_index',
+    'TemplateMatcher': 'template_matcher',
+    'ParagraphRecord': 'parser',
+    'ParseResult': 'parser',
+    'Parser': 'parser',
+    'MultiTemplateParser': 'parser',
+    'TemplateMatch': 'parser',
+    'SimilarityIndex': 'similarity_index',
+    'Pipeline': 'pipeline',
+    'PipelineResult': 'pipeline',
+    'PipelineStats': 'pipeline',
+    'Sink': 'pipeline',
+    'MemorySink': 'pipeline',
+    'JsonLinesSink': 'pipeline',
+    'StructureBundle': 'storage',
+    'BundledStructure': 'storage',
+}
+
+__all__ = [name for name in globals() if not name.startswith('_')] + list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    module = _import_module(f'.{_LAZY_ATTRIBUTES[name]}', __name__)
+    return getattr(module, name)
+
+
+def __dir__():
+    return __all__
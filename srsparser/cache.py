@@ -0,0 +1,277 @@
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import IO, Any, Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+from srsparser import configs
+
+
+class LRUCache:
+    """
+    Size-bounded mapping that evicts the least recently used entries and the expired entries and counts cache hits
+    and misses.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None, ttl: Optional[float] = None):
+        """
+        :param maxsize: maximum number of stored entries (None — unbounded, 0 — nothing is stored).
+        :param ttl: time in seconds after which a stored entry expires (None — entries do not expire).
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        # key -> time of expiration of the entry (only if ttl is stated)
+        self._expires: Dict[Hashable, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries and not self._is_expired(key)
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Share of the requests of the stored entries found in the cache (0.0 if there were no requests).
+        """
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the value stored by the key and marks it as recently used.
+        """
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        if self._is_expired(key):
+            self._remove(key)
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Stores the value by the key, evicting the least recently used entries if the cache is full.
+        """
+        if self.maxsize == 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if self.ttl is not None:
+            self._expires[key] = time.monotonic() + self.ttl
+        if self.maxsize is not None:
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        """
+        Removes all entries and resets the hit and miss counters.
+        """
+        self._entries.clear()
+        self._expires.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """
+        Returns the unexpired entries (from the least to the most recently used) without marking them as used.
+        """
+        return [(key, value) for key, value in self._entries.items() if not self._is_expired(key)]
+
+    def save(self, path: str):
+        """
+        Saves the unexpired entries to the JSON file (from the least to the most recently used).
+        Keys must be strings or numbers and values must be JSON serializable.
+        """
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.items(), file, ensure_ascii=False)
+
+    def load(self, path: str):
+        """
+        Loads the entries from the JSON file created by :py:meth:`save` (the loaded entries expire after `ttl`).
+        """
+        with open(path, encoding='utf-8') as file:
+            entries = json.load(file)
+        for key, value in entries:
+            self.put(key, value)
+
+    def _is_expired(self, key: Hashable) -> bool:
+        return self.ttl is not None and self._expires[key] <= time.monotonic()
+
+    def _remove(self, key: Hashable):
+        del self._entries[key]
+        self._expires.pop(key, None)
+
+
+class SQLiteCache:
+    """
+    Persistent cache with the same interface as :py:class:`LRUCache` storing the entries in the SQLite database,
+    so that the cached results survive restarts and are shared by the processes using the same database file.
+
+    Keys must be strings and values must be JSON serializable (values are returned as decoded from JSON,
+    e.g. tuples are returned as lists). The hit and miss counters are counted by each cache object separately.
+    """
+
+    def __init__(self, path: str, maxsize: Optional[int] = None, ttl: Optional[float] = None):
+        """
+        :param path: path to the database file (created if it does not exist; ':memory:' — in-memory database).
+        :param maxsize: maximum number of stored entries; the least recently used entries are evicted
+            (None — unbounded, 0 — nothing is stored).
+        :param ttl: time in seconds after which a stored entry expires (None — entries do not expire).
+        """
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._connection = sqlite3.connect(path, timeout=30)
+        with self._connection:
+            self._connection.execute('CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+                                     'expires REAL, accessed REAL NOT NULL)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)')
+
+    def __len__(self) -> int:
+        return self._connection.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def __contains__(self, key: str) -> bool:
+        row = self._connection.execute('SELECT expires FROM entries WHERE key = ?', (key,)).fetchone()
+        return row is not None and not _is_expired(row[0])
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Share of the requests of the stored entries found in the cache (0.0 if there were no requests).
+        """
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Returns the value stored by the key and marks it as recently used.
+        """
+        row = self._connection.execute('SELECT value, expires FROM entries WHERE key = ?', (key,)).fetchone()
+        if row is None or _is_expired(row[1]):
+            if row is not None:
+                with self._connection:
+                    self._connection.execute('DELETE FROM entries WHERE key = ?', (key,))
+            self.misses += 1
+            return default
+
+        with self._connection:
+            self._connection.execute('UPDATE entries SET accessed = ? WHERE key = ?', (time.time(), key))
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Any):
+        """
+        Stores the value by the key, evicting the expired and the least recently used entries if the cache is full.
+        """
+        if self.maxsize == 0:
+            return
+        now = time.time()
+        expires = now + self.ttl if self.ttl is not None else None
+        with self._connection:
+            self._connection.execute('INSERT OR REPLACE INTO entries (key, value, expires, accessed) '
+                                     'VALUES (?, ?, ?, ?)', (key, json.dumps(value, ensure_ascii=False), expires, now))
+            if self.maxsize is not None:
+                excess = len(self) - self.maxsize
+                if excess > 0:
+                    self._connection.execute('DELETE FROM entries WHERE expires <= ?', (now,))
+                    excess = len(self) - self.maxsize
+                if excess > 0:
+                    self._connection.execute('DELETE FROM entries WHERE key IN '
+                                             '(SELECT key FROM entries ORDER BY accessed LIMIT ?)', (excess,))
+
+    def clear(self):
+        """
+        Removes all entries and resets the hit and miss counters.
+        """
+        with self._connection:
+            self._connection.execute('DELETE FROM entries')
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        self._connection.close()
+
+
+def _is_expired(expires: Optional[float]) -> bool:
+    return expires is not None and expires <= time.time()
+
+
+def get_hash(data: Union[bytes, str]) -> str:
+    """
+    Returns SHA-256 hex digest of the bytes or of the UTF-8 encoded string.
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def get_stream_hash(source: Union[str, IO[bytes]], block_size=configs.HASH_BLOCK_SIZE) -> str:
+    """
+    Returns SHA-256 hex digest of the content of the file read in blocks of `block_size` bytes, so the file is not
+    loaded into memory at once.
+
+    :param source: path to the file or a seekable binary file object (hashed from its current position, which is
+        restored afterwards).
+    """
+    if isinstance(source, str):
+        with open(source, 'rb') as file:
+            return get_stream_hash(file, block_size)
+
+    digest = hashlib.sha256()
+    position = source.tell()
+    try:
+        for block in iter(lambda: source.read(block_size), b''):
+            digest.update(block)
+    finally:
+        source.seek(position)
+    return digest.hexdigest()
+
+
+def get_structure_hash(structure: dict) -> str:
+    """
+    Returns the hash of the sections tree structure (or template) independent of the order of the dictionary keys.
+    """
+    return get_hash(json.dumps(structure, ensure_ascii=False, sort_keys=True))
+
+
+def get_collection_fingerprint(records: Iterable[Union[dict, bytes, str]]) -> str:
+    """
+    Returns the fingerprint of the parsed documents collection: the hash of the names and structures of its records
+    in their order (the order of the pairs with equal weights and the structure used for repeated document names
+    depend on it), independent of the other fields of the records (e.g. MongoDB _id).
+
+    :param records: the MongoDB collection objects (dictionaries with the keys: _id, name and structure
+        or their JSON representations).
+    """
+    digests = []
+    for record in records:
+        if isinstance(record, (bytes, str)):
+            record = json.loads(record)
+        structure = record['structure']
+        if not isinstance(structure, dict):
+            # e.g. BundledStructure
+            structure = structure.to_dict()
+        digests.append(get_structure_hash({'name': record['name'], 'structure': structure}))
+    return get_hash(''.join(digests))
+
+
+def make_cache_key(*parts: Any) -> str:
+    """
+    Joins the parts of the key of a cached result into an unambiguous string key (suitable for all cache backends).
+    """
+    return json.dumps(parts, ensure_ascii=False)
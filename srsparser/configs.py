@@ -1,14 +1,34 @@
+import os
 import string
 
-from nltk import download, corpus
-
 # regular expression for detection numbering elements
 NUMBERING_PATTERN = '^([а-я\d][.) ])+'
 
 # minimal strings similarity ratio
 MIN_SIMILARITY_RATIO = 0.5
 
-download('stopwords', quiet=True)
-STOPWORDS_RU = corpus.stopwords.words('russian')
+# maximum number of words whose morphological analysis is cached by the language processor
+MORPH_CACHE_SIZE = 100000
+
+# maximum number of distinct paragraph texts whose matching with the template is cached by the parser
+HEADING_CACHE_SIZE = 100000
+
+# number of characters segmented into sentences at once by the language processor
+SENTENCES_CHUNK_SIZE = 65536
+
+# maximum number of characters of unfinished sentences carried to the next chunk; a longer text without sentence
+# boundaries is cut at a space
+SENTENCES_MAX_TAIL_LENGTH = 8192
+
+# number of bytes of a document read at once when it is hashed for the cache of the parsed structures
+HASH_BLOCK_SIZE = 1048576
+
+# aggregations of the weights of the keyphrase words (see LanguageProcessor.rationize_keywords)
+KEYPHRASE_AGGREGATIONS = ('sum', 'mean', 'max')
+
+# russian stopwords (the nltk stopwords corpus bundled with the package)
+STOPWORDS_RU_PATH = os.path.join(os.path.dirname(__file__), 'data', 'stopwords_ru.txt')
+with open(STOPWORDS_RU_PATH, encoding='utf-8') as _file:
+    STOPWORDS_RU = frozenset(_file.read().split())
 
 EXCESS_CHARS = f'[\w\d{string.punctuation}]+'
@@ -0,0 +1,230 @@
+import json
+import math
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy
+from numpy import around
+
+from srsparser.cache import get_hash, get_structure_hash
+from srsparser.language_processor import LanguageProcessor
+from srsparser.sections_tree import SectionsTree
+
+
+class CorpusIndex:
+    """
+    Incremental TF-IDF index of the parsed documents collection.
+
+    The index stores the bag of words of each section of each document and the document frequencies of words
+    per section. Documents are added and removed without re-tokenizing the collection, and TF-IDF pairs of
+    a document are calculated from its own bag of words only. The weights are the same as those of the gensim
+    TF-IDF model built by :py:meth:`LanguageProcessor.get_structure_tf_idf_pairs` for the whole collection.
+    """
+
+    def __init__(self, nlp: LanguageProcessor, part_of_speech=''):
+        """
+        :param nlp: language processor used to tokenize section contents.
+        :param part_of_speech: part of speech acronym; if stated, all other parts of speech are excluded from
+            the bags of words.
+        """
+        self.nlp = nlp
+        self.part_of_speech = part_of_speech
+
+        # document name -> section name ('' — the root section) -> token -> frequency
+        self.bows: Dict[str, Dict[str, Dict[str, int]]] = {}
+        # section name -> token -> number of documents containing the token in the section
+        self.dfs: Dict[str, Dict[str, int]] = {}
+        # section name -> number of non-zero (document, token) pairs
+        self.nnz: Dict[str, int] = {}
+        # document name -> hash of the bags of words of the document (see get_fingerprint)
+        self.digests: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.bows)
+
+    def __contains__(self, document_name: str) -> bool:
+        return document_name in self.bows
+
+    def add_documents(self, documents: Iterable[dict]):
+        """
+        Adds the parsed documents (dictionaries with the keys: name and structure) to the index.
+        """
+        for document in documents:
+            self.add_document(document['name'], document['structure'])
+
+    def add_document(self, document_name: str, structure: dict):
+        """
+        Adds the document structure to the index (replaces the document with the same name).
+        """
+        self.add_document_bows(document_name, self.get_structure_bows(structure))
+
+    def add_document_bows(self, document_name: str, bows: Dict[str, Dict[str, int]]):
+        """
+        Adds the bags of words of the document sections (see :py:meth:`get_structure_bows`) to the index
+        (replaces the document with the same name), e.g. when the document is tokenized by another process.
+        """
+        if document_name in self.bows:
+            self.remove_document(document_name)
+        self._add_bows(document_name, bows)
+
+    def remove_document(self, document_name: str):
+        """
+        Removes the document from the index.
+        """
+        if document_name not in self.bows:
+            raise ValueError(f'there are no objects named {document_name} in the document collection')
+
+        del self.digests[document_name]
+        for section_name, bow in self.bows.pop(document_name).items():
+            dfs = self.dfs[section_name]
+            for token in bow:
+                dfs[token] -= 1
+                if dfs[token] == 0:
+                    del dfs[token]
+            self.nnz[section_name] -= len(bow)
+            if not dfs:
+                del self.dfs[section_name]
+                del self.nnz[section_name]
+
+    def get_fingerprint(self) -> str:
+        """
+        Returns the fingerprint of the indexed collection: the hash of the names and the bags of words of
+        the documents and of the part of speech, which changes when a document is added, replaced or removed
+        (see :py:func:`get_collection_fingerprint`).
+        """
+        return get_hash(self.part_of_speech + ''.join(sorted(self.digests.values())))
+
+    def get_structure_bows(self, structure: dict) -> Dict[str, Dict[str, int]]:
+        """
+        Returns bags of words of the structure sections. The content of a section is the content of its leaf sections
+        (see :py:meth:`SectionsTree.get_content`), so each leaf section is tokenized once.
+
+        :return: dictionary containing pairs like "section name" — "bag of words" ('' — the root section).
+        """
+        tree = SectionsTree(structure)
+
+        leaf_bows = {}
+        bows = {}
+        for section_name in [''] + tree.get_section_names():
+            if section_name in bows:
+                continue
+            bow = Counter()
+            for leaf in tree.get_leaf_sections(section_name):
+                if id(leaf) not in leaf_bows:
+                    leaf_bows[id(leaf)] = Counter(self.nlp.tokenize(leaf.text, self.part_of_speech))
+                bow.update(leaf_bows[id(leaf)])
+            bows[section_name] = dict(bow)
+        return bows
+
+    def get_tf_idf_pairs(self, document_name: str, section_name='',
+                         smartirs='ntc') -> List[List[Tuple[str, numpy.float64]]]:
+        """
+        Returns TF-IDF pairs for the section of the document. Pairs with equal weights are ordered by words.
+
+        :param document_name: the name of the document.
+        :param section_name: the name of the section of the structure (default: root section).
+        :param smartirs: three letters represents the term weighting of the collection document vector
+            (e.g. 'ntc', see smart term-weighting triple notation); pivoted character length normalization ('b')
+            is not supported.
+        :return: TF-IDF pair ([word: str, weight: float]) list.
+        """
+        return self._get_pairs(self.get_tf_idf_weights(document_name, section_name, smartirs))
+
+    def get_tf_idf_weights(self, document_name: str, section_name='', smartirs='ntc') -> Dict[str, float]:
+        """
+        Returns TF-IDF weights of the words of the section of the document (see :py:meth:`get_tf_idf_pairs`).
+        """
+        if document_name not in self.bows:
+            raise ValueError(f'there are no objects named {document_name} in the document collection')
+
+        return self._get_tf_idf_weights(self.bows[document_name].get(section_name, {}),
+                                        self.dfs.get(section_name, {}), len(self.bows),
+                                        self.nnz.get(section_name, 0), smartirs)
+
+    def get_bows_tf_idf_pairs(self, bows: Dict[str, Dict[str, int]], section_name='', smartirs='ntc',
+                              document_name: Optional[str] = None) -> List[List[Tuple[str, numpy.float64]]]:
+        """
+        Returns TF-IDF pairs for the section of a document that is not added to the index: the pairs are the same as
+        those of :py:meth:`get_tf_idf_pairs` after adding the document, but the index is not changed.
+
+        :param bows: bags of words of the document sections (see :py:meth:`get_structure_bows`).
+        :param section_name: the name of the section of the structure (default: root section).
+        :param smartirs: term weighting (see :py:meth:`get_tf_idf_pairs`).
+        :param document_name: the name of the document; if the index contains a document with this name, the pairs
+            are calculated as if it were replaced.
+        :return: TF-IDF pair ([word: str, weight: float]) list.
+        """
+        bow = bows.get(section_name, {})
+        replaced_bow = self.bows[document_name].get(section_name, {}) if document_name in self.bows else {}
+        num_docs = len(self.bows) + (document_name not in self.bows)
+        dfs = self.dfs.get(section_name, {})
+        bow_dfs = {token: dfs.get(token, 0) + 1 - (token in replaced_bow) for token in bow}
+        nnz = self.nnz.get(section_name, 0) - len(replaced_bow) + len(bow)
+        return self._get_pairs(self._get_tf_idf_weights(bow, bow_dfs, num_docs, nnz, smartirs))
+
+    def save(self, path: str):
+        """
+        Saves the index to the JSON file.
+        """
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({'part_of_speech': self.part_of_speech, 'documents': self.bows}, file, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str, nlp: LanguageProcessor) -> 'CorpusIndex':
+        """
+        Loads the index from the JSON file created by :py:meth:`save`.
+        """
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+
+        index = cls(nlp, data['part_of_speech'])
+        for document_name, bows in data['documents'].items():
+            index._add_bows(document_name, bows)
+        return index
+
+    @staticmethod
+    def _get_tf_idf_weights(bow: Dict[str, int], dfs: Dict[str, int], num_docs: int, nnz: int,
+                            smartirs: str) -> Dict[str, float]:
+        from gensim.models.tfidfmodel import resolve_weights, smartirs_wglobal, smartirs_wlocal
+
+        local_scheme, global_scheme, norm_scheme = resolve_weights(smartirs)
+        if norm_scheme == 'b':
+            raise ValueError("pivoted character length normalization ('b') is not supported by the corpus index")
+
+        if not bow:
+            return {}
+
+        eps = 1e-12
+        tokens = list(bow)
+        tfs = smartirs_wlocal(numpy.array([bow[token] for token in tokens]), local_scheme)
+        weights = []
+        for token, tf in zip(tokens, tfs):
+            idf = smartirs_wglobal(dfs[token], num_docs, global_scheme)
+            if abs(idf) > eps:
+                weights.append((token, tf * idf))
+
+        if norm_scheme == 'c' and weights:
+            norm = math.sqrt(sum(weight ** 2 for _, weight in weights))
+            weights = [(token, weight / norm) for token, weight in weights]
+        elif norm_scheme == 'u':
+            # pivoted unique normalization (gensim default slope)
+            slope = 0.25
+            pivot = nnz / num_docs
+            norm = (1 - slope) * pivot + slope * (len(weights) if weights else 1.0)
+            weights = [(token, weight / norm) for token, weight in weights]
+
+        return {token: float(weight) for token, weight in weights if abs(weight) > eps}
+
+    @staticmethod
+    def _get_pairs(weights: Dict[str, float]) -> List[List[Tuple[str, numpy.float64]]]:
+        pairs = sorted(weights.items(), key=lambda item: (-item[1], item[0]))
+        return [[token, numpy.float64(around(weight, decimals=3))] for token, weight in pairs]
+
+    def _add_bows(self, document_name: str, bows: Dict[str, Dict[str, int]]):
+        self.bows[document_name] = bows
+        self.digests[document_name] = get_structure_hash({'name': document_name, 'bows': bows})
+        for section_name, bow in bows.items():
+            dfs = self.dfs.setdefault(section_name, {})
+            for token in bow:
+                dfs[token] = dfs.get(token, 0) + 1
+            self.nnz[section_name] = self.nnz.get(section_name, 0) + len(bow)
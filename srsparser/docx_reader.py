@@ -0,0 +1,100 @@
+import zipfile
+from typing import IO, Iterator, Tuple, Union
+
+from lxml import etree
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+W_BODY = f'{_W}body'
+W_P = f'{_W}p'
+W_R = f'{_W}r'
+W_HYPERLINK = f'{_W}hyperlink'
+W_TBL = f'{_W}tbl'
+W_TR = f'{_W}tr'
+W_TC = f'{_W}tc'
+W_TYPE = f'{_W}type'
+
+# text equivalents of the run elements (see python-docx Run.text)
+_RUN_CHARS = {
+    f'{_W}tab': '\t',
+    f'{_W}ptab': '\t',
+    f'{_W}cr': '\n',
+    f'{_W}noBreakHyphen': '-',
+}
+W_T = f'{_W}t'
+W_BR = f'{_W}br'
+
+DOCUMENT_PART = 'word/document.xml'
+
+
+def iter_docx_paragraphs(source: Union[str, IO[bytes]]) -> Iterator[Tuple[str, bool]]:
+    """
+    Reads the paragraphs of the .docx document incrementally: the main document part is parsed by
+    `lxml.etree.iterparse` and the processed elements are removed from the tree, so the memory used by the reader
+    does not depend on the size of the document (the paragraphs kept by the caller are not included).
+
+    The paragraphs are the same as those of :py:meth:`Parser.iter_paragraphs` (paragraphs of the document body and
+    of its table cells, including nested tables), except that each merged cell is read once.
+
+    :param source: path to the .docx file or a binary file object.
+    :return: iterator over pairs "paragraph text" — "whether the paragraph is inside a table".
+    """
+    with zipfile.ZipFile(source) as archive, archive.open(DOCUMENT_PART) as document:
+        for _, element in etree.iterparse(document, events=('end',), tag=(W_P, W_TR, W_TBL)):
+            parent = element.getparent()
+
+            if element.tag == W_P:
+                if not _is_read(element):
+                    # paragraphs of text boxes and other content are not document paragraphs
+                    continue
+                yield get_paragraph_text(element), parent.tag == W_TC
+            elif parent is None or not (parent.tag == W_BODY or element.tag == W_TR):
+                continue
+
+            # the element is processed: free it and its preceding siblings
+            element.clear()
+            while element.getprevious() is not None:
+                del parent[0]
+
+
+def get_paragraph_text(paragraph: etree._Element) -> str:
+    """
+    Returns the text of the paragraph element like python-docx `Paragraph.text`: the text of the runs of
+    the paragraph and of its hyperlinks.
+    """
+    parts = []
+    for child in paragraph:
+        if child.tag == W_R:
+            parts.append(get_run_text(child))
+        elif child.tag == W_HYPERLINK:
+            parts.extend(get_run_text(run) for run in child if run.tag == W_R)
+    return ''.join(parts)
+
+
+def get_run_text(run: etree._Element) -> str:
+    """
+    Returns the text of the run element like python-docx `Run.text` (tabs and line breaks are mapped to "\\t" and
+    "\\n", page and column breaks are ignored).
+    """
+    parts = []
+    for child in run:
+        if child.tag == W_T:
+            parts.append(child.text or '')
+        elif child.tag == W_BR:
+            if child.get(W_TYPE, 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+        elif child.tag in _RUN_CHARS:
+            parts.append(_RUN_CHARS[child.tag])
+    return ''.join(parts)
+
+
+def _is_read(paragraph: etree._Element) -> bool:
+    # python-docx reads the paragraphs of the body and of the cells of the tables of the body (recursively)
+    parent = paragraph.getparent()
+    while parent is not None and parent.tag == W_TC:
+        row = parent.getparent()
+        table = row.getparent() if row is not None and row.tag == W_TR else None
+        if table is None or table.tag != W_TBL:
+            return False
+        parent = table.getparent()
+    return parent is not None and parent.tag == W_BODY
@@ -0,0 +1,146 @@
+import json
+import re
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, Optional, Tuple, Union
+
+# parsed document structure: dictionary, its JSON representation or an object reading the section contents itself
+# (e.g. BundledStructure or SectionsTree)
+Structure = Union[dict, bytes, str, Any]
+
+
+def get_content(structure: Structure, section_name='') -> str:
+    """
+    Returns the text content of the section of the structure like :py:meth:`SectionsTree.get_content`,
+    but walks the nested dictionaries directly instead of building the sections tree.
+
+    :param structure: sections tree structure (dictionary or JSON bytes or string), :py:class:`BundledStructure`
+        or :py:class:`SectionsTree`.
+    :param section_name: the name of the section (default: root section).
+    :return: texts of the leaf sections of the section joined by ". " ('' if there is no such section).
+    """
+    if hasattr(structure, 'get_content'):
+        return structure.get_content(section_name)
+
+    if isinstance(structure, (bytes, str)):
+        # the section can not be found in the structure without its name
+        if section_name != '' and not may_contain_name(structure, section_name):
+            return ''
+        structure = json.loads(structure)
+
+    if section_name == '':
+        section_name = list(structure.values())[0]
+
+    section = find_section(structure, section_name)
+    if section is None:
+        return ''
+    return '. '.join(iter_leaf_texts(section))
+
+
+def iter_contents(records: Iterable[Structure], section_name='') -> Iterator[str]:
+    """
+    Returns the text content of the section of the structure of each record (see :py:func:`get_content`).
+
+    :param records: the MongoDB collection objects (dictionaries with the keys: _id, name and structure
+        or their JSON representations), for example, a cursor.
+    :param section_name: the name of the section (default: root section).
+    """
+    for record in records:
+        if isinstance(record, (bytes, str)):
+            if section_name != '' and not may_contain_name(record, section_name):
+                yield ''
+                continue
+            record = json.loads(record)
+        yield get_content(record['structure'], section_name)
+
+
+def iter_named_contents(records: Iterable[Structure], section_name='') -> Iterator[Tuple[str, str]]:
+    """
+    Returns the name of each record and the text content of the section of its structure (see :py:func:`get_content`).
+
+    :param records: the MongoDB collection objects (see :py:func:`iter_contents`).
+    :param section_name: the name of the section (default: root section).
+    """
+    for record in records:
+        if isinstance(record, (bytes, str)):
+            record = json.loads(record)
+        yield record['name'], get_content(record['structure'], section_name)
+
+
+def find_section(structure: dict, section_name) -> Optional[dict]:
+    """
+    Returns the first (in the pre-order) section of the structure named `section_name` or None if there is no such
+    section.
+    """
+    stack = [structure]
+    while stack:
+        section = stack.pop()
+        if 'name' in section and section['name'] == section_name:
+            return section
+        stack.extend(reversed(section.get('children', [])))
+    return None
+
+
+def iter_leaf_texts(section: dict) -> Iterator[str]:
+    """
+    Returns texts of the leaf sections of the section in the pre-order.
+    """
+    stack = [section]
+    while stack:
+        section = stack.pop()
+        if 'text' in section:
+            yield section['text']
+        stack.extend(reversed(section.get('children', [])))
+
+
+def may_contain_name(data: Union[bytes, str], section_name: str) -> bool:
+    """
+    Checks whether the JSON representation of a structure can contain a section named `section_name`: whether it
+    contains the name as a JSON string. The usual spellings of the name (as is or with escaped non-ASCII characters)
+    are looked up as substrings; if none is found and the data contains escapes, the data is searched for any valid
+    spelling of the name (e.g. with escaped slashes, partially escaped or with the hex digits in any case), so
+    the check never rejects a structure containing the section.
+
+    :return: True — yes (or the data contains the name outside section names), else — False.
+    """
+    as_bytes = isinstance(data, bytes)
+    if any(pattern in data for pattern in _get_name_patterns(section_name, as_bytes)):
+        return True
+    # without escapes the name has the only spelling
+    if (b'\\' if as_bytes else '\\') not in data:
+        return False
+    return _get_name_regex(section_name, as_bytes).search(data) is not None
+
+
+@lru_cache(maxsize=1024)
+def _get_name_patterns(section_name: str, as_bytes: bool) -> Tuple[Union[bytes, str], ...]:
+    escaped = json.dumps(section_name)
+    escaped_upper = re.sub(r'\\u([0-9a-f]{4})', lambda match: '\\u' + match.group(1).upper(), escaped)
+    patterns = {json.dumps(section_name, ensure_ascii=False), escaped, escaped_upper}
+    if as_bytes:
+        return tuple(pattern.encode('utf-8') for pattern in patterns)
+    return tuple(patterns)
+
+
+# characters having short escapes in JSON strings
+_SHORT_ESCAPES = {'"': '\\"', '\\': '\\\\', '/': '\\/', '\b': '\\b', '\f': '\\f', '\n': '\\n', '\r': '\\r',
+                  '\t': '\\t'}
+
+
+@lru_cache(maxsize=1024)
+def _get_name_regex(section_name: str, as_bytes: bool) -> re.Pattern:
+    # each character of the name is spelled as is, by its short escape or by the \u escapes of its UTF-16 code units
+    # with the hex digits in any case
+    parts = ['"']
+    for char in section_name:
+        spellings = [re.escape(char)]
+        if char in _SHORT_ESCAPES:
+            spellings.append(re.escape(_SHORT_ESCAPES[char]))
+        units = char.encode('utf-16-be', 'surrogatepass')
+        spellings.append(''.join(
+            r'\\u' + ''.join(f'[{digit.lower()}{digit.upper()}]' if digit.isalpha() else digit
+                              for digit in f'{int.from_bytes(units[i:i + 2], "big"):04x}')
+            for i in range(0, len(units), 2)))
+        parts.append(f'(?:{"|".join(spellings)})')
+    parts.append('"')
+    pattern = ''.join(parts)
+    return re.compile(pattern.encode('utf-8', 'surrogatepass') if as_bytes else pattern)
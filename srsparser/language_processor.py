@@ -1,24 +1,19 @@
-from typing import List, Tuple
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import numpy
 from regex import regex as re
 import string
 
-from gensim.corpora.dictionary import Dictionary
-from gensim.models.tfidfmodel import TfidfModel
-from gensim.utils import simple_preprocess
 from numpy import around
-from pullenti.Sdk import Sdk
-from pullenti.ner.ProcessorService import ProcessorService
-from pullenti.ner.SourceOfAnalysis import SourceOfAnalysis
-from pullenti.ner.keyword.KeywordAnalyzer import KeywordAnalyzer
-from pullenti.ner.keyword.KeywordReferent import KeywordReferent
-from pullenti.ner.keyword.KeywordType import KeywordType
-from pymorphy2 import MorphAnalyzer
-from rusenttokenize import ru_sent_tokenize
 
 from srsparser import configs
-from srsparser.sections_tree import SectionsTree
+from srsparser.cache import LRUCache, get_collection_fingerprint, make_cache_key
+from srsparser.extractor import get_content, iter_contents, iter_named_contents
+from srsparser.profiling import NULL_PROFILER, Profiler
 from srsparser.utils import get_document_idx_by_name
 
 
@@ -26,18 +21,48 @@ class LanguageProcessor:
     """
     A class containing natural language processing methods, such as getting keywords, building a TF-IDF model,
     determining the similarity of strings, and others.
+
+    The NLP backends (gensim, pullenti, pymorphy2, rusenttokenize) are imported on the first use.
     """
 
-    def __init__(self, init_pullenti=True):
+    def __init__(self, init_pullenti=True, morph_cache_size: Optional[int] = configs.MORPH_CACHE_SIZE,
+                 morph_cache_path: Optional[str] = None, keywords_cache_size: Optional[int] = 0,
+                 profiler: Optional[Profiler] = None, results_cache=None):
         """
         :param init_pullenti: is it necessary to initialize the pullenti SDK.
+        :param morph_cache_size: maximum number of words whose morphological analysis is cached
+            (None — unbounded, 0 — caching is disabled).
+        :param morph_cache_path: path to the JSON file with the cached morphological analysis
+            (see :py:meth:`save_morph_cache`), which is loaded if it exists.
+        :param keywords_cache_size: maximum number of texts whose pullenti keywords are cached by the text hash
+            (None — unbounded, 0 — caching is disabled).
+        :param profiler: :py:class:`Profiler` collecting the time of the stages: tokenize, morphology, tf_idf and
+            pullenti (default: profiling is disabled).
+        :param results_cache: cache of the TF-IDF pairs and the rationized keywords of the collection documents
+            (:py:class:`LRUCache` or :py:class:`SQLiteCache`) keyed by the fingerprint of the collection
+            (see :py:func:`get_collection_fingerprint` and :py:meth:`CorpusIndex.get_fingerprint`), the document name,
+            the section name and the term weighting, so that unchanged collections are not processed again
+            (default: caching is disabled).
         """
-        self.morph = MorphAnalyzer()
+        self.profiler = profiler or NULL_PROFILER
+        self.results_cache = results_cache
+
+        self._morph = None
+
+        # text hash -> pullenti keywords
+        self.keywords_cache = LRUCache(keywords_cache_size)
+
+        # word -> (normal form, part of speech)
+        self.morph_cache = LRUCache(morph_cache_size)
+        self.morph_cache_path = morph_cache_path
+        if morph_cache_path is not None and os.path.exists(morph_cache_path):
+            self.morph_cache.load(morph_cache_path)
 
         # regular expressions for text preprocessing
         self.newlines_pattern = re.compile(r'\n')  # search for newlines
         self.spaces_pattern = re.compile(r'\s{2,}')  # search for 2 or more spaces
         self.semicolons_pattern = re.compile(r'(;|\.+)')  # search for semicolons and dots
+        self.word_pattern = re.compile(r'\w+')  # search for words
 
         # search for punctuation marks at the beginning and end of a line
         self.punct_on_sides_pattern = re.compile(fr'(^[{string.punctuation}–]+|[{string.punctuation}–]+$)')
@@ -53,29 +78,134 @@ class LanguageProcessor:
         self.punct_at_end_pattern = re.compile(fr'.+[{string.punctuation}]$')
 
         if init_pullenti:
+            from pullenti.Sdk import Sdk
             Sdk.initialize_all()
 
+    @property
+    def morph(self):
+        """
+        pymorphy2 morphological analyzer (created on the first use).
+        """
+        if self._morph is None:
+            from pymorphy2 import MorphAnalyzer
+            self._morph = MorphAnalyzer()
+        return self._morph
+
+    @property
+    def keyword_processor(self):
+        """
+        pullenti processor of the keyword analyzer (created on the first use and reused by all calls in the process).
+        The pullenti SDK must be initialized (see `init_pullenti`).
+        """
+        return _get_keyword_processor()
+
     def sentenize(self, text: str) -> List[str]:
         """
         Segmentation of text into sentences using rusenttokenize.
 
         :return: sentence list.
         """
+        from rusenttokenize import ru_sent_tokenize
+
+        return list(self.filter_sentences(ru_sent_tokenize(self.preprocess_for_sentences(text))))
+
+    def iter_sentences(self, text: Union[str, Iterable[str]], chunk_size=configs.SENTENCES_CHUNK_SIZE,
+                       max_tail_length=configs.SENTENCES_MAX_TAIL_LENGTH) -> Iterator[str]:
+        """
+        Segmentation of text into sentences using rusenttokenize (see :py:meth:`sentenize`).
+
+        The text is processed chunk by chunk, and the sentences are yielded as soon as they are found. Each chunk is
+        preprocessed once and segmented together with the last two sentences of the previous chunk, since their
+        boundaries may depend on it. If this tail grows longer than `max_tail_length` characters (a text without
+        sentence boundaries), it is cut at a space, so the memory used and the time per chunk do not depend on
+        the text length.
+
+        :param text: text or iterable of consecutive parts of the text (e.g. lines of a file).
+        :param chunk_size: number of characters preprocessed at once.
+        :param max_tail_length: maximum number of characters carried to the next chunk.
+        :return: sentence iterator.
+        """
+        from rusenttokenize import ru_sent_tokenize
+
+        parts = [text] if isinstance(text, str) else text
+
+        # preprocessed text whose segmentation is not finished yet
+        tail = ''
+        # raw text of the next chunk
+        chunk_parts: List[str] = []
+        chunk_length = 0
+
+        for part in parts:
+            for start in range(0, len(part), chunk_size):
+                chunk_parts.append(part[start:start + chunk_size])
+                chunk_length += len(chunk_parts[-1])
+                if chunk_length < chunk_size:
+                    continue
+
+                # the preprocessing replaces runs of spaces, dots and semicolons, so the trailing run of them
+                # is preprocessed with the next chunk
+                chunk = ''.join(chunk_parts)
+                end = len(chunk)
+                while end and (chunk[end - 1] in '.;' or chunk[end - 1].isspace()):
+                    end -= 1
+                if end == 0:
+                    if len(chunk) <= max_tail_length:
+                        chunk_parts = [chunk]
+                        continue
+                    end = len(chunk)
+                chunk_parts = [chunk[end:]]
+                chunk_length = len(chunk_parts[0])
+
+                tail += self.preprocess_for_sentences(chunk[:end])
+                sentences = ru_sent_tokenize(tail)
+                if len(sentences) > 2:
+                    # the last sentence may continue in the next chunk, and the boundary before it may depend on
+                    # the next chunk, so the last two sentences are segmented again with the next chunk
+                    tail_start = 0
+                    for sentence in sentences[:-2]:
+                        sentence_start = tail.find(sentence, tail_start)
+                        if sentence_start < 0:
+                            break
+                        tail_start = sentence_start + len(sentence)
+                    else:
+                        yield from self.filter_sentences(sentences[:-2])
+                        tail = tail[tail_start:]
+
+                while len(tail) > max_tail_length:
+                    cut = tail.rfind(' ', 0, max_tail_length)
+                    if cut <= 0:
+                        cut = max_tail_length
+                    yield from self.filter_sentences(ru_sent_tokenize(tail[:cut]))
+                    tail = tail[cut:]
+
+        tail += self.preprocess_for_sentences(''.join(chunk_parts))
+        if tail:
+            yield from self.filter_sentences(ru_sent_tokenize(tail))
+
+    def preprocess_for_sentences(self, text: str) -> str:
+        """
+        Replaces newlines and semicolons with dots and removes repeated spaces before sentence segmentation.
+        """
         text = self.newlines_pattern.sub('. ', text)
         text = self.spaces_pattern.sub(' ', text)
-        text = self.semicolons_pattern.sub('.', text)
+        return self.semicolons_pattern.sub('.', text)
 
-        sentences: List[str] = []
-
-        for sentence in ru_sent_tokenize(text):
-            # if there are at least 3 words in the sentence
-            if len(re.findall(r'\w+', sentence)) >= 3:
+    def filter_sentences(self, sentences: Iterable[str]) -> Iterator[str]:
+        """
+        Excludes sentences with less than 3 words and removes excess punctuation marks from the other sentences.
+        """
+        for sentence in sentences:
+            if self.has_words(sentence, 3):
                 sentence = self.punct_on_sides_pattern.sub('', sentence)
                 sentence = self.punct_in_middle_pattern.sub(' ', sentence)
                 sentence = self.punct_solid_pattern.sub(r'\1 \2', sentence)
-                sentences.append(sentence)
+                yield sentence
 
-        return sentences
+    def has_words(self, text: str, count: int) -> bool:
+        """
+        Checks whether the text contains at least `count` words (the search stops at the `count`-th word).
+        """
+        return sum(1 for _ in islice(self.word_pattern.finditer(text), count)) >= count
 
     @staticmethod
     def remove_ru_stop_words(words: List[str]) -> List[str]:
@@ -85,22 +215,51 @@ class LanguageProcessor:
         :param words: word list.
         :return: word list without russian stopwords.
         """
-        return list(filter(lambda token: token not in configs.STOPWORDS_RU, words))
+        return [word for word in words if word not in configs.STOPWORDS_RU]
+
+    def analyze(self, word: str) -> Tuple[str, Optional[str]]:
+        """
+        Returns the normal form and the part of speech of the word according to its most probable
+        morphological analysis. The results are cached (see `morph_cache_size`).
+        """
+        analysis = self.morph_cache.get(word)
+        if analysis is None:
+            parse = self.morph.parse(word)[0]
+            analysis = (parse.normal_form, parse.tag.POS)
+            self.morph_cache.put(word, analysis)
+        return analysis
+
+    def save_morph_cache(self, path: Optional[str] = None):
+        """
+        Saves the cached morphological analysis to the JSON file `path` (default: `morph_cache_path`),
+        so that other language processors can start with the populated cache.
+        """
+        path = path or self.morph_cache_path
+        if path is None:
+            raise ValueError('the path to the morphological analysis cache file is not specified')
+        self.morph_cache.save(path)
 
     def get_normal_form(self, word: str) -> str:
         """
         Return a word normal form.
         """
-        return self.morph.normal_forms(word)[0]
+        return self.analyze(word)[0]
+
+    def get_part_of_speech(self, word: str) -> Optional[str]:
+        """
+        Returns the part of speech acronym of the word (see notation for grammem in pymorphy2 package).
+        """
+        return self.analyze(word)[1]
 
     def lemmatize(self, words: List[str]) -> List[str]:
         """
-        Converts word list to lemma list.
+        Converts word list to lemma list (each distinct word is analyzed once, see :py:meth:`get_lemmas`).
 
         :param words: word list.
         :return: lemma list.
         """
-        return list(map(lambda token: self.get_normal_form(token), words))
+        lemmas = self.get_lemmas(words)
+        return [lemmas[word] for word in words]
 
     def exclude_all_except(self, words: List[str], part_of_speech: str) -> List[str]:
         """
@@ -110,11 +269,30 @@ class LanguageProcessor:
         :param part_of_speech: part of speech acronym (see notation for grammem in pymorphy2 package).
         :return: word list containing only words belonging to part_of_speech.
         """
-        return list(filter(lambda word: self.morph.parse(word)[0].tag.POS == part_of_speech, words))
+        return [word for word in words if self.get_part_of_speech(word) == part_of_speech]
+
+    def get_lemmas(self, words: Iterable[str], part_of_speech='') -> Dict[str, Optional[str]]:
+        """
+        Returns the normal form of each distinct word (each word is analyzed once).
+
+        :param words: word list.
+        :param part_of_speech: part of speech acronym; if stated, the words whose normal forms belong to other parts
+            of speech (see :py:meth:`exclude_all_except`) are mapped to None.
+        :return: dictionary containing pairs like "word" — "normal form".
+        """
+        lemmas = {}
+        for word in words:
+            if word not in lemmas:
+                lemma = self.get_normal_form(word)
+                if part_of_speech != '' and self.get_part_of_speech(lemma) != part_of_speech:
+                    lemma = None
+                lemmas[word] = lemma
+        return lemmas
 
     def tokenize(self, text: str, part_of_speech='') -> List[str]:
         """
-        Converts text to token list.
+        Converts text to token list: words are extracted, russian stopwords are removed and the words are lemmatized
+        (each distinct word is analyzed once).
 
         If parameter `part_of_speech` is stated,
         then during text preprocessing all parts of speech, except `part_of_speech`, will be excluded.
@@ -123,12 +301,53 @@ class LanguageProcessor:
         :param part_of_speech: part of speech acronym.
         :return: token list.
         """
-        tokens = simple_preprocess(text, min_len=2, max_len=50, deacc=True)
-        tokens = self.remove_ru_stop_words(tokens)
-        tokens = self.lemmatize(tokens)
-        if part_of_speech != '':
-            tokens = self.exclude_all_except(tokens, part_of_speech)
-        return tokens
+        with self.profiler.stage('tokenize'):
+            words = self.get_words(text)
+            with self.profiler.stage('morphology'):
+                lemmas = self.get_lemmas(words, part_of_speech)
+            return [lemmas[word] for word in words if lemmas[word] is not None]
+
+    def tokenize_many(self, texts: Iterable[str], part_of_speech='', workers: Optional[int] = 1) -> List[List[str]]:
+        """
+        Converts each text to token list like :py:meth:`tokenize`, but the distinct words of all texts are analyzed
+        at once.
+
+        :param texts: text list.
+        :param part_of_speech: part of speech acronym (see :py:meth:`tokenize`).
+        :param workers: number of processes analyzing the distinct words (1 — analyze in the current process,
+            None — number of CPUs); the analysis of the processes is not added to the morphological analysis cache.
+        :return: token lists in the order of `texts`.
+        """
+        with self.profiler.stage('tokenize'):
+            texts_words = [self.get_words(text) for text in texts]
+            words = list({word: None for text_words in texts_words for word in text_words})
+
+            with self.profiler.stage('morphology'):
+                if workers == 1 or not words:
+                    lemmas = self.get_lemmas(words, part_of_speech)
+                else:
+                    lemmas = {}
+                    workers = workers or os.cpu_count() or 1
+                    chunk_size = -(-len(words) // (workers * 4))
+                    chunks = [words[i:i + chunk_size] for i in range(0, len(words), chunk_size)]
+                    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker_language_processor,
+                                             initargs=(False, configs.MORPH_CACHE_SIZE)) as executor:
+                        for chunk_lemmas in executor.map(_get_lemmas_in_worker, chunks,
+                                                         [part_of_speech] * len(chunks)):
+                            lemmas.update(chunk_lemmas)
+
+            return [[lemmas[word] for word in text_words if lemmas[word] is not None] for text_words in texts_words]
+
+    @staticmethod
+    def get_words(text: str) -> List[str]:
+        """
+        Extracts words from the text (see gensim `simple_preprocess`) and removes russian stopwords.
+
+        :return: word list.
+        """
+        from gensim.utils import simple_preprocess
+
+        return LanguageProcessor.remove_ru_stop_words(simple_preprocess(text, min_len=2, max_len=50, deacc=True))
 
     def strings_similarity(self, s1: str, s2: str) -> float:
         """
@@ -166,8 +385,44 @@ class LanguageProcessor:
 
         return cosine_similarity_ratio
 
-    def get_tf_idf_pairs(self, documents: List[str], part_of_speech='',
-                         smartirs='ntc') -> List[List[List[Tuple[str, numpy.float64]]]]:
+    def similarity_matrix(self, queries: Iterable[str], candidates: Iterable[str], threshold: Optional[float] = None,
+                          top_k: Optional[int] = None):
+        """
+        Calculates strings similarity ratio (equal to :py:meth:`strings_similarity`) of each query with each candidate.
+        Each distinct string is tokenized once, the token sets are encoded as sparse binary vectors and all ratios
+        are calculated by a single sparse matrix product.
+
+        :param queries: strings compared with the candidates.
+        :param candidates: strings the queries are compared with.
+        :param threshold: if stated, the ratios less than `threshold` are excluded.
+        :param top_k: if stated, only `top_k` largest ratios of each query are kept (of the equal ratios, the ones of
+            the earlier candidates are preferred).
+        :return: scipy CSR matrix of shape (number of queries, number of candidates) without zero (and excluded)
+            ratios; use `.toarray()` to get the dense matrix.
+        """
+        from srsparser.matrices import filter_matrix, get_binary_cosine_similarities, get_binary_matrix
+
+        queries = list(queries)
+        candidates = list(candidates)
+
+        # string -> set of its tokens
+        token_sets = {}
+        for text in queries + candidates:
+            if text not in token_sets:
+                token_sets[text] = set(self.tokenize(text))
+
+        vocabulary = {}
+        candidates_matrix = get_binary_matrix([token_sets[text] for text in candidates], vocabulary)
+        # tokens of the queries missing in the candidates do not affect the products
+        queries_matrix = get_binary_matrix([token_sets[text] for text in queries], vocabulary, extend=False)
+
+        candidates_sizes = numpy.array([len(token_sets[text]) for text in candidates], dtype=numpy.float64)
+        queries_sizes = numpy.array([len(token_sets[text]) for text in queries], dtype=numpy.float64)
+        matrix = get_binary_cosine_similarities(queries_matrix, queries_sizes, candidates_matrix, candidates_sizes)
+        return filter_matrix(matrix, threshold, top_k)
+
+    def get_tf_idf_pairs(self, documents: List[str], part_of_speech='', smartirs='ntc',
+                         workers: Optional[int] = 1) -> List[List[List[Tuple[str, numpy.float64]]]]:
         """
         Builds TF-IDF model for the documents and returns TF-IDF pairs.
 
@@ -178,51 +433,157 @@ class LanguageProcessor:
         :param part_of_speech: part of speech acronym.
         :param smartirs: three letters represents the term weighting of the collection document vector
             (e.g. 'ntc', see smart term-weighting triple notation)
+        :param workers: number of processes analyzing the words of the documents (see :py:meth:`tokenize_many`).
         :return: TF-IDF pair ([word: str, weight: float]) list for the documents.
         """
+        matrix, vocabulary = self.get_tf_idf_matrix(documents, part_of_speech, smartirs, decimals=None,
+                                                    workers=workers)
+        return self.tf_idf_matrix_to_pairs(matrix, vocabulary)
+
+    def get_tf_idf_matrix(self, documents: List[str], part_of_speech='', smartirs='ntc', decimals: Optional[int] = 3,
+                          top_k: Optional[int] = None, workers: Optional[int] = 1):
+        """
+        Builds TF-IDF model for the documents and returns TF-IDF weights as a sparse matrix.
+
+        :param documents: text units, for example, a word, phrase, sentence.
+        :param part_of_speech: part of speech acronym (see :py:meth:`get_tf_idf_pairs`).
+        :param smartirs: three letters represents the term weighting of the collection document vector
+            (e.g. 'ntc', see smart term-weighting triple notation)
+        :param decimals: number of decimal places to round the weights to (None — do not round).
+        :param top_k: if stated, only `top_k` largest weights are kept for each document.
+        :param workers: number of processes analyzing the words of the documents (see :py:meth:`tokenize_many`).
+        :return: scipy CSR matrix of weights (row — document, column — word) and numpy array of words of the columns.
+        """
+        from gensim.corpora.dictionary import Dictionary
+        from gensim.matutils import corpus2csc
+        from gensim.models.tfidfmodel import TfidfModel
+        from srsparser.matrices import get_top_k_per_row
+
         # tokenize the documents
-        tokenized = [self.tokenize(document, part_of_speech) for document in documents]
+        tokenized = self.tokenize_many(documents, part_of_speech, workers)
 
-        # make dictionary (unique token list)
-        dictionary = Dictionary(tokenized)
+        with self.profiler.stage('tf_idf'):
+            # make dictionary (unique token list)
+            dictionary = Dictionary(tokenized)
 
-        # convert the dictionary to bag of words
-        bow_corpus = [dictionary.doc2bow(doc, allow_update=True) for doc in tokenized]
+            # convert the dictionary to bag of words
+            bow_corpus = [dictionary.doc2bow(doc, allow_update=True) for doc in tokenized]
 
-        tf_idf = TfidfModel(bow_corpus, smartirs=smartirs)
+            tf_idf = TfidfModel(bow_corpus, smartirs=smartirs)
 
-        tf_idf_weights = []
-        for structure in tf_idf[bow_corpus]:
-            structure.sort(key=lambda item: item[1], reverse=True)
+            # the columns of the words of a row are stored in the order of the word ids
+            matrix = corpus2csc(tf_idf[bow_corpus], num_terms=len(dictionary), num_docs=len(bow_corpus)).T.tocsr()
+            vocabulary = numpy.array([dictionary[i] for i in range(len(dictionary))], dtype=object)
 
-            tf_idf_weight = []
-            for id, freq in structure:
-                tf_idf_weight.append([dictionary[id], numpy.float64(around(freq, decimals=3))])
+        if top_k is not None:
+            matrix = get_top_k_per_row(matrix, top_k)
+        if decimals is not None:
+            matrix.data = around(matrix.data, decimals=decimals)
+        return matrix, vocabulary
 
-            tf_idf_weights.append(tf_idf_weight)
+    @staticmethod
+    def tf_idf_matrix_to_pairs(matrix, vocabulary: numpy.ndarray,
+                               decimals=3) -> List[List[List[Tuple[str, numpy.float64]]]]:
+        """
+        Converts TF-IDF matrix (see :py:meth:`get_tf_idf_matrix`) to TF-IDF pairs of the documents
+        sorted by descending weights.
 
+        :param decimals: number of decimal places to round the weights to.
+        :return: TF-IDF pair ([word: str, weight: float]) list for the documents.
+        """
+        tf_idf_weights = []
+        for row in range(matrix.shape[0]):
+            start, end = matrix.indptr[row], matrix.indptr[row + 1]
+            weights = matrix.data[start:end]
+            # stable sorting preserves the order of equal weights
+            order = numpy.argsort(-weights, kind='stable')
+            words = vocabulary[matrix.indices[start:end][order]]
+            weights = around(weights[order], decimals=decimals)
+            tf_idf_weights.append([[word, weight] for word, weight in zip(words, weights)])
         return tf_idf_weights
 
-    def get_structure_tf_idf_pairs(self, documents: List[dict], document_name: str, section_name='',
-                                   part_of_speech='', smartirs='ntc') -> List[List[Tuple[str, numpy.float64]]]:
+    def get_structures_similarities(self, documents: Iterable[dict], section_name='', part_of_speech='',
+                                    smartirs='ntc') -> numpy.ndarray:
+        """
+        Calculates cosine similarity of TF-IDF vectors of the structures of the MongoDB collection objects.
+
+        :param documents: the MongoDB collection objects, each of which is represented by the parsed
+            document (dictionary with the keys: _id, document_name and structure, or its JSON representation),
+            for example, a cursor (see :py:func:`iter_contents`), or a :py:class:`StructureBundle`.
+        :param section_name: the name of the section of the structure, relative to which the content will be
+            selected from each structure from documents.
+        :return: matrix of similarities, the rows and columns correspond to `documents`.
+        """
+        from srsparser.matrices import get_cosine_similarities
+
+        contents = list(iter_contents(documents, section_name))
+        matrix, _ = self.get_tf_idf_matrix(contents, part_of_speech, smartirs, decimals=None)
+        return get_cosine_similarities(matrix)
+
+    def get_structure_tf_idf_pairs(self, documents: Iterable[dict], document_name: str, section_name='',
+                                   part_of_speech='', smartirs='ntc',
+                                   corpus_index=None) -> List[List[Tuple[str, numpy.float64]]]:
         """
         Returns TF-IDF pairs for the document structure that is contained among the objects of the MongoDB collection
         (`documents`) and has the name `document_name` (the name of the document from which the structure was derived).
 
-        :param documents: list of the MongoDB collection objects, each of which is represented by the parsed
-            document (dictionary with the keys: _id, document_name and structure).
+        :param documents: the MongoDB collection objects, each of which is represented by the parsed
+            document (dictionary with the keys: _id, document_name and structure, or its JSON representation),
+            for example, a cursor, or a :py:class:`StructureBundle`; the objects are read once
+            (see :py:func:`iter_named_contents`).
         :param document_name: the name of the document from which the structure was extracted.
         :param section_name: the name of the section of the structure, relative to which the content will be
             selected from each structure from documents.
+        :param corpus_index: :py:class:`CorpusIndex` of the documents; if stated, the pairs are calculated by the index
+            without processing the other documents (`documents` and `part_of_speech` are not used).
         :return: TF-IDF pair list for the structure corresponding to the MongoDB document with name `document_name`.
         """
-        structure_idx = get_document_idx_by_name(documents, document_name)
+        fingerprint = None
+        if self.results_cache is not None:
+            # the objects are read twice: to calculate the fingerprint and to calculate the pairs
+            documents, fingerprint = self._get_results_fingerprint(documents, corpus_index)
+        return self._get_cached_structure_tf_idf_pairs(documents, document_name, section_name, part_of_speech,
+                                                       smartirs, corpus_index, fingerprint)
 
+    @staticmethod
+    def _get_results_fingerprint(documents: Iterable[dict], corpus_index) -> Tuple[Iterable[dict], str]:
+        # the fingerprint of the collection the cached results are keyed by (and the objects, if they are read)
+        if corpus_index is not None:
+            return documents, corpus_index.get_fingerprint()
+        if not isinstance(documents, list):
+            documents = list(documents)
+        return documents, get_collection_fingerprint(documents)
+
+    def _get_cached_structure_tf_idf_pairs(self, documents: Iterable[dict], document_name: str, section_name: str,
+                                           part_of_speech: str, smartirs: str, corpus_index,
+                                           fingerprint: Optional[str]) -> List[List[Tuple[str, numpy.float64]]]:
+        key = None
+        if fingerprint is not None:
+            key = make_cache_key('tf_idf_pairs', fingerprint, document_name, section_name, part_of_speech, smartirs)
+            pairs = self.results_cache.get(key)
+            if pairs is not None:
+                return [[token, numpy.float64(weight)] for token, weight in pairs]
+
+        pairs = self._get_structure_tf_idf_pairs(documents, document_name, section_name, part_of_speech, smartirs,
+                                                 corpus_index)
+        if key is not None:
+            self.results_cache.put(key, [[token, float(weight)] for token, weight in pairs])
+        return pairs
+
+    def _get_structure_tf_idf_pairs(self, documents: Iterable[dict], document_name: str, section_name: str,
+                                    part_of_speech: str, smartirs: str,
+                                    corpus_index) -> List[List[Tuple[str, numpy.float64]]]:
+        if corpus_index is not None:
+            return corpus_index.get_tf_idf_pairs(document_name, section_name, smartirs)
+
+        structure_idx = None
         contents: List[str] = []
-        for document in documents:
-            structure = SectionsTree(document['structure'])
-            structure_content = structure.get_content(section_name)
-            contents.append(structure_content)
+        for name, content in iter_named_contents(documents, section_name):
+            if structure_idx is None and name == document_name:
+                structure_idx = len(contents)
+            contents.append(content)
+        if structure_idx is None:
+            raise ValueError(f'there are no objects named {document_name} in the document collection')
 
         all_structures_pairs = self.get_tf_idf_pairs(contents, part_of_speech, smartirs)
         return all_structures_pairs[structure_idx]
@@ -233,70 +594,232 @@ class LanguageProcessor:
         Returns keywords obtained from analyzing the contents of a `structure`.
 
         :param documents: list of the MongoDB collection objects, each of which is represented by the parsed
-            document (dictionary with the keys: _id, document_name and structure).
+            document (dictionary with the keys: _id, document_name and structure), or a :py:class:`StructureBundle`.
         :param document_name: the name of the document from which the structure was extracted.
         :param section_name: the name of the section of the structure, relative to which the content will be
             selected from each structure from documents.
         :return: keyword list.
         """
         structure_doc_idx = get_document_idx_by_name(documents, document_name)
-        sections_structure = SectionsTree(documents[structure_doc_idx]['structure'])
-        content = sections_structure.get_content(section_name)
-        return self.get_keywords_pullenti(content)
+        content = get_content(documents[structure_doc_idx]['structure'], section_name)
+        return self.get_cached_keywords_pullenti(content)
 
     @staticmethod
     def get_keywords_pullenti(text: str) -> List[str]:
         """
-        Returns keywords obtained from analyzing the contents of a `text`.
+        Returns keywords obtained from analyzing the contents of a `text`. The pullenti SDK must be initialized
+        (see `init_pullenti`); the pullenti processor is created once per process (see `keyword_processor`).
 
         :return: keyword list.
         """
+        from pullenti.ner.SourceOfAnalysis import SourceOfAnalysis
+        from pullenti.ner.keyword.KeywordReferent import KeywordReferent
+        from pullenti.ner.keyword.KeywordType import KeywordType
+
         keywords: List[str] = []
-        with ProcessorService.create_specific_processor(KeywordAnalyzer.ANALYZER_NAME) as proc:
-            ar = proc.process(SourceOfAnalysis(text), None, None)
-            for e0_ in ar.entities:
-                if isinstance(e0_, KeywordReferent) and e0_.typ != KeywordType.ANNOTATION:
-                    keywords.append(e0_.to_string(short_variant=True))
+        ar = _get_keyword_processor().process(SourceOfAnalysis(text), None, None)
+        for e0_ in ar.entities:
+            if isinstance(e0_, KeywordReferent) and e0_.typ != KeywordType.ANNOTATION:
+                keywords.append(e0_.to_string(short_variant=True))
+        return keywords
+
+    def get_cached_keywords_pullenti(self, text: str) -> List[str]:
+        """
+        Returns keywords of the text like :py:meth:`get_keywords_pullenti`, but the keywords are cached by the text
+        hash (see `keywords_cache_size`) and the analysis is profiled (the pullenti stage).
+
+        :return: keyword list.
+        """
+        keywords = self._get_keywords_from_cache(text)
+        if keywords is not None:
+            return keywords
+
+        with self.profiler.stage('pullenti'):
+            keywords = self.get_keywords_pullenti(text)
+        self._put_keywords_to_cache(text, keywords)
         return keywords
 
-    def get_structure_rationized_keywords(self, documents: List[dict], document_name: str,
-                                          section_name='', smartirs='ntc') -> List[List[Tuple[str, numpy.float64]]]:
+    def get_keywords_pullenti_batch(self, texts: List[str], workers: Optional[int] = 1) -> List[List[str]]:
+        """
+        Returns keywords obtained from analyzing the contents of each text (see :py:meth:`get_keywords_pullenti`).
+        Cached (see `keywords_cache_size`) and repeated texts are not analyzed again.
+
+        :param texts: text list.
+        :param workers: number of processes analyzing the texts (1 — analyze in the current process,
+            None — number of CPUs); each process initializes its own pullenti SDK.
+        :return: keyword lists in the order of `texts`.
+        """
+        results: List[Optional[List[str]]] = [None] * len(texts)
+
+        # text -> indices of the text in `texts`
+        pending: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            keywords = self._get_keywords_from_cache(text)
+            if keywords is not None:
+                results[i] = keywords
+            else:
+                pending.setdefault(text, []).append(i)
+
+        def fill(all_keywords: Iterable[List[str]]):
+            for text, keywords in zip(pending, all_keywords):
+                self._put_keywords_to_cache(text, keywords)
+                for i in pending[text]:
+                    results[i] = list(keywords)
+
+        if workers == 1 or len(pending) <= 1:
+            with self.profiler.stage('pullenti'):
+                fill(map(self.get_keywords_pullenti, pending))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker_language_processor) as executor:
+                fill(executor.map(_get_keywords_pullenti_in_worker, pending))
+        return results
+
+    def _get_keywords_from_cache(self, text: str) -> Optional[List[str]]:
+        if self.keywords_cache.maxsize == 0:
+            return None
+        keywords = self.keywords_cache.get(hashlib.sha1(text.encode('utf-8')).hexdigest())
+        return None if keywords is None else list(keywords)
+
+    def _put_keywords_to_cache(self, text: str, keywords: List[str]):
+        if self.keywords_cache.maxsize != 0:
+            self.keywords_cache.put(hashlib.sha1(text.encode('utf-8')).hexdigest(), list(keywords))
+
+    def get_structure_rationized_keywords(self, documents: List[dict], document_name: str, section_name='',
+                                          smartirs='ntc', corpus_index=None,
+                                          aggregation='sum') -> List[List[Tuple[str, numpy.float64]]]:
         """
         Returns a list of keywords extracted from the structure and the TF-IDF weights corresponding to them.
 
         :param documents: list of the MongoDB collection objects, each of which is represented by the parsed
-            document (dictionary with the keys: _id, document_name and structure).
+            document (dictionary with the keys: _id, document_name and structure), or a :py:class:`StructureBundle`.
         :param document_name: the name of the document from which the structure was extracted.
         :param section_name: the name of the section of the structure, relative to which the content will be
             selected from each structure from documents.
         :param smartirs: three letters represents the term weighting of the collection document vector
             (e.g. 'ntc', see smart term-weighting triple notation)
+        :param corpus_index: :py:class:`CorpusIndex` of the documents used to calculate TF-IDF pairs
+            (see :py:meth:`get_structure_tf_idf_pairs`).
+        :param aggregation: the weight of a keyphrase (see :py:meth:`rationize_keywords`).
         :return: list of pairs "keyword-ratio".
         """
-        tf_idf_pairs = self.get_structure_tf_idf_pairs(documents, document_name, section_name, smartirs=smartirs)
+        key = fingerprint = None
+        if self.results_cache is not None:
+            # the fingerprint is calculated once for the keywords and the pairs
+            documents, fingerprint = self._get_results_fingerprint(documents, corpus_index)
+            key = make_cache_key('rationized_keywords', fingerprint, document_name, section_name, smartirs,
+                                 aggregation)
+            keywords_with_ratios = self.results_cache.get(key)
+            if keywords_with_ratios is not None:
+                return [[keyword, numpy.float64(ratio)] for keyword, ratio in keywords_with_ratios]
+
+        tf_idf_pairs = self._get_cached_structure_tf_idf_pairs(documents, document_name, section_name, '', smartirs,
+                                                               corpus_index, fingerprint)
         keywords = self.get_structure_keywords_pullenti(documents, document_name, section_name)
+        keywords_with_ratios = self.rationize_keywords(keywords, tf_idf_pairs, aggregation)
+
+        if key is not None:
+            self.results_cache.put(key, [[keyword, float(ratio)] for keyword, ratio in keywords_with_ratios])
+        return keywords_with_ratios
+
+    def rationize_keywords(self, keywords: List[str], tf_idf_pairs: List[List[Tuple[str, numpy.float64]]],
+                           aggregation='sum') -> List[List[Tuple[str, numpy.float64]]]:
+        """
+        Assigns the TF-IDF weights of their words to the keywords and excludes keywords without weights
+        (keyphrases whose weight is not positive).
+
+        All keyword words are lemmatized at once, and their weights are looked up in the dictionary "lemma" — "weight"
+        built from the pairs (of the pairs with equal words, the first one is used).
+
+        :param keywords: keyword list (see :py:meth:`get_keywords_pullenti`).
+        :param tf_idf_pairs: TF-IDF pair list of the text the keywords are extracted from.
+        :param aggregation: the weight of a keyphrase: 'sum' — the sum of the weights of its words, 'mean' — the sum
+            divided by the number of its words, 'max' — the maximum weight of its words.
+        :return: list of pairs "keyword-ratio" sorted by descending ratios.
+        """
+        if aggregation not in configs.KEYPHRASE_AGGREGATIONS:
+            raise ValueError(f'unknown keyphrase aggregation {aggregation!r} '
+                             f'(available: {", ".join(configs.KEYPHRASE_AGGREGATIONS)})')
+
+        weights = {}
+        for word, weight in tf_idf_pairs:
+            weights.setdefault(word, weight)
+
+        keyphrases_words = [keyword.split() for keyword in keywords]
+        words = list({word: None for keyphrase_words in keyphrases_words for word in keyphrase_words})
+        normal_forms = self.get_lemmas(words)
 
         keywords_with_ratios = []
-        for keyword in keywords:
-            # the element is a word or phrase
-            keyphrase_words = keyword.split()
+        for keyword, keyphrase_words in zip(keywords, keyphrases_words):
             if len(keyphrase_words) > 1:  # phrase
-                tf_idf_sum = 0.0
-                # passage according to the keyword phrase
-                for word in keyphrase_words:
-                    normal_word = self.get_normal_form(word)
-                    for tf_idf_pair in tf_idf_pairs:
-                        if normal_word == tf_idf_pair[0]:
-                            tf_idf_sum += tf_idf_pair[1]
-                            break
-                if tf_idf_sum > 0:
-                    keywords_with_ratios.append([keyword, tf_idf_sum])
-            else:  # word
-                normal_word = self.get_normal_form(keyword)
-                # passing through TF-IDF word weights of all documents
-                for tf_idf_pair in tf_idf_pairs:
-                    if normal_word == tf_idf_pair[0]:
-                        keywords_with_ratios.append([keyword, tf_idf_pair[1]])
-                        break
+                phrase_weights = [weights[normal_forms[word]] for word in keyphrase_words
+                                  if normal_forms[word] in weights]
+                if aggregation == 'max':
+                    ratio = max(phrase_weights, default=0.0)
+                else:
+                    ratio = 0.0
+                    for weight in phrase_weights:
+                        ratio += weight
+                    if aggregation == 'mean':
+                        ratio /= len(keyphrase_words)
+                if ratio > 0:
+                    keywords_with_ratios.append([keyword, ratio])
+            elif keyphrase_words:  # word
+                normal_word = normal_forms[keyphrase_words[0]]
+                if normal_word in weights:
+                    keywords_with_ratios.append([keyword, weights[normal_word]])
         keywords_with_ratios.sort(key=lambda item: item[1], reverse=True)
         return keywords_with_ratios
+
+    def get_collection_rationized_keywords(self, documents: Iterable[dict], section_name='', smartirs='ntc',
+                                           aggregation='sum', workers: Optional[int] = 1
+                                           ) -> List[List[List[Tuple[str, numpy.float64]]]]:
+        """
+        Returns rationized keywords (see :py:meth:`get_structure_rationized_keywords`) of each document of
+        the collection. The objects are read once, a single TF-IDF model of the collection is built, and the keywords
+        of all documents are extracted by :py:meth:`get_keywords_pullenti_batch`.
+
+        :param documents: the MongoDB collection objects (see :py:meth:`get_structure_tf_idf_pairs`).
+        :param section_name: the name of the section of the structure, relative to which the content will be
+            selected from each structure from documents.
+        :param smartirs: three letters represents the term weighting of the collection document vector
+            (e.g. 'ntc', see smart term-weighting triple notation)
+        :param aggregation: the weight of a keyphrase (see :py:meth:`rationize_keywords`).
+        :param workers: number of processes extracting the keywords (see :py:meth:`get_keywords_pullenti_batch`).
+        :return: lists of pairs "keyword-ratio" in the order of the documents.
+        """
+        contents = list(iter_contents(documents, section_name))
+        all_tf_idf_pairs = self.get_tf_idf_pairs(contents, smartirs=smartirs)
+        all_keywords = self.get_keywords_pullenti_batch(contents, workers)
+        return [self.rationize_keywords(keywords, tf_idf_pairs, aggregation)
+                for keywords, tf_idf_pairs in zip(all_keywords, all_tf_idf_pairs)]
+
+
+# language processor of the current process of the pool used by LanguageProcessor.get_keywords_pullenti_batch
+# and LanguageProcessor.tokenize_many
+_worker_language_processor: Optional[LanguageProcessor] = None
+
+
+def _init_worker_language_processor(init_pullenti=True, morph_cache_size: Optional[int] = 0):
+    global _worker_language_processor
+    _worker_language_processor = LanguageProcessor(init_pullenti, morph_cache_size)
+
+
+def _get_keywords_pullenti_in_worker(text: str) -> List[str]:
+    return _worker_language_processor.get_keywords_pullenti(text)
+
+
+# pullenti processor of the keyword analyzer of the current process (see LanguageProcessor.keyword_processor)
+_keyword_processor = None
+
+
+def _get_keyword_processor():
+    global _keyword_processor
+    if _keyword_processor is None:
+        from pullenti.ner.ProcessorService import ProcessorService
+        from pullenti.ner.keyword.KeywordAnalyzer import KeywordAnalyzer
+        _keyword_processor = ProcessorService.create_specific_processor(KeywordAnalyzer.ANALYZER_NAME)
+    return _keyword_processor
+
+
+def _get_lemmas_in_worker(words: List[str], part_of_speech: str) -> Dict[str, Optional[str]]:
+    return _worker_language_processor.get_lemmas(words, part_of_speech)
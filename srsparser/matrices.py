@@ -0,0 +1,106 @@
+from typing import Dict, Iterable, Optional, Set
+
+import numpy
+from scipy.sparse import csr_matrix, diags
+
+
+def get_top_k_per_row(matrix: csr_matrix, k: int) -> csr_matrix:
+    """
+    Keeps only `k` largest elements in each row of the sparse matrix.
+    Of the equal elements, the ones with smaller column indices are preferred.
+
+    :return: CSR matrix of the same shape.
+    """
+    matrix = csr_matrix(matrix, copy=True)
+    # the results of the matrix products may store the elements of a row in any order
+    matrix.sort_indices()
+    rows = numpy.repeat(numpy.arange(matrix.shape[0]), numpy.diff(matrix.indptr))
+
+    # order of the elements: by rows, then by descending values, then by the storage position
+    order = numpy.lexsort((numpy.arange(matrix.nnz), -matrix.data, rows))
+    ranks = numpy.empty(matrix.nnz, dtype=numpy.int64)
+    ranks[order] = numpy.arange(matrix.nnz) - matrix.indptr[rows[order]]
+
+    mask = ranks < k
+    indptr = numpy.concatenate(([0], numpy.cumsum(numpy.bincount(rows[mask], minlength=matrix.shape[0]))))
+    return csr_matrix((matrix.data[mask], matrix.indices[mask], indptr), shape=matrix.shape)
+
+
+def normalize_rows(matrix: csr_matrix) -> csr_matrix:
+    """
+    Scales the rows of the sparse matrix to the unit euclidean length (zero rows remain zero).
+    """
+    matrix = csr_matrix(matrix, dtype=numpy.float64)
+    norms = numpy.sqrt(numpy.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    inverse_norms = numpy.divide(1.0, norms, out=numpy.zeros_like(norms), where=norms > 0)
+    return csr_matrix(diags(inverse_norms).dot(matrix))
+
+
+def get_cosine_similarities(matrix: csr_matrix, other: Optional[csr_matrix] = None) -> numpy.ndarray:
+    """
+    Calculates cosine similarity of each row of `matrix` with each row of `other` (default: `matrix`).
+
+    :return: dense matrix of shape (rows of `matrix`, rows of `other`).
+    """
+    normalized = normalize_rows(matrix)
+    other_normalized = normalized if other is None else normalize_rows(other)
+    return normalized.dot(other_normalized.T).toarray()
+
+
+def get_binary_matrix(token_sets: Iterable[Set[str]], vocabulary: Dict[str, int], extend=True) -> csr_matrix:
+    """
+    Encodes the token sets as rows of the sparse binary matrix "set x token".
+
+    :param vocabulary: dictionary containing pairs like "token" — "column index".
+    :param extend: True — tokens missing in the vocabulary are added to it, else — they are skipped.
+    :return: CSR matrix of shape (number of sets, size of the vocabulary).
+    """
+    indptr = [0]
+    indices = []
+    for tokens in token_sets:
+        for token in tokens:
+            if extend:
+                indices.append(vocabulary.setdefault(token, len(vocabulary)))
+            elif token in vocabulary:
+                indices.append(vocabulary[token])
+        indptr.append(len(indices))
+    return csr_matrix((numpy.ones(len(indices)), indices, indptr), shape=(len(indptr) - 1, len(vocabulary)))
+
+
+def get_binary_cosine_similarities(matrix: csr_matrix, sizes: numpy.ndarray, other: csr_matrix,
+                                   other_sizes: numpy.ndarray) -> csr_matrix:
+    """
+    Calculates cosine similarity of each token set encoded by the binary `matrix` with each token set encoded by
+    the binary `other` (see :py:func:`get_binary_matrix`): the number of common tokens divided by the square root of
+    the product of the set sizes. The square roots are calculated like in
+    :py:meth:`LanguageProcessor.strings_similarity` (`x ** 0.5` of Python floats, which may differ from `numpy.sqrt`
+    in the last bit), so the similarities are equal to its ratios.
+
+    :param sizes: sizes of the token sets of `matrix` (may exceed the numbers of the encoded tokens, if tokens
+        missing in the vocabulary are skipped).
+    :param other_sizes: sizes of the token sets of `other`.
+    :return: CSR matrix of shape (rows of `matrix`, rows of `other`) without zero similarities.
+    """
+    common = csr_matrix(matrix.dot(other.T))
+    common.eliminate_zeros()
+    rows = numpy.repeat(numpy.arange(common.shape[0]), numpy.diff(common.indptr))
+    products, inverse = numpy.unique(sizes[rows] * other_sizes[common.indices], return_inverse=True)
+    norms = numpy.array([float(product) ** 0.5 for product in products], dtype=numpy.float64)
+    common.data = common.data / norms[inverse.ravel()]
+    return common
+
+
+def filter_matrix(matrix: csr_matrix, threshold: Optional[float] = None, top_k: Optional[int] = None) -> csr_matrix:
+    """
+    Keeps only the elements of the sparse matrix not less than `threshold` and only `top_k` largest elements in each
+    row (see :py:func:`get_top_k_per_row`).
+
+    :return: CSR matrix of the same shape.
+    """
+    matrix = csr_matrix(matrix)
+    if threshold is not None:
+        matrix.data[matrix.data < threshold] = 0
+        matrix.eliminate_zeros()
+    if top_k is not None:
+        matrix = get_top_k_per_row(matrix, top_k)
+    return matrix
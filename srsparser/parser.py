@@ -1,4 +1,13 @@
+import copy
+import io
+import json
+import os
 import re
+import traceback
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import IO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
 
 from docx import Document
 from docx.document import Document as DocumentWithTable
@@ -7,9 +16,44 @@ from docx.oxml.text.paragraph import CT_P
 from docx.table import _Cell, Table
 from docx.text.paragraph import Paragraph
 
-from srsparser import configs
+from srsparser import __version__, configs
+from srsparser.cache import LRUCache, get_hash, get_stream_hash, get_structure_hash, make_cache_key
+from srsparser.docx_reader import iter_docx_paragraphs
 from srsparser.language_processor import LanguageProcessor
+from srsparser.profiling import NULL_PROFILER, Profiler
 from srsparser.sections_tree import SectionsTree
+from srsparser.template_matcher import TemplateMatcher
+
+
+class ParagraphRecord(NamedTuple):
+    """
+    Document paragraph data shared by the section detection strategies of the :py:class:`Parser`.
+    """
+    # paragraph text
+    text: str
+    # whether the paragraph is a table element (see Parser.is_table_element)
+    in_table: bool
+    # similarity ratio with the most similar leaf section of the template and the index of this section
+    # (0.0 and None if the ratio is less than MIN_SIMILARITY_RATIO, see TemplateMatcher.match_heading)
+    heading_score: float
+    best_leaf: Optional[int]
+    # the same for the text to the left of the first colon (if the paragraph contains a colon)
+    label_score: float = 0.0
+    label_best_leaf: Optional[int] = None
+
+
+class ParseResult(NamedTuple):
+    """
+    Result of parsing a single .docx document by :py:meth:`Parser.parse_many`.
+    """
+    path: str
+    # filled sections tree structure (None if parsing failed)
+    structure: Optional[dict]
+    # representation of the exception raised during parsing, its type name and traceback (None if parsing
+    # succeeded); the exception itself is not returned, since it may not be sent from a process of the pool
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+    traceback: Optional[str] = None
 
 
 class Parser:
@@ -17,20 +61,169 @@ class Parser:
     Parser analyzes semi-structured .docx documents and forming sections tree documents according to the templates.
     """
 
-    def __init__(self, sections_tree_template: dict):
+    def __init__(self, sections_tree_template: dict, profiler: Optional[Profiler] = None, cache=None,
+                 heading_cache_size: Optional[int] = configs.HEADING_CACHE_SIZE,
+                 heading_cache_path: Optional[str] = None, nlp: Optional[LanguageProcessor] = None):
         """
         :param sections_tree_template: sections tree structure containing certain sections tree structure,
             which will be filled text content according to the relevant .docx file.
+        :param profiler: :py:class:`Profiler` collecting the time of the stages: docx_load, iter_paragraphs,
+            get_table_cells, is_table_element, is_heading, fill_tree, to_dict and the stages of the language processor
+            (default: profiling is disabled). Documents parsed in a pool of processes are not profiled.
+        :param cache: cache of the parsed structures (:py:class:`LRUCache` or :py:class:`SQLiteCache`) keyed by
+            the hash of the document content, the hash of the template, the library version and the matching settings
+            (MIN_SIMILARITY_RATIO and NUMBERING_PATTERN), so that re-uploaded documents are not parsed again
+            (default: caching is disabled). Documents parsed in a pool of processes
+            are not cached.
+        :param heading_cache_size: maximum number of distinct paragraph texts whose matching with the template
+            (see :py:meth:`match_heading`) is cached across the parsed documents (None — unbounded, 0 — caching is
+            disabled).
+        :param heading_cache_path: path to the JSON file with the cached matching (see :py:meth:`save_heading_cache`),
+            which is loaded if it exists and was saved for the same template and MIN_SIMILARITY_RATIO.
+        :param nlp: language processor shared with other parsers (default: a new language processor without
+            pullenti using `profiler`).
         """
+        self.template = sections_tree_template
+        self.profiler = profiler or NULL_PROFILER
+        self.cache = cache
+        self.template_hash = get_structure_hash(sections_tree_template)
         self.sections_tree = SectionsTree(sections_tree_template)
-        self.nlp = LanguageProcessor(init_pullenti=False)
+        self.nlp = nlp or LanguageProcessor(init_pullenti=False, profiler=self.profiler)
+        self.matcher = TemplateMatcher(self.sections_tree, self.nlp)
 
-    def parse_docx(self, path: str) -> dict:
+        # normalized paragraph text -> (similarity ratio, index of the most similar leaf section)
+        self.heading_cache = LRUCache(heading_cache_size)
+        # MIN_SIMILARITY_RATIO the cached matching is valid for
+        self.heading_cache_ratio = configs.MIN_SIMILARITY_RATIO
+        self.heading_cache_path = heading_cache_path
+        if heading_cache_path is not None and os.path.exists(heading_cache_path):
+            self.load_heading_cache(heading_cache_path)
+
+    def parse_docx(self, path: Union[str, bytes, IO[bytes]], streaming=False) -> dict:
         """
         Reads .docx document and returns sections tree structure filled according to the it's content.
+
+        :param path: path to the .docx file, its content or a binary file object (e.g. io.BytesIO).
+        :param streaming: True — read the paragraphs incrementally without building the python-docx document
+            (see :py:func:`iter_docx_paragraphs`), so the memory used grows with the text of the document, not with its
+            XML tree; a paragraph is considered a table element if it is inside a table
+            (see :py:meth:`is_table_element`).
+        """
+        key = None
+        if self.cache is not None:
+            if isinstance(path, (bytes, bytearray)):
+                content_hash = get_hash(path)
+            else:
+                if not isinstance(path, str) and not (hasattr(path, 'seekable') and path.seekable()):
+                    # the content of a stream is read once for both hashing and parsing
+                    path = path.read()
+                content_hash = get_hash(path) if isinstance(path, bytes) else get_stream_hash(path)
+            # the structure also depends on the matching settings
+            key = make_cache_key('parse_docx', content_hash, self.template_hash, __version__,
+                                 configs.MIN_SIMILARITY_RATIO, configs.NUMBERING_PATTERN, streaming)
+            structure = self.cache.get(key)
+            if structure is not None:
+                return copy.deepcopy(structure)
+
+        if isinstance(path, (bytes, bytearray)):
+            path = io.BytesIO(path)
+
+        structure = self._parse_docx(path, streaming)
+        if key is not None:
+            self.cache.put(key, copy.deepcopy(structure))
+        return structure
+
+    def _parse_docx(self, path: Union[str, IO[bytes]], streaming: bool) -> dict:
+        records = [self.get_paragraph_record(text, in_table) for text, in_table in self.read_paragraphs(path, streaming)]
+        return self.get_records_structure(records)
+
+    def read_paragraphs(self, path: Union[str, IO[bytes]], streaming=False) -> Iterable[Tuple[str, bool]]:
+        """
+        Reads the paragraphs of the .docx document.
+
+        :param path: path to the .docx file or a binary file object.
+        :param streaming: read the paragraphs incrementally (see :py:meth:`parse_docx`); the paragraphs are returned
+            by an iterator, which reads the document as it is consumed.
+        :return: list (iterator in the streaming mode) of pairs "paragraph text" — "whether the paragraph is a table
+            element".
+        """
+        if streaming:
+            return self._iter_docx_paragraphs(path)
+
+        with self.profiler.stage('docx_load'):
+            document = Document(path)
+        return self.get_paragraphs(document)
+
+    def _iter_docx_paragraphs(self, path: Union[str, IO[bytes]]) -> Iterator[Tuple[str, bool]]:
+        paragraphs = iter_docx_paragraphs(path)
+        while True:
+            with self.profiler.stage('iter_paragraphs'):
+                paragraph = next(paragraphs, None)
+            if paragraph is None:
+                return
+            yield paragraph
+
+    def parse_many(self, paths: Iterable[str], workers: Optional[int] = None, ordered=True,
+                   chunksize=1, streaming=False, max_pending: Optional[int] = None) -> Iterator[ParseResult]:
+        """
+        Parses .docx documents in a pool of processes. Each process creates its own parser once
+        (loads morphological dictionaries and compiles the template), and each document is parsed into
+        a fresh copy of the template.
+
+        An error in a document does not abort the batch: it is reported in the corresponding :py:class:`ParseResult`.
+
+        :param paths: paths of the .docx documents.
+        :param workers: number of processes (default: number of CPUs; 1 — parse in the current process).
+        :param ordered: True — results are returned in the order of `paths`, False — as soon as they are ready.
+        :param chunksize: number of documents sent to a process at once.
+        :param streaming: read the documents incrementally (see :py:meth:`parse_docx`).
+        :param max_pending: maximum number of chunks of documents sent to the processes and not returned yet
+            (default: twice the number of processes); the paths are read as the results are returned, so the number
+            of documents in progress is bounded.
+        :return: iterator over :py:class:`ParseResult`.
+        """
+        if workers == 1:
+            for path in paths:
+                yield self.parse_docx_safely(path, streaming)
+            return
+
+        workers = workers or os.cpu_count() or 1
+        max_pending = max_pending or 2 * workers
+        paths = iter(paths)
+        chunks = iter(lambda: list(islice(paths, chunksize)), [])
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker_parser,
+                                 initargs=(self.template, streaming)) as executor:
+            if ordered:
+                futures = deque()
+                for chunk in chunks:
+                    futures.append(executor.submit(_parse_docx_in_worker, chunk))
+                    if len(futures) >= max_pending:
+                        yield from futures.popleft().result()
+                while futures:
+                    yield from futures.popleft().result()
+            else:
+                futures = set()
+                for chunk in chunks:
+                    if len(futures) >= max_pending:
+                        done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield from future.result()
+                    futures.add(executor.submit(_parse_docx_in_worker, chunk))
+                while futures:
+                    done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+
+    def parse_docx_safely(self, path: str, streaming=False) -> ParseResult:
+        """
+        Parses .docx document like :py:meth:`parse_docx`, but returns the description of the raised exception
+        instead of raising it.
         """
-        document = Document(path)
-        return self.get_sections_structure(document)
+        try:
+            return ParseResult(path, self.parse_docx(path, streaming))
+        except Exception as e:
+            return ParseResult(path, None, repr(e), type(e).__name__, traceback.format_exc())
 
     @staticmethod
     def save_as_docx(sections_structure: dict, name: str):
@@ -51,77 +244,214 @@ class Parser:
         """
         Returns sections tree structure filled according to the text document content.
         """
-        sections = self.get_sections_first(doc)
-        self.fill_tree(sections)
+        return self.get_records_structure(self.get_paragraph_records(doc))
+
+    def get_records_structure(self, records: List[ParagraphRecord]) -> dict:
+        """
+        Returns sections tree structure filled according to the document paragraphs
+        (see :py:meth:`get_paragraph_records`).
+        """
+        # each document fills its own copy of the template
+        sections_tree = SectionsTree(self.template)
+
+        sections = self.get_sections_first(records)
+        self.fill_tree(sections, sections_tree)
+
+        sections = self.get_sections_second(records)
+        self.fill_tree(sections, sections_tree)
+
+        with self.profiler.stage('to_dict'):
+            return sections_tree.to_dict()
+
+    def get_paragraph_records(self, doc: Document) -> List[ParagraphRecord]:
+        """
+        Reads the document paragraphs once and matches them with the template leaf sections.
+
+        :return: :py:class:`ParagraphRecord` list in the order of the paragraphs in the document.
+        """
+        return [self.get_paragraph_record(text, in_table) for text, in_table in self.get_paragraphs(doc)]
+
+    def get_paragraphs(self, doc: Document) -> List[Tuple[str, bool]]:
+        """
+        Returns the paragraphs of the document (see :py:meth:`iter_paragraphs`).
+
+        :return: list of pairs "paragraph text" — "whether the paragraph is a table element"
+            (see :py:meth:`is_table_element`).
+        """
+        with self.profiler.stage('iter_paragraphs'):
+            paragraphs = list(self.iter_paragraphs(doc))
+        with self.profiler.stage('get_table_cells'):
+            table_cells = self.get_table_cells(doc)
+
+        result = []
+        for paragraph in paragraphs:
+            with self.profiler.stage('is_table_element'):
+                in_table = self.is_table_element(paragraph, table_cells)
+            result.append((paragraph.text, in_table))
+        return result
+
+    def get_paragraph_record(self, text: str, in_table: bool,
+                             lemma_sets: Optional[Dict[str, Set[str]]] = None) -> ParagraphRecord:
+        """
+        Returns :py:class:`ParagraphRecord` for the paragraph with the text `text`.
+
+        :param lemma_sets: dictionary containing pairs like "text" — "lemma set" of the already tokenized texts
+            (the paragraph text and the text to the left of its first colon).
+        """
+        lemma_sets = lemma_sets or {}
+        heading_score, best_leaf = self.match_heading(text, lemma_sets.get(text))
+
+        # section is array where the first el is heading and the second is content
+        section = text.split(':', 1)
+        if len(section) <= 1:
+            return ParagraphRecord(text, in_table, heading_score, best_leaf)
+
+        label_score, label_best_leaf = self.match_heading(section[0], lemma_sets.get(section[0]))
+        return ParagraphRecord(text, in_table, heading_score, best_leaf, label_score, label_best_leaf)
+
+    def match_heading(self, text: str, lemmas: Optional[Set[str]] = None) -> Tuple[float, Optional[int]]:
+        """
+        Finds the leaf section most similar to the paragraph text, if their similarity ratio is not less than
+        MIN_SIMILARITY_RATIO (see :py:meth:`TemplateMatcher.match_heading`).
+
+        The results are cached by the text in lower case with collapsed whitespaces (the matching does not depend
+        on them), so repeated headings and boilerplate paragraphs are matched once across the parsed documents.
+        The cache is cleared when MIN_SIMILARITY_RATIO changes.
+
+        :param lemmas: the lemma set of the text, if it is already tokenized (see
+            :py:meth:`TemplateMatcher.match_heading_lemmas`).
+        :return: the similarity ratio and the index of the most similar leaf section
+            ((0.0, None) if the ratio is less than MIN_SIMILARITY_RATIO).
+        """
+        with self.profiler.stage('is_heading'):
+            if self.heading_cache.maxsize == 0:
+                return self._match_heading(text, lemmas)
+
+            if self.heading_cache_ratio != configs.MIN_SIMILARITY_RATIO:
+                self.heading_cache.clear()
+                self.heading_cache_ratio = configs.MIN_SIMILARITY_RATIO
+
+            key = self.get_heading_key(text)
+            match = self.heading_cache.get(key)
+            if match is None:
+                match = self._match_heading(text, lemmas)
+                self.heading_cache.put(key, match)
+            return match[0], match[1]
+
+    @staticmethod
+    def get_heading_key(text: str) -> str:
+        """
+        Returns the key of the text in the heading cache: the text in lower case with collapsed whitespaces.
+        """
+        return ' '.join(text.lower().split())
+
+    def _match_heading(self, text: str, lemmas: Optional[Set[str]]) -> Tuple[float, Optional[int]]:
+        if lemmas is None:
+            return self.matcher.match_heading(text)
+        return self.matcher.match_heading_lemmas(lemmas)
 
-        sections = self.get_sections_second(doc)
-        self.fill_tree(sections)
+    def save_heading_cache(self, path: Optional[str] = None):
+        """
+        Saves the cached matching of the paragraph texts with the template (see :py:meth:`match_heading`) to the JSON
+        file `path` (default: `heading_cache_path`) together with the hash of the template and MIN_SIMILARITY_RATIO,
+        so that other parsers of the same template can start with the populated cache.
+        """
+        path = path or self.heading_cache_path
+        if path is None:
+            raise ValueError('the path to the heading cache file is not specified')
 
-        return self.sections_tree.to_dict()
+        data = {
+            'template_hash': self.template_hash,
+            'min_similarity_ratio': self.heading_cache_ratio,
+            'entries': self.heading_cache.items(),
+        }
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False)
 
-    def get_sections_first(self, doc: Document) -> dict:
+    def load_heading_cache(self, path: str) -> bool:
+        """
+        Loads the cached matching from the JSON file created by :py:meth:`save_heading_cache`, if it was saved for
+        the same template and MIN_SIMILARITY_RATIO.
+
+        :return: True — the cache is loaded, else — False.
+        """
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+
+        if data['template_hash'] != self.template_hash or data['min_similarity_ratio'] != configs.MIN_SIMILARITY_RATIO:
+            return False
+        if self.heading_cache_ratio != configs.MIN_SIMILARITY_RATIO:
+            self.heading_cache.clear()
+            self.heading_cache_ratio = configs.MIN_SIMILARITY_RATIO
+        for key, (score, leaf_idx) in data['entries']:
+            self.heading_cache.put(key, (score, leaf_idx))
+        return True
+
+    @staticmethod
+    def get_sections_first(records: List[ParagraphRecord]) -> Dict[str, Tuple[Optional[int], str]]:
         """
         Returns sections according to parsing paragraphs content.
         The section heading can be to the left of the first occurrence of the colon.
         (example: 1.2 Условное обозначение: АИС «Товарищество собственников жилья»).
 
-        :return: dictionary containing pairs like "section heading" — "section content".
+        :param records: document paragraphs (see :py:meth:`get_paragraph_records`).
+        :return: dictionary containing pairs like "section heading" — ("leaf section index", "section content").
         """
         result = {}
 
-        for paragraph in self.iter_paragraphs(doc):
+        for record in records:
             # section is array where the first el is heading and the second is content
-            section = paragraph.text.split(':', 1)
+            section = record.text.split(':', 1)
             if len(section) <= 1:
                 continue
 
-            if self.is_heading(section[0]) and not self.is_table_element(paragraph, doc):
+            if record.label_score >= configs.MIN_SIMILARITY_RATIO and not record.in_table:
                 if section[0] and section[1]:
-                    result[section[0]] = section[1].strip()
+                    result[section[0]] = (record.label_best_leaf, section[1].strip())
         return result
 
-    def get_sections_second(self, doc: Document) -> dict:
+    def get_sections_second(self, records: List[ParagraphRecord]) -> Dict[str, Tuple[Optional[int], str]]:
         """
         Returns sections according to the position of paragraphs in a text document.
 
-        :return: dictionary containing pairs like "section heading" — "section content".
+        :param records: document paragraphs (see :py:meth:`get_paragraph_records`).
+        :return: dictionary containing pairs like "section heading" — ("leaf section index", "section content").
         """
         result = {}
         curr_heading_text = ''
+        curr_heading_leaf = self.matcher.get_best_leaf_idx(curr_heading_text)
         curr_heading_paragraphs = []
 
-        for paragraph in self.iter_paragraphs(doc):
+        for record in records:
             # tables contain their own headings, so we do not take them into account
-            if self.is_heading(paragraph.text) and not self.is_table_element(paragraph, doc):
+            if record.heading_score >= configs.MIN_SIMILARITY_RATIO and not record.in_table:
                 if curr_heading_text and curr_heading_paragraphs:
-                    result[curr_heading_text] = ' '.join(curr_heading_paragraphs)
+                    result[curr_heading_text] = (curr_heading_leaf, ' '.join(curr_heading_paragraphs))
 
-                curr_heading_text = re.sub(configs.NUMBERING_PATTERN, '', paragraph.text).strip()
+                curr_heading_text = re.sub(configs.NUMBERING_PATTERN, '', record.text).strip()
+                curr_heading_leaf = record.best_leaf
                 curr_heading_paragraphs.clear()
-            elif len(paragraph.text) > 1:
-                curr_heading_paragraph = re.sub(configs.NUMBERING_PATTERN, '', paragraph.text).strip()
+            elif len(record.text) > 1:
+                curr_heading_paragraph = re.sub(configs.NUMBERING_PATTERN, '', record.text).strip()
                 if self.nlp.punct_at_end_pattern.match(curr_heading_paragraph) is None:
                     curr_heading_paragraph += '.'
                 curr_heading_paragraphs.append(curr_heading_paragraph)
-        result[curr_heading_text] = ' '.join(curr_heading_paragraphs)
+        result[curr_heading_text] = (curr_heading_leaf, ' '.join(curr_heading_paragraphs))
         return result
 
-    def fill_tree(self, sections: dict):
+    def fill_tree(self, sections: Dict[str, Tuple[Optional[int], str]], sections_tree: Optional[SectionsTree] = None):
         """
         Fills leaf sections tree structure expressed section nesting levels.
 
-        :param sections: dictionary containing pairs like "section heading" — "section content".
+        :param sections: dictionary containing pairs like "section heading" — ("leaf section index",
+            "section content") (see :py:meth:`get_sections_first` and :py:meth:`get_sections_second`).
+        :param sections_tree: copy of the template to fill (default: `sections_tree` of the parser).
         """
-        for heading, text in sections.items():
-            max_ratio = 0
-            text_parent = None
-            for section in self.sections_tree.get_leaf_sections():
-                ratio = self.nlp.strings_similarity(section.name, heading)
-                if ratio >= max_ratio:
-                    max_ratio = ratio
-                    text_parent = section
-            if text_parent is not None:
-                text_parent.text = text.strip()
+        with self.profiler.stage('fill_tree'):
+            leaves = self.matcher.leaves if sections_tree is None else sections_tree.get_leaf_sections()
+            for leaf_idx, text in sections.values():
+                if leaf_idx is not None:
+                    leaves[leaf_idx].text = text.strip()
 
     def iter_paragraphs(self, parent):
         if isinstance(parent, DocumentWithTable):
@@ -147,21 +477,153 @@ class Parser:
 
         :return: True — yes, else — False.
         """
-        for section in self.sections_tree.get_leaf_sections():
-            if self.nlp.strings_similarity(section.name, p_text) >= configs.MIN_SIMILARITY_RATIO:
-                return True
-        return False
+        return self.match_heading(p_text)[1] is not None
 
     @staticmethod
-    def is_table_element(paragraph: Paragraph, doc: Document) -> bool:
+    def get_table_cells(doc: Document) -> Set[str]:
+        """
+        Returns table cells index of the document: the set of texts of all table cells without leading and trailing
+        whitespaces. The index is built once per document and is used by :py:meth:`is_table_element`.
+        """
+        return {cell.text.strip() for table in doc.tables for row in table.rows for cell in row.cells}
+
+    @staticmethod
+    def is_table_element(paragraph: Paragraph, table_cells: Set[str]) -> bool:
         """
         Checks whether the paragraph is a table element.
 
+        :param table_cells: table cells index of the document (see :py:meth:`get_table_cells`).
         :return: True — yes, else — False.
         """
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    if cell.text.strip() == paragraph.text.strip():
-                        return True
-        return False
+        return paragraph.text.strip() in table_cells
+
+
+class TemplateMatch(NamedTuple):
+    """
+    Result of parsing a document according to one of the templates of the :py:class:`MultiTemplateParser`.
+    """
+    template_name: str
+    # filled sections tree structure of the template
+    structure: dict
+    # share of the leaf sections of the template matched by the headings of the document (see get_coverage)
+    coverage: float
+
+
+class MultiTemplateParser:
+    """
+    Parser of documents of several kinds: each document is read once, its paragraphs are tokenized once and matched
+    with the leaf sections of all templates, and the template fitting the document best is selected by the coverage
+    of its leaf sections by the headings of the document.
+    """
+
+    def __init__(self, templates: Dict[str, dict], profiler: Optional[Profiler] = None,
+                 heading_cache_size: Optional[int] = configs.HEADING_CACHE_SIZE):
+        """
+        :param templates: dictionary containing pairs like "template name" — "sections tree structure template"
+            (see :py:class:`Parser`).
+        :param profiler: :py:class:`Profiler` collecting the time of the stages (see :py:class:`Parser`).
+        :param heading_cache_size: maximum number of distinct paragraph texts whose matching with each template is
+            cached (see :py:class:`Parser`).
+        """
+        if not templates:
+            raise ValueError('at least one template is required')
+
+        self.profiler = profiler or NULL_PROFILER
+        # the language processor (and its morphological analysis cache) is shared by the parsers of the templates
+        self.nlp = LanguageProcessor(init_pullenti=False, profiler=self.profiler)
+        self.parsers: Dict[str, Parser] = {
+            name: Parser(template, self.profiler, heading_cache_size=heading_cache_size, nlp=self.nlp)
+            for name, template in templates.items()
+        }
+
+    def parse_docx(self, path: Union[str, bytes, IO[bytes]], streaming=False) -> List[TemplateMatch]:
+        """
+        Reads .docx document once and returns sections tree structures of all templates filled according to its
+        content.
+
+        :param path: path to the .docx file, its content or a binary file object.
+        :param streaming: read the paragraphs incrementally (see :py:meth:`Parser.parse_docx`).
+        :return: :py:class:`TemplateMatch` list sorted by descending coverage (templates with equal coverage are
+            in the order of `templates`).
+        """
+        return [TemplateMatch(name, self.parsers[name].get_records_structure(records), coverage)
+                for name, records, coverage in self.match_templates(path, streaming)]
+
+    def parse_best(self, path: Union[str, bytes, IO[bytes]], streaming=False) -> TemplateMatch:
+        """
+        Reads .docx document once and returns the sections tree structure of the template with the largest coverage
+        (see :py:meth:`parse_docx`); the structures of the other templates are not filled.
+        """
+        name, records, coverage = self.match_templates(path, streaming)[0]
+        return TemplateMatch(name, self.parsers[name].get_records_structure(records), coverage)
+
+    def match_templates(self, path: Union[str, bytes, IO[bytes]],
+                        streaming=False) -> List[Tuple[str, List[ParagraphRecord], float]]:
+        """
+        Reads .docx document once and matches its paragraphs with the leaf sections of each template.
+
+        :return: list of triples "template name" — "document paragraphs" (see :py:meth:`Parser.get_paragraph_records`)
+            — "coverage" sorted by descending coverage.
+        """
+        if isinstance(path, (bytes, bytearray)):
+            path = io.BytesIO(path)
+
+        parsers = list(self.parsers.values())
+        # the paragraphs are matched with each template, so they are kept
+        paragraphs = list(parsers[0].read_paragraphs(path, streaming))
+
+        # the paragraph texts and the texts to the left of their first colons are tokenized once for all templates
+        # (except the texts whose matching is cached by all parsers)
+        texts = {}
+        for text, _ in paragraphs:
+            texts[text] = None
+            if ':' in text:
+                texts[text.split(':', 1)[0]] = None
+        pending = [text for text in texts
+                   if not all(parser.get_heading_key(text) in parser.heading_cache for parser in parsers)]
+        lemma_sets = {text: set(tokens) for text, tokens in zip(pending, self.nlp.tokenize_many(pending))}
+
+        results = []
+        for name, parser in self.parsers.items():
+            records = [parser.get_paragraph_record(text, in_table, lemma_sets) for text, in_table in paragraphs]
+            results.append((name, records, self.get_coverage(records, len(parser.matcher.leaves))))
+        results.sort(key=lambda result: result[2], reverse=True)
+        return results
+
+    @staticmethod
+    def get_coverage(records: List[ParagraphRecord], leaves_count: int) -> float:
+        """
+        Returns the share of the leaf sections of the template matched by the headings of the document: paragraphs
+        (or the texts to the left of their first colons) outside tables whose similarity ratio with a leaf section is
+        not less than MIN_SIMILARITY_RATIO.
+
+        :param records: document paragraphs matched with the template (see :py:meth:`Parser.get_paragraph_records`).
+        :param leaves_count: number of the leaf sections of the template.
+        """
+        if leaves_count == 0:
+            return 0.0
+
+        matched_leaves = set()
+        for record in records:
+            if record.in_table:
+                continue
+            if record.heading_score >= configs.MIN_SIMILARITY_RATIO and record.best_leaf is not None:
+                matched_leaves.add(record.best_leaf)
+            if record.label_score >= configs.MIN_SIMILARITY_RATIO and record.label_best_leaf is not None:
+                matched_leaves.add(record.label_best_leaf)
+        return len(matched_leaves) / leaves_count
+
+
+# parser of the current process of the pool used by Parser.parse_many and the reading mode of the documents
+_worker_parser: Optional[Parser] = None
+_worker_streaming = False
+
+
+def _init_worker_parser(sections_tree_template: dict, streaming=False):
+    global _worker_parser, _worker_streaming
+    _worker_parser = Parser(sections_tree_template)
+    _worker_streaming = streaming
+
+
+def _parse_docx_in_worker(paths: List[str]) -> List[ParseResult]:
+    return [_worker_parser.parse_docx_safely(path, _worker_streaming) for path in paths]
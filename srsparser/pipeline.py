@@ -0,0 +1,315 @@
+import asyncio
+import json
+from abc import ABC, abstractmethod
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import IO, Any, AsyncIterable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from srsparser.corpus_index import CorpusIndex
+from srsparser.extractor import get_content
+from srsparser.language_processor import LanguageProcessor
+from srsparser.parser import Parser
+
+# document of the pipeline source: path to the .docx file, its content or a pair "document name" — "content"
+Source = Union[str, bytes, Tuple[str, Union[bytes, IO[bytes]]]]
+
+
+class PipelineResult(NamedTuple):
+    """
+    Result of processing a single document by the :py:class:`Pipeline`.
+    """
+    name: str
+    # filled sections tree structure (None if processing failed)
+    structure: Optional[dict]
+    # keywords and their TF-IDF weights (None if the keywords are not extracted or processing failed)
+    keywords: Optional[List[List[Tuple[str, float]]]] = None
+    # exception raised during processing (None if processing succeeded)
+    error: Optional[Exception] = None
+
+
+class PipelineStats:
+    """
+    Statistics of the :py:class:`Pipeline` run, updated while the pipeline is running.
+    """
+
+    def __init__(self):
+        self.received = 0
+        self.processed = 0
+        self.failed = 0
+        self.written = 0
+
+        # number of documents waiting for processing and results waiting for writing (sampled on each put)
+        self.input_queue_depth = 0
+        self.output_queue_depth = 0
+        self.max_input_queue_depth = 0
+        self.max_output_queue_depth = 0
+
+        self.start_time: Optional[float] = None
+        self.end_time: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        """
+        Time of the run in seconds.
+        """
+        if self.start_time is None:
+            return 0.0
+        end_time = self.end_time if self.end_time is not None else time.perf_counter()
+        return end_time - self.start_time
+
+    @property
+    def throughput(self) -> float:
+        """
+        Number of processed documents per second.
+        """
+        elapsed = self.elapsed
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return (f'{self.__class__.__name__}(received={self.received}, processed={self.processed}, '
+                f'failed={self.failed}, written={self.written}, elapsed={self.elapsed:.3f}, '
+                f'throughput={self.throughput:.2f}, max_input_queue_depth={self.max_input_queue_depth}, '
+                f'max_output_queue_depth={self.max_output_queue_depth})')
+
+
+class Sink(ABC):
+    """
+    Destination of the :py:class:`Pipeline` results. Subclasses implement `write` (and `close` if they hold
+    resources); both are called in the event loop, so blocking I/O should be run in an executor.
+    """
+
+    @abstractmethod
+    async def write(self, result: PipelineResult):
+        """
+        Writes the result of a processed document.
+        """
+
+    async def close(self):
+        """
+        Releases the resources of the sink after the last result is written.
+        """
+
+
+class MemorySink(Sink):
+    """
+    Sink keeping the results in the list `results`.
+    """
+
+    def __init__(self):
+        self.results: List[PipelineResult] = []
+
+    async def write(self, result: PipelineResult):
+        self.results.append(result)
+
+
+class JsonLinesSink(Sink):
+    """
+    Sink writing the results to the file in the JSON lines format: one object with the keys name, structure, keywords
+    and error (the error message) per line. The results are serialized and written in a thread of the default
+    executor, so the event loop is not blocked.
+    """
+
+    def __init__(self, path: str, skip_errors=False):
+        """
+        :param path: path to the file (overwritten).
+        :param skip_errors: True — results of failed documents are not written.
+        """
+        self.path = path
+        self.skip_errors = skip_errors
+        self._file = open(path, 'w', encoding='utf-8')
+
+    async def write(self, result: PipelineResult):
+        if result.error is not None and self.skip_errors:
+            return
+        record = {
+            'name': result.name,
+            'structure': result.structure,
+            'keywords': result.keywords,
+            'error': None if result.error is None else str(result.error),
+        }
+        await asyncio.get_running_loop().run_in_executor(None, self._write_record, record)
+
+    async def close(self):
+        await asyncio.get_running_loop().run_in_executor(None, self._file.close)
+
+    def _write_record(self, record: dict):
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+class Pipeline:
+    """
+    Asynchronous pipeline processing .docx documents: documents from the source are parsed (and their keywords are
+    extracted) in a pool of processes, and the results are written to the sink.
+
+    The source, the processing and the sink are connected by bounded queues: when the processes or the sink do not keep
+    up, reading of the source is suspended, so the number of documents in memory is bounded. The results are written
+    as soon as they are ready.
+    """
+
+    def __init__(self, sections_tree_template: dict, sink: Sink, corpus_index: Optional[CorpusIndex] = None,
+                 workers: Optional[int] = None, queue_size=16, streaming=False):
+        """
+        :param sections_tree_template: sections tree structure filled by the documents (see :py:class:`Parser`).
+        :param sink: destination of the results.
+        :param corpus_index: :py:class:`CorpusIndex` of the documents collection; if stated, the keywords of
+            the parsed documents with TF-IDF weights are extracted
+            (see :py:meth:`LanguageProcessor.get_structure_rationized_keywords`); each process initializes
+            its own pullenti SDK. The index is not changed by the pipeline: each document is weighted as if it were
+            added to the index (see :py:meth:`CorpusIndex.get_bows_tf_idf_pairs`), so the weights do not depend on
+            the order in which the documents are processed.
+        :param workers: number of processes (default: number of CPUs; 1 — process in a thread of the current process).
+        :param queue_size: maximum number of documents waiting for processing and of results waiting for writing.
+        :param streaming: read the documents incrementally (see :py:meth:`Parser.parse_docx`).
+        """
+        self.template = sections_tree_template
+        self.sink = sink
+        self.corpus_index = corpus_index
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.streaming = streaming
+        self.stats = PipelineStats()
+
+    async def run(self, source: Union[AsyncIterable[Source], Iterable[Source]]) -> PipelineStats:
+        """
+        Processes all documents of the source and closes the sink.
+
+        :param source: (asynchronous) iterable of the documents: paths to the .docx files (named by the file names),
+            their contents (named document_0, document_1, ...) or pairs "document name" — "content" (bytes or
+            a binary file object).
+        :return: statistics of the run.
+        """
+        self.stats = PipelineStats()
+        self.stats.start_time = time.perf_counter()
+
+        keywords = self.corpus_index is not None
+        part_of_speech = self.corpus_index.part_of_speech if keywords else ''
+        initargs = (self.template, self.streaming, keywords, part_of_speech)
+        if self.workers == 1:
+            executor = ThreadPoolExecutor(max_workers=1, initializer=_init_pipeline_worker, initargs=initargs)
+        else:
+            executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_pipeline_worker,
+                                           initargs=initargs)
+        # the keyphrases are lemmatized and weighted against the index in a thread, so the event loop is not blocked;
+        # one thread uses the index and its language processor (whose caches are not thread-safe)
+        keywords_executor = ThreadPoolExecutor(max_workers=1) if keywords else None
+
+        input_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        output_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        tasks = [asyncio.ensure_future(self._read(source, input_queue)),
+                 asyncio.ensure_future(self._process_all(executor, keywords_executor, input_queue, output_queue)),
+                 asyncio.ensure_future(self._write(output_queue))]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            executor.shutdown(wait=True)
+            if keywords_executor is not None:
+                keywords_executor.shutdown(wait=True)
+            await self.sink.close()
+            self.stats.end_time = time.perf_counter()
+        return self.stats
+
+    async def _read(self, source: Union[AsyncIterable[Source], Iterable[Source]], input_queue: asyncio.Queue):
+        if hasattr(source, '__aiter__'):
+            async for document in source:
+                await self._put_document(document, input_queue)
+        else:
+            for document in source:
+                await self._put_document(document, input_queue)
+
+        # one end marker per processing task
+        for _ in range(self.workers):
+            await input_queue.put(None)
+
+    async def _put_document(self, document: Source, input_queue: asyncio.Queue):
+        if isinstance(document, str):
+            name, content = os.path.basename(document), document
+        elif isinstance(document, (bytes, bytearray)):
+            name, content = f'document_{self.stats.received}', bytes(document)
+        else:
+            name, content = document
+            if hasattr(content, 'read'):
+                # file objects can not be sent to other processes; they are read in a thread, so the reading does not
+                # block the event loop
+                content = await asyncio.get_running_loop().run_in_executor(None, content.read)
+
+        await input_queue.put((name, content))
+        self.stats.received += 1
+        self.stats.input_queue_depth = input_queue.qsize()
+        self.stats.max_input_queue_depth = max(self.stats.max_input_queue_depth, self.stats.input_queue_depth)
+
+    async def _process_all(self, executor: Executor, keywords_executor: Optional[Executor], input_queue: asyncio.Queue,
+                           output_queue: asyncio.Queue):
+        await asyncio.gather(*[self._process(executor, keywords_executor, input_queue, output_queue)
+                               for _ in range(self.workers)])
+        await output_queue.put(None)
+
+    async def _process(self, executor: Executor, keywords_executor: Optional[Executor], input_queue: asyncio.Queue,
+                       output_queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await input_queue.get()
+            self.stats.input_queue_depth = input_queue.qsize()
+            if item is None:
+                return
+
+            name, content = item
+            try:
+                structure, keywords, bows = await loop.run_in_executor(executor, _process_in_worker, content)
+                result = PipelineResult(name, structure)
+                if self.corpus_index is not None:
+                    keywords = await loop.run_in_executor(keywords_executor, self._rationize_keywords, name, keywords,
+                                                          bows)
+                    result = result._replace(keywords=keywords)
+                self.stats.processed += 1
+            except Exception as e:
+                result = PipelineResult(name, None, error=e)
+                self.stats.failed += 1
+
+            await output_queue.put(result)
+            self.stats.output_queue_depth = output_queue.qsize()
+            self.stats.max_output_queue_depth = max(self.stats.max_output_queue_depth, self.stats.output_queue_depth)
+
+    def _rationize_keywords(self, name: str, keywords: List[str],
+                            bows: Dict[str, Dict[str, int]]) -> List[List[Tuple[str, float]]]:
+        tf_idf_pairs = self.corpus_index.get_bows_tf_idf_pairs(bows, document_name=name)
+        return self.corpus_index.nlp.rationize_keywords(keywords, tf_idf_pairs)
+
+    async def _write(self, output_queue: asyncio.Queue):
+        while True:
+            result = await output_queue.get()
+            self.stats.output_queue_depth = output_queue.qsize()
+            if result is None:
+                return
+            await self.sink.write(result)
+            self.stats.written += 1
+
+
+# parser and language processor of the current process of the pool used by Pipeline
+_worker_parser: Optional[Parser] = None
+_worker_language_processor: Optional[LanguageProcessor] = None
+_worker_corpus_index: Optional[CorpusIndex] = None
+_worker_streaming = False
+
+
+def _init_pipeline_worker(sections_tree_template: dict, streaming: bool, keywords: bool, part_of_speech: str):
+    global _worker_parser, _worker_language_processor, _worker_corpus_index, _worker_streaming
+    # one language processor (and one morphological analyzer) per process
+    language_processor = LanguageProcessor(init_pullenti=keywords)
+    _worker_parser = Parser(sections_tree_template, nlp=language_processor)
+    _worker_streaming = streaming
+    if keywords:
+        _worker_language_processor = language_processor
+        _worker_corpus_index = CorpusIndex(_worker_language_processor, part_of_speech)
+
+
+def _process_in_worker(content: Union[str, bytes]) -> Tuple[dict, Optional[List[str]], Optional[Dict[str, Any]]]:
+    structure = _worker_parser.parse_docx(content, _worker_streaming)
+    if _worker_language_processor is None:
+        return structure, None, None
+
+    keywords = _worker_language_processor.get_keywords_pullenti(get_content(structure))
+    bows = _worker_corpus_index.get_structure_bows(structure)
+    return structure, keywords, bows
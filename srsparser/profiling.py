@@ -0,0 +1,117 @@
+import time
+from typing import Callable, Dict, NamedTuple, Optional
+
+
+class StageStats(NamedTuple):
+    """
+    Number of calls and total time (in seconds) of a stage collected by the :py:class:`Profiler`.
+    """
+    calls: int
+    total_time: float
+
+
+class Profiler:
+    """
+    Collects the number of calls and the total time of the named stages of processing, for example:
+
+    >>> profiler = Profiler()
+    >>> with profiler.stage('tokenize'):
+    ...     ...
+    >>> profiler.get_stats()
+    {'tokenize': StageStats(calls=1, total_time=...)}
+
+    Stages may be nested; the time of a stage includes the time of the stages nested in it.
+    """
+    enabled = True
+
+    def __init__(self, callback: Optional[Callable[[str, float], None]] = None):
+        """
+        :param callback: function called after each stage with the stage name and its time in seconds.
+        """
+        self.callback = callback
+        self.calls: Dict[str, int] = {}
+        self.total_time: Dict[str, float] = {}
+
+    def stage(self, name: str) -> '_Stage':
+        """
+        Returns a context manager measuring the stage `name`.
+        """
+        return _Stage(self, name)
+
+    def record(self, name: str, seconds: float):
+        """
+        Adds a call of the stage `name` that took `seconds`.
+        """
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.total_time[name] = self.total_time.get(name, 0.0) + seconds
+        if self.callback is not None:
+            self.callback(name, seconds)
+
+    def get_stats(self) -> Dict[str, StageStats]:
+        """
+        Returns statistics of the stages in the order in which they first finished (nested stages finish first).
+        """
+        return {name: StageStats(calls, self.total_time[name]) for name, calls in self.calls.items()}
+
+    def reset(self):
+        """
+        Removes the collected statistics.
+        """
+        self.calls.clear()
+        self.total_time.clear()
+
+    def report(self) -> str:
+        """
+        Returns the collected statistics as a text table sorted by descending total time.
+        """
+        lines = [f'{"stage":<24}{"calls":>10}{"total, s":>12}{"per call, ms":>16}']
+        for name, stats in sorted(self.get_stats().items(), key=lambda item: -item[1].total_time):
+            lines.append(f'{name:<24}{stats.calls:>10}{stats.total_time:>12.3f}'
+                         f'{stats.total_time / stats.calls * 1000:>16.3f}')
+        return '\n'.join(lines)
+
+
+class NullProfiler(Profiler):
+    """
+    Profiler that does nothing. Used by default, so that disabled profiling costs a method call per stage.
+    """
+    enabled = False
+
+    def stage(self, name: str) -> '_NullStage':
+        return _NULL_STAGE
+
+    def record(self, name: str, seconds: float):
+        pass
+
+
+class _Stage:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler: Profiler, name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+# shared default profiler of the parsers and language processors
+NULL_PROFILER = NullProfiler()
@@ -1,52 +1,133 @@
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 
-from anytree import AnyNode, PreOrderIter, LevelOrderGroupIter
-from anytree.exporter import DictExporter
-from anytree.importer import DictImporter
-from anytree.search import find_by_attr
 
-importer = DictImporter()
-exporter = DictExporter()
-
-
-class Section(AnyNode):
+class Section:
     """
     Class representing section of text document.
+
+    Leaf sections have the attribute `text`, other sections have children. Other keys of the section dictionary
+    are stored in the dictionary `attributes` and can be read as attributes of the section (`section.key`), like
+    the attributes of the anytree nodes used before. Unlike the anytree nodes, sections have fixed slots, so new keys
+    are added to `attributes` (`section.attributes[key] = value`); they are exported by :py:meth:`SectionsTree.to_dict`.
     """
+    __slots__ = ('name', 'text', 'parent', 'children', 'depth', 'attributes', 'keys')
 
-    def __init__(self, name: str, parent=None, children=None, **kwargs):
-        super().__init__(parent, children, **kwargs)
+    def __init__(self, name: str, parent: Optional['Section'] = None, children: Optional[List['Section']] = None,
+                 **kwargs):
         self.name = name
+        if 'text' in kwargs:
+            self.text = kwargs.pop('text')
+        self.attributes: Dict[str, Any] = kwargs
+        # keys of the section dictionary in the original order (see SectionsTree.to_dict)
+        self.keys: List[str] = ['name'] + (['text'] if hasattr(self, 'text') else []) + list(kwargs)
+
         self.parent = parent
-        if children:
-            self.children = children
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.children: List['Section'] = []
+        if parent is not None:
+            parent.children.append(self)
+        for child in children or []:
+            child.parent = self
+            child.depth = self.depth + 1
+            self.children.append(child)
+
+    def __getattr__(self, key: str) -> Any:
+        # called only for the keys that are not slots (or unset slots)
+        try:
+            return Section.attributes.__get__(self)[key]
+        except (AttributeError, KeyError):
+            raise AttributeError(f'{self.__class__.__name__!r} object has no attribute {key!r}') from None
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(name={getattr(self, "name", None)!r})'
 
 
 class SectionsTree:
     """
     Class representing :py:class:`Section` tree structure.
+
+    The sections are stored in a flat list in the pre-order, so the leaf sections of any section are a contiguous
+    range of the leaf sections list. Sections are found by name using a dictionary (the first section in the pre-order
+    is used for repeated names).
     """
 
     def __init__(self, template: dict):
         """
-        :param template: section tree structure template.
+        :param template: section tree structure template (a dictionary or an object converted to it by `to_dict`,
+            e.g. :py:class:`BundledStructure`).
         """
-        self.root = importer.import_(template)
+        if not isinstance(template, dict):
+            template = template.to_dict()
+
+        # sections in the pre-order
+        self.sections: List[Section] = []
+        # leaf sections in the pre-order
+        self.leaves: List[Section] = []
+        # section index -> range of indices of its leaf sections in `leaves`
+        self.leaf_ranges: List[Tuple[int, int]] = []
+        # section name -> index of the first section with this name
+        self.name_index: Dict[Any, int] = {}
+
+        self.root = self._import(template, None)
         self.root_section_name = self.get_root_value(template)
 
+    def _import(self, data: dict, parent: Optional[Section]) -> Section:
+        attributes = {key: value for key, value in data.items() if key != 'children'}
+        section = Section(attributes.pop('name', None), parent, **attributes)
+        if 'name' not in data:
+            # invalid structure (see validate)
+            del section.name
+        section.keys = [key for key in data if key != 'children']
+
+        section_idx = len(self.sections)
+        self.sections.append(section)
+        self.leaf_ranges.append((len(self.leaves), len(self.leaves)))
+        if hasattr(section, 'name'):
+            try:
+                self.name_index.setdefault(section.name, section_idx)
+            except TypeError:  # unhashable name
+                pass
+        if hasattr(section, 'text'):
+            self.leaves.append(section)
+
+        for child in data.get('children', []):
+            self._import(child, section)
+        self.leaf_ranges[section_idx] = (self.leaf_ranges[section_idx][0], len(self.leaves))
+        return section
+
     def to_dict(self) -> dict:
-        # excludes leaf sections with empty text fields
-        for children in LevelOrderGroupIter(self.root):
-            for node in children:
-                if hasattr(node, 'text') and node.text == '':
-                    node.parent = None
-        return exporter.export(self.root)
+        """
+        Returns the section tree structure as a dictionary.
+        Leaf sections with empty text fields are excluded (the tree is not changed).
+        """
+        return self._export(self.root)
+
+    def _export(self, section: Section) -> dict:
+        data = {}
+        for key in section.keys:
+            if key == 'name':
+                data[key] = section.name
+            elif key == 'text':
+                data[key] = section.text
+            elif key in section.attributes:
+                data[key] = section.attributes[key]
+        if hasattr(section, 'text') and 'text' not in data:
+            data['text'] = section.text
+        # attributes set after the import
+        for key, value in section.attributes.items():
+            data.setdefault(key, value)
+
+        children = [self._export(child) for child in section.children
+                    if not (hasattr(child, 'text') and child.text == '')]
+        if children:
+            data['children'] = children
+        return data
 
     def get_all_sections(self) -> list:
         """
         Returns element list of the :py:class:`Section` tree structure.
         """
-        return [node for node in PreOrderIter(self.root)]
+        return list(self.sections)
 
     def get_leaf_sections(self, section_name='') -> list:
         """
@@ -58,16 +139,27 @@ class SectionsTree:
         if section_name == '':
             section_name = self.root_section_name
 
-        search_from_node = find_by_attr(self.root, name='name', value=section_name)
-        if search_from_node:
-            return [node for node in PreOrderIter(search_from_node, filter_=lambda n: hasattr(n, 'text'))]
-        return []
+        section_idx = self.get_section_idx(section_name)
+        if section_idx is None:
+            return []
+        start, end = self.leaf_ranges[section_idx]
+        return self.leaves[start:end]
+
+    def get_section_idx(self, section_name) -> Optional[int]:
+        """
+        Returns the index of the first (in the pre-order) section named `section_name` or None if there is no such
+        section.
+        """
+        try:
+            return self.name_index.get(section_name)
+        except TypeError:  # unhashable name
+            return None
 
     def get_section_names(self) -> List[str]:
         """
         Returns list of section names of the :py:class:`Section` tree structure.
         """
-        return [node.name for node in PreOrderIter(self.root)]
+        return [section.name for section in self.sections]
 
     def get_content(self, section_name='') -> str:
         """
@@ -79,7 +171,7 @@ class SectionsTree:
         if section_name == '':
             section_name = self.root_section_name
 
-        return ". ".join([node.text for node in self.get_leaf_sections(section_name)])
+        return ". ".join([section.text for section in self.get_leaf_sections(section_name)])
 
     def validate(self) -> bool:
         """
@@ -87,12 +179,12 @@ class SectionsTree:
 
         :return: True - if valid, otherwise - False.
         """
-        for node in PreOrderIter(self.root):
-            if not hasattr(node, 'name'):
+        for section in self.sections:
+            if not hasattr(section, 'name'):
                 return False
-            if hasattr(node, 'text') and node.children:
+            if hasattr(section, 'text') and section.children:
                 return False
-            if not (hasattr(node, 'text') or node.children):
+            if not (hasattr(section, 'text') or section.children):
                 return False
         return True
 
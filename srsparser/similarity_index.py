@@ -0,0 +1,374 @@
+import bisect
+import heapq
+import json
+import math
+import zlib
+from collections import Counter
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import numpy
+
+from srsparser.language_processor import LanguageProcessor
+from srsparser.sections_tree import SectionsTree
+
+# modulus of the hash functions of MinHash (the largest prime number less than 2 ** 32)
+_MINHASH_PRIME = 4294967291
+# signature value of a section without words
+_MINHASH_EMPTY = numpy.iinfo(numpy.uint32).max
+# margin of the upper bounds of the similarity: a document is skipped only if its similarity is surely lower than
+# the current top-k similarities, so the rounding errors of the bounds do not change the result
+_BOUND_TOLERANCE = 1e-9
+
+
+class SimilarityIndex:
+    """
+    Similarity search index of the parsed documents collection.
+
+    For each indexed section of each document the index stores:
+
+    * MinHash signature of the set of word shingles; the signatures are split into bands and hashed into buckets
+      (locality-sensitive hashing), so near-duplicates are found among the documents sharing a bucket;
+    * bag of words in the inverted index "word -> documents"; documents are ranked by the cosine similarity of
+      TF-IDF vectors (lnc.ltc, see smart term-weighting triple notation: the document weights are normalized once
+      on insertion, the query weights use the current document frequencies). The documents of each word are kept
+      in the descending order of the weight (impact-ordered postings), so the search reads only the beginning of
+      the postings of a word once the other documents cannot reach the top-k (see :py:meth:`get_similar`).
+
+    Documents are added incrementally and the index can be saved to a JSON file.
+    """
+
+    def __init__(self, nlp: LanguageProcessor, section_names: Iterable[str] = ('',), part_of_speech='',
+                 num_perm=128, bands=32, shingle_size=2, seed=1):
+        """
+        :param nlp: language processor used to tokenize section contents.
+        :param section_names: names of the indexed sections ('' — the root section).
+        :param part_of_speech: part of speech acronym; if stated, all other parts of speech are excluded from
+            the section contents.
+        :param num_perm: number of hash functions of MinHash.
+        :param bands: number of bands of the MinHash signature (`num_perm` must be divisible by `bands`);
+            the more bands, the lower the similarity of the found candidates.
+        :param shingle_size: number of consecutive words of a shingle.
+        :param seed: seed of the hash functions (signatures of indices with different seeds are incompatible).
+        """
+        if num_perm % bands != 0:
+            raise ValueError(f'the number of hash functions ({num_perm}) is not divisible by the number of bands '
+                             f'({bands})')
+
+        self.nlp = nlp
+        self.section_names = list(section_names)
+        self.part_of_speech = part_of_speech
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.seed = seed
+
+        random_state = numpy.random.RandomState(seed)
+        self._hash_a = random_state.randint(1, 2 ** 31, size=num_perm).astype(numpy.uint64)
+        self._hash_b = random_state.randint(0, 2 ** 31, size=num_perm).astype(numpy.uint64)
+
+        # section name -> document name -> bag of words
+        self.bows: Dict[str, Dict[str, Dict[str, int]]] = {name: {} for name in self.section_names}
+        # section name -> word -> document name -> normalized weight of the word in the document (in the descending
+        # order of the weight, the postings changed since the last search are sorted by the next search)
+        self.postings: Dict[str, Dict[str, Dict[str, float]]] = {name: {} for name in self.section_names}
+        # section name -> word -> negative weights of the postings of the word (ascending, for the binary search)
+        self.impacts: Dict[str, Dict[str, List[float]]] = {name: {} for name in self.section_names}
+        # section name -> words whose postings are changed since the last sorting
+        self.unsorted: Dict[str, Set[str]] = {name: set() for name in self.section_names}
+        # section name -> document name -> MinHash signature
+        self.signatures: Dict[str, Dict[str, numpy.ndarray]] = {name: {} for name in self.section_names}
+        # section name -> band -> band of signature -> names of the documents
+        self.buckets: Dict[str, List[Dict[bytes, Set[str]]]] = {
+            name: [{} for _ in range(bands)] for name in self.section_names
+        }
+        self.document_names: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self.document_names)
+
+    def __contains__(self, document_name: str) -> bool:
+        return document_name in self.document_names
+
+    def add_documents(self, documents: Iterable[dict]):
+        """
+        Adds the parsed documents (dictionaries with the keys: name and structure) to the index.
+        """
+        for document in documents:
+            self.add_document(document['name'], document['structure'])
+
+    def add_document(self, document_name: str, structure: dict):
+        """
+        Adds the document structure to the index (replaces the document with the same name).
+        """
+        if document_name in self.document_names:
+            self.remove_document(document_name)
+
+        tree = SectionsTree(structure)
+        for section_name in self.section_names:
+            tokens = self.nlp.tokenize(tree.get_content(section_name), self.part_of_speech)
+            self._add_section(section_name, document_name, dict(Counter(tokens)), self.get_signature(tokens))
+        self.document_names.add(document_name)
+
+    def remove_document(self, document_name: str):
+        """
+        Removes the document from the index.
+        """
+        if document_name not in self.document_names:
+            raise ValueError(f'there are no objects named {document_name} in the document collection')
+
+        for section_name in self.section_names:
+            postings = self.postings[section_name]
+            unsorted = self.unsorted[section_name]
+            for token in self.bows[section_name].pop(document_name):
+                del postings[token][document_name]
+                if postings[token]:
+                    unsorted.add(token)
+                else:
+                    del postings[token]
+                    self.impacts[section_name].pop(token, None)
+                    unsorted.discard(token)
+
+            signature = self.signatures[section_name].pop(document_name)
+            for band, band_key in enumerate(self._get_band_keys(signature)):
+                buckets = self.buckets[section_name][band]
+                if band_key in buckets:
+                    buckets[band_key].discard(document_name)
+                    if not buckets[band_key]:
+                        del buckets[band_key]
+        self.document_names.remove(document_name)
+
+    def get_signature(self, tokens: List[str]) -> numpy.ndarray:
+        """
+        Returns MinHash signature of the set of shingles (`shingle_size` consecutive tokens) of the token list.
+        """
+        if not tokens:
+            return numpy.full(self.num_perm, _MINHASH_EMPTY, dtype=numpy.uint32)
+
+        size = min(self.shingle_size, len(tokens))
+        shingles = {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+        hashes = numpy.array([zlib.crc32(shingle.encode('utf-8')) for shingle in shingles], dtype=numpy.uint64)
+        values = (hashes[:, None] * self._hash_a + self._hash_b) % _MINHASH_PRIME
+        return values.min(axis=0).astype(numpy.uint32)
+
+    def get_duplicates(self, query: Union[str, dict], section_name='', threshold=0.8) -> List[Tuple[str, float]]:
+        """
+        Finds near-duplicates of the section of the document: documents whose estimated Jaccard similarity of
+        the sets of shingles is not less than `threshold`. Only the documents sharing at least one band of
+        the MinHash signature with the query are compared.
+
+        :param query: the name of an indexed document (the document itself is not returned) or a document structure.
+        :param section_name: the name of the indexed section (default: root section).
+        :return: list of pairs "document name — estimated Jaccard similarity" sorted by descending similarity.
+        """
+        self._check_section_name(section_name)
+        query_name, _, signature = self._get_query(query, section_name)
+        if signature[0] == _MINHASH_EMPTY:
+            return []
+
+        candidates: Set[str] = set()
+        for band, band_key in enumerate(self._get_band_keys(signature)):
+            candidates.update(self.buckets[section_name][band].get(band_key, ()))
+        candidates.discard(query_name)
+
+        signatures = self.signatures[section_name]
+        duplicates = []
+        for document_name in candidates:
+            similarity = float(numpy.count_nonzero(signatures[document_name] == signature)) / self.num_perm
+            if similarity >= threshold:
+                duplicates.append((document_name, similarity))
+        duplicates.sort(key=lambda item: (-item[1], item[0]))
+        return duplicates
+
+    def get_similar(self, query: Union[str, dict], section_name='', top_k=10) -> List[Tuple[str, float]]:
+        """
+        Finds the documents whose section is the most similar to the section of the query by the cosine similarity of
+        TF-IDF vectors.
+
+        The words of the query are visited from the rarest one, and the partial similarities of the visited documents
+        are accumulated (max-score pruning). Once the similarity of a document not visited yet cannot reach
+        the current top-k, only the beginning of the impact-ordered postings of the next words is read for
+        the new documents, and the accumulated documents that cannot reach the top-k are dropped, so the postings of
+        the frequent words are not read entirely. The similarities of the found documents are calculated again by all
+        words of the query, so the result is the same as the result of visiting all documents sharing words with
+        the query.
+
+        :param query: the name of an indexed document (the document itself is not returned) or a document structure.
+        :param section_name: the name of the indexed section (default: root section).
+        :param top_k: maximum number of the returned documents.
+        :return: list of pairs "document name — similarity" sorted by descending similarity.
+        """
+        self._check_section_name(section_name)
+        query_name, bow, _ = self._get_query(query, section_name)
+
+        postings = self.postings[section_name]
+        impacts = self.impacts[section_name]
+        num_docs = len(self.document_names)
+
+        query_weights = {}
+        for token, count in bow.items():
+            if token in postings:
+                idf = math.log(1 + num_docs / len(postings[token]))
+                query_weights[token] = (1 + math.log(count)) * idf
+        norm = math.sqrt(sum(weight ** 2 for weight in query_weights.values()))
+        if norm == 0 or top_k <= 0:
+            return []
+        query_weights = {token: weight / norm for token, weight in query_weights.items()}
+        self._sort_postings(section_name, query_weights)
+
+        tokens = sorted(query_weights, key=lambda token: len(postings[token]))
+        # bounds[i] — upper bound of the similarity of a document containing only the words tokens[i:]: the sum of
+        # the largest contributions of the words; the vectors are normalized, so it is also bounded by the norm of
+        # the rest of the query
+        bounds = [0.0] * (len(tokens) + 1)
+        contributions_sum = squares_sum = 0.0
+        for i in range(len(tokens) - 1, -1, -1):
+            contributions_sum -= query_weights[tokens[i]] * impacts[tokens[i]][0]
+            squares_sum += query_weights[tokens[i]] ** 2
+            bounds[i] = min(contributions_sum, math.sqrt(squares_sum))
+
+        # partial similarities of the documents that can reach the top-k
+        scores: Dict[str, float] = {}
+        # the k-th largest partial similarity (a lower bound of the k-th largest similarity)
+        threshold = -math.inf
+        # number of postings read since the last update of the threshold
+        changes = 0
+        for i, token in enumerate(tokens):
+            weight = query_weights[token]
+            token_postings = postings[token]
+            changes += len(token_postings)
+
+            # the new documents are read while their similarity can reach the threshold
+            if threshold == -math.inf:
+                min_weight = -math.inf
+                new_count = len(token_postings)
+            else:
+                min_weight = (threshold - bounds[i + 1] - _BOUND_TOLERANCE) / weight
+                new_count = bisect.bisect_right(impacts[token], -min_weight)
+            for document_name, document_weight in islice(token_postings.items(), new_count):
+                scores[document_name] = scores.get(document_name, 0.0) + weight * document_weight
+
+            # the rest of the postings only updates the accumulated documents
+            if new_count < len(token_postings):
+                if len(token_postings) - new_count < len(scores):
+                    for document_name, document_weight in islice(token_postings.items(), new_count, None):
+                        if document_name in scores:
+                            scores[document_name] += weight * document_weight
+                else:
+                    for document_name in scores:
+                        document_weight = token_postings.get(document_name)
+                        if document_weight is not None and document_weight < min_weight:
+                            scores[document_name] += weight * document_weight
+            scores.pop(query_name, None)
+
+            # the threshold is updated after reading at least half as many postings as the accumulated documents
+            if len(scores) >= top_k and changes * 2 >= len(scores):
+                changes = 0
+                values = numpy.fromiter(scores.values(), dtype=float, count=len(scores))
+                threshold = float(numpy.partition(values, len(values) - top_k)[len(values) - top_k])
+                # the documents are dropped if at least half of them cannot reach the threshold
+                min_score = threshold - bounds[i + 1] - _BOUND_TOLERANCE
+                if numpy.count_nonzero(values >= min_score) * 2 <= len(scores):
+                    scores = {document_name: score for document_name, score in scores.items() if score >= min_score}
+
+        if len(scores) >= top_k:
+            threshold = heapq.nlargest(top_k, scores.values())[-1]
+
+        # the partial similarities are summed in another order, so the similarities of the top-k are calculated again
+        # in the order of the query words
+        similarities = {}
+        for document_name, score in scores.items():
+            if score + _BOUND_TOLERANCE >= threshold:
+                similarity = 0.0
+                for token, weight in query_weights.items():
+                    document_weight = postings[token].get(document_name)
+                    if document_weight is not None:
+                        similarity += weight * document_weight
+                similarities[document_name] = similarity
+
+        return heapq.nsmallest(top_k, similarities.items(), key=lambda item: (-item[1], item[0]))
+
+    def save(self, path: str):
+        """
+        Saves the index to the JSON file.
+        """
+        documents = {
+            document_name: {
+                section_name: {
+                    'bow': self.bows[section_name][document_name],
+                    'signature': self.signatures[section_name][document_name].tolist(),
+                }
+                for section_name in self.section_names
+            }
+            for document_name in self.document_names
+        }
+        data = {
+            'section_names': self.section_names,
+            'part_of_speech': self.part_of_speech,
+            'num_perm': self.num_perm,
+            'bands': self.bands,
+            'shingle_size': self.shingle_size,
+            'seed': self.seed,
+            'documents': documents,
+        }
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str, nlp: LanguageProcessor) -> 'SimilarityIndex':
+        """
+        Loads the index from the JSON file created by :py:meth:`save`.
+        """
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+
+        index = cls(nlp, data['section_names'], data['part_of_speech'], data['num_perm'], data['bands'],
+                    data['shingle_size'], data['seed'])
+        for document_name, sections in data['documents'].items():
+            for section_name, section in sections.items():
+                signature = numpy.array(section['signature'], dtype=numpy.uint32)
+                index._add_section(section_name, document_name, section['bow'], signature)
+            index.document_names.add(document_name)
+        return index
+
+    def _add_section(self, section_name: str, document_name: str, bow: Dict[str, int], signature: numpy.ndarray):
+        self.bows[section_name][document_name] = bow
+
+        weights = {token: 1 + math.log(count) for token, count in bow.items()}
+        norm = math.sqrt(sum(weight ** 2 for weight in weights.values()))
+        postings = self.postings[section_name]
+        for token, weight in weights.items():
+            postings.setdefault(token, {})[document_name] = weight / norm
+        self.unsorted[section_name].update(weights)
+
+        self.signatures[section_name][document_name] = signature
+        if signature[0] != _MINHASH_EMPTY:
+            for band, band_key in enumerate(self._get_band_keys(signature)):
+                self.buckets[section_name][band].setdefault(band_key, set()).add(document_name)
+
+    def _sort_postings(self, section_name: str, tokens: Iterable[str]):
+        postings = self.postings[section_name]
+        unsorted = self.unsorted[section_name]
+        for token in tokens:
+            if token in unsorted:
+                items = sorted(postings[token].items(), key=lambda item: (-item[1], item[0]))
+                postings[token] = dict(items)
+                self.impacts[section_name][token] = [-weight for _, weight in items]
+                unsorted.remove(token)
+
+    def _get_band_keys(self, signature: numpy.ndarray) -> List[bytes]:
+        return [band.tobytes() for band in numpy.split(signature, self.bands)]
+
+    def _get_query(self, query: Union[str, dict],
+                   section_name: str) -> Tuple[Optional[str], Dict[str, int], numpy.ndarray]:
+        if isinstance(query, str):
+            if query not in self.document_names:
+                raise ValueError(f'there are no objects named {query} in the document collection')
+            return query, self.bows[section_name][query], self.signatures[section_name][query]
+
+        tokens = self.nlp.tokenize(SectionsTree(query).get_content(section_name), self.part_of_speech)
+        return None, dict(Counter(tokens)), self.get_signature(tokens)
+
+    def _check_section_name(self, section_name: str):
+        if section_name not in self.bows:
+            raise ValueError(f'the section {section_name!r} is not indexed')
@@ -0,0 +1,337 @@
+import json
+import mmap
+import struct
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy
+
+# signature at the start and at the end of a bundle file
+BUNDLE_MAGIC = b'SRSBNDL1'
+
+# sections of the documents in the pre-order: index of the section name in the name table, index of the section
+# following the subtree of the section (relative to the first section of the document) and offsets of the text
+# of the section in the file (-1 — the section has no text)
+SECTION_DTYPE = numpy.dtype([('name', '<u4'), ('end', '<u4'), ('text_start', '<i8'), ('text_end', '<i8')])
+
+# trailer of a bundle file: offset and length of the JSON header, signature
+_TRAILER = struct.Struct('<QQ8s')
+
+
+class StructureBundle:
+    """
+    Read-only collection of parsed document structures stored in a single binary file.
+
+    The file consists of the signature, the UTF-8 texts of the leaf sections of all documents (a contiguous blob),
+    the table of the sections of all documents (see `SECTION_DTYPE`), the JSON header (the section name table
+    interned across the documents and the positions of the documents in the section table) and the trailer.
+    The file is memory-mapped: the section table is read without copying, and only the texts of the requested
+    sections are decoded, so the content of a section of a document is read without deserializing the structures.
+
+    The bundle can be used instead of a list of the MongoDB collection objects by :py:class:`LanguageProcessor`,
+    :py:class:`CorpusIndex` and :py:func:`get_content`: it is a sequence of dictionaries with the keys name and
+    structure, whose structures are :py:class:`BundledStructure` objects.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: path to the bundle file created by :py:meth:`save`.
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise ValueError(f'{path} is not a structure bundle')
+
+        if len(self._mmap) < len(BUNDLE_MAGIC) + _TRAILER.size or self._mmap[:len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+            self.close()
+            raise ValueError(f'{path} is not a structure bundle')
+        header_offset, header_length, magic = _TRAILER.unpack_from(self._mmap, len(self._mmap) - _TRAILER.size)
+        if magic != BUNDLE_MAGIC:
+            self.close()
+            raise ValueError(f'{path} is not a structure bundle (the file is truncated)')
+        header = json.loads(self._mmap[header_offset:header_offset + header_length].decode('utf-8'))
+
+        self.section_names: List[str] = header['names']
+        # section name -> index in the name table
+        self.name_ids: Dict[str, int] = {name: name_id for name_id, name in enumerate(self.section_names)}
+        # document name, index of its first section and number of its sections
+        self.documents: List[Tuple[str, int, int]] = [tuple(document) for document in header['documents']]
+        # document name -> index of the first document with this name
+        self.document_index: Dict[str, int] = {}
+        for document_idx, (document_name, _, _) in enumerate(self.documents):
+            self.document_index.setdefault(document_name, document_idx)
+
+        self.sections = numpy.frombuffer(self._mmap, dtype=SECTION_DTYPE, count=header['sections_count'],
+                                         offset=header['sections_offset'])
+
+    def __enter__(self) -> 'StructureBundle':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def __contains__(self, document_name: str) -> bool:
+        return document_name in self.document_index
+
+    def __getitem__(self, document_idx: int) -> dict:
+        self._check_open()
+        return {'name': self.documents[document_idx][0], 'structure': BundledStructure(self, document_idx)}
+
+    def __iter__(self) -> Iterator[dict]:
+        for document_idx in range(len(self.documents)):
+            yield self[document_idx]
+
+    @property
+    def document_names(self) -> List[str]:
+        """
+        Names of the documents in the order of the bundle.
+        """
+        return [document_name for document_name, _, _ in self.documents]
+
+    @property
+    def closed(self) -> bool:
+        """
+        Whether the bundle is closed.
+        """
+        return self._mmap is None
+
+    def close(self):
+        """
+        Closes the memory-mapped file (structures of the bundle can not be read after that, ValueError is raised).
+        Closing a closed bundle has no effect.
+
+        The arrays returned by :py:attr:`BundledStructure.sections` are copies and stay valid. If views of
+        :py:attr:`sections` itself are still referenced, the file can not be unmapped yet: the bundle is closed anyway,
+        and the memory is unmapped when the last view is released.
+        """
+        if self._mmap is None:
+            return
+        # the section table refers to the mapped memory
+        self.sections = None
+        mapped, self._mmap = self._mmap, None
+        try:
+            mapped.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+    def _check_open(self):
+        if self._mmap is None:
+            raise ValueError(f'the structure bundle {self.path} is closed')
+
+    def get_structure(self, document_name: str) -> 'BundledStructure':
+        """
+        Returns the structure of the first document named `document_name`.
+        """
+        self._check_open()
+        if document_name not in self.document_index:
+            raise ValueError(f'there are no objects named {document_name} in the document collection')
+        return BundledStructure(self, self.document_index[document_name])
+
+    def get_content(self, document_name: str, section_name='') -> str:
+        """
+        Returns the text content of the section of the document (see :py:meth:`BundledStructure.get_content`).
+        """
+        return self.get_structure(document_name).get_content(section_name)
+
+    @classmethod
+    def save(cls, path: str, documents: Iterable[Union[dict, Tuple[str, dict]]],
+             template: Optional[dict] = None) -> 'StructureBundle':
+        """
+        Writes the document structures to the bundle file and opens it. The texts are written as the documents are
+        read, so only the section tables of the documents are kept in memory.
+
+        Only the names, the texts and the children of the sections are stored (other keys of the section
+        dictionaries are not).
+
+        :param path: path to the bundle file (overwritten).
+        :param documents: the MongoDB collection objects (dictionaries with the keys: name and structure) or pairs
+            "document name" — "structure".
+        :param template: sections tree structure template whose section names are put first in the name table.
+        :return: opened bundle.
+        """
+        section_names: Dict[str, int] = {}
+        if template is not None:
+            for section in _iter_preorder(template):
+                section_names.setdefault(section['name'], len(section_names))
+
+        header_documents = []
+        tables = []
+        sections_count = 0
+        with open(path, 'wb') as file:
+            file.write(BUNDLE_MAGIC)
+            for document in documents:
+                document_name, structure = ((document['name'], document['structure']) if isinstance(document, dict)
+                                            else document)
+                if not isinstance(structure, dict):
+                    structure = structure.to_dict()
+
+                table = _write_structure(file, structure, section_names)
+                header_documents.append((document_name, sections_count, len(table)))
+                tables.append(table)
+                sections_count += len(table)
+
+            # the section table is aligned for reading without copying
+            file.write(b'\0' * (-file.tell() % 8))
+            sections_offset = file.tell()
+            for table in tables:
+                file.write(table.tobytes())
+
+            header = {
+                'names': list(section_names),
+                'documents': header_documents,
+                'sections_offset': sections_offset,
+                'sections_count': sections_count,
+            }
+            header_offset = file.tell()
+            header_data = json.dumps(header, ensure_ascii=False).encode('utf-8')
+            file.write(header_data)
+            file.write(_TRAILER.pack(header_offset, len(header_data), BUNDLE_MAGIC))
+        return cls(path)
+
+    def get_text(self, section: numpy.void) -> Optional[str]:
+        """
+        Decodes the text of the row of the section table (None if the section has no text).
+        """
+        self._check_open()
+        if section['text_start'] < 0:
+            return None
+        return self._mmap[section['text_start']:section['text_end']].decode('utf-8')
+
+
+class BundledStructure:
+    """
+    Structure of a document of the :py:class:`StructureBundle` read on demand.
+    """
+    __slots__ = ('bundle', 'document_idx')
+
+    def __init__(self, bundle: StructureBundle, document_idx: int):
+        self.bundle = bundle
+        self.document_idx = document_idx
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(name={self.name!r})'
+
+    @property
+    def name(self) -> str:
+        """
+        The name of the document.
+        """
+        return self.bundle.documents[self.document_idx][0]
+
+    @property
+    def sections(self) -> numpy.ndarray:
+        """
+        Rows of the section table of the document in the pre-order (see `SECTION_DTYPE`). The rows are copied
+        from the mapped memory, so the array does not keep the file mapped and stays valid after the bundle is closed.
+        """
+        self.bundle._check_open()
+        _, first, count = self.bundle.documents[self.document_idx]
+        return self.bundle.sections[first:first + count].copy()
+
+    def get_section_names(self) -> List[str]:
+        """
+        Returns list of section names of the structure in the pre-order.
+        """
+        return [self.bundle.section_names[name_id] for name_id in self.sections['name']]
+
+    def get_content(self, section_name='') -> str:
+        """
+        Returns the text content of the section like :py:meth:`SectionsTree.get_content`: texts of the leaf sections
+        of the first (in the pre-order) section named `section_name` joined by ". " ('' if there is no such section).
+        Only the texts of the section are decoded.
+
+        :param section_name: the name of the section (default: root section).
+        """
+        sections = self.sections
+        if len(sections) == 0:
+            return ''
+
+        if section_name == '':
+            section_idx = 0
+        else:
+            name_id = self.bundle.name_ids.get(section_name)
+            if name_id is None:
+                return ''
+            indices = numpy.flatnonzero(sections['name'] == name_id)
+            if len(indices) == 0:
+                return ''
+            section_idx = int(indices[0])
+
+        subtree = sections[section_idx:sections[section_idx]['end']]
+        leaves = subtree[subtree['text_start'] >= 0]
+        return '. '.join(self.bundle.get_text(leaf) for leaf in leaves)
+
+    def to_dict(self) -> dict:
+        """
+        Returns the structure as a dictionary (sections have the keys name and text or children).
+        """
+        sections = self.sections
+        if len(sections) == 0:
+            return {}
+
+        names = self.bundle.section_names
+        root = None
+        # sections whose subtrees are being read: (index following the subtree, section dictionary)
+        stack: List[Tuple[int, dict]] = []
+        for section_idx, section in enumerate(sections):
+            while stack and stack[-1][0] <= section_idx:
+                stack.pop()
+
+            data = {'name': names[section['name']]}
+            text = self.bundle.get_text(section)
+            if text is not None:
+                data['text'] = text
+            if stack:
+                stack[-1][1].setdefault('children', []).append(data)
+            else:
+                root = data
+            stack.append((int(section['end']), data))
+        return root
+
+
+def _iter_preorder(structure: dict) -> Iterator[dict]:
+    stack = [structure]
+    while stack:
+        section = stack.pop()
+        yield section
+        stack.extend(reversed(section.get('children', [])))
+
+
+def _write_structure(file, structure: dict, section_names: Dict[str, int]) -> numpy.ndarray:
+    # writes the texts of the sections of the structure and returns its section table
+    rows = []
+    if not structure:
+        return numpy.array(rows, dtype=SECTION_DTYPE)
+
+    # indices of the rows of the sections whose subtrees are being written
+    stack: List[int] = []
+
+    def close_subtrees(depth: int):
+        while len(stack) > depth:
+            rows[stack.pop()][1] = len(rows)
+
+    # depth-first traversal keeping the depth of each section
+    pending = [(structure, 0)]
+    while pending:
+        section, depth = pending.pop()
+        close_subtrees(depth)
+
+        text_start = text_end = -1
+        if 'text' in section:
+            text_start = file.tell()
+            file.write(section['text'].encode('utf-8'))
+            text_end = file.tell()
+
+        name_id = section_names.setdefault(section['name'], len(section_names))
+        stack.append(len(rows))
+        rows.append([name_id, 0, text_start, text_end])
+        pending.extend((child, depth + 1) for child in reversed(section.get('children', [])))
+    close_subtrees(0)
+
+    return numpy.array([tuple(row) for row in rows], dtype=SECTION_DTYPE)
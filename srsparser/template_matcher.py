@@ -0,0 +1,119 @@
+import math
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from srsparser import configs
+from srsparser.language_processor import LanguageProcessor
+from srsparser.sections_tree import SectionsTree
+
+
+class TemplateMatcher:
+    """
+    Compiled form of the leaf sections of a template.
+
+    Leaf section names are tokenized once, and the inverted index "lemma -> leaf sections" allows to compare a text
+    only with the leaf sections sharing lemmas with it.
+    """
+
+    def __init__(self, sections_tree: SectionsTree, nlp: LanguageProcessor):
+        """
+        :param sections_tree: sections tree structure whose leaf sections are matched.
+        :param nlp: language processor used to tokenize leaf section names and matched texts.
+        """
+        self.nlp = nlp
+
+        self.leaves = sections_tree.get_leaf_sections()
+        self.leaf_lemmas: List[Set[str]] = [set(self.nlp.tokenize(leaf.name)) for leaf in self.leaves]
+
+        self.leaf_sizes: List[int] = [len(lemmas) for lemmas in self.leaf_lemmas]
+
+        # lemma -> indices of the leaf sections containing it
+        self.lemma_leaves: Dict[str, List[int]] = {}
+        for leaf_idx, lemmas in enumerate(self.leaf_lemmas):
+            for lemma in lemmas:
+                self.lemma_leaves.setdefault(lemma, []).append(leaf_idx)
+
+    def match(self, text: str) -> Tuple[float, Optional[int]]:
+        """
+        Finds the leaf section most similar to the text.
+        In case of equal ratios the last of the leaf sections is preferred.
+
+        :return: the similarity ratio and the index of the most similar leaf section
+            ((0.0, None) if the template has no leaf sections).
+        """
+        return self._match_lemmas(set(self.nlp.tokenize(text)))
+
+    def _match_lemmas(self, lemmas: Set[str]) -> Tuple[float, Optional[int]]:
+        if not self.leaves:
+            return 0.0, None
+
+        ratio, leaf_idx = self._match_candidates(lemmas, self.get_common_lemma_counts(lemmas), 0.0)
+        if leaf_idx is None:
+            # the text is completely separate from all leaf sections
+            return 0.0, len(self.leaves) - 1
+        return ratio, leaf_idx
+
+    def match_heading(self, text: str, min_ratio: Optional[float] = None) -> Tuple[float, Optional[int]]:
+        """
+        Finds the leaf section most similar to the text like :py:meth:`match`, if its similarity ratio is not less
+        than `min_ratio`. The text is compared only with the leaf sections sharing lemmas with it and long enough to
+        reach `min_ratio`, so most texts that are not headings are rejected without calculating ratios.
+
+        :param min_ratio: minimum similarity ratio (default: MIN_SIMILARITY_RATIO).
+        :return: the similarity ratio and the index of the most similar leaf section
+            ((0.0, None) if the ratio is less than `min_ratio`).
+        """
+        return self.match_heading_lemmas(set(self.nlp.tokenize(text)), min_ratio)
+
+    def match_heading_lemmas(self, lemmas: Set[str], min_ratio: Optional[float] = None) -> Tuple[float, Optional[int]]:
+        """
+        Finds the leaf section most similar to the text like :py:meth:`match_heading`, but takes the lemma set of
+        the text (see :py:meth:`LanguageProcessor.tokenize`), so a text tokenized once can be matched with several
+        templates.
+        """
+        if min_ratio is None:
+            min_ratio = configs.MIN_SIMILARITY_RATIO
+        if min_ratio <= 0:
+            return self._match_lemmas(lemmas)
+
+        counts = self.get_common_lemma_counts(lemmas)
+        if not counts:
+            return 0.0, None
+
+        ratio, leaf_idx = self._match_candidates(lemmas, counts, min_ratio)
+        if leaf_idx is None or ratio < min_ratio:
+            return 0.0, None
+        return ratio, leaf_idx
+
+    def get_common_lemma_counts(self, lemmas: Iterable[str]) -> Dict[int, int]:
+        """
+        Returns the number of common lemmas of the lemma set and each leaf section name sharing at least one lemma.
+
+        :return: dictionary containing pairs like "leaf section index" — "number of common lemmas".
+        """
+        counts: Dict[int, int] = {}
+        for lemma in lemmas:
+            for leaf_idx in self.lemma_leaves.get(lemma, ()):
+                counts[leaf_idx] = counts.get(leaf_idx, 0) + 1
+        return counts
+
+    def _match_candidates(self, lemmas: Set[str], counts: Dict[int, int],
+                          min_ratio: float) -> Tuple[float, Optional[int]]:
+        size = len(lemmas)
+        best_ratio, best_leaf_idx = 0.0, None
+        for leaf_idx, common in counts.items():
+            leaf_size = self.leaf_sizes[leaf_idx]
+            # the ratio does not exceed sqrt(min size / max size) (the tolerance covers rounding errors)
+            if min_ratio > 0 and math.sqrt(min(leaf_size, size) / max(leaf_size, size)) < min_ratio - 1e-9:
+                continue
+            # the same operations as in LanguageProcessor.strings_similarity, so the ratios are equal
+            ratio = common / (leaf_size * size) ** 0.5
+            if ratio > best_ratio or (ratio == best_ratio and best_leaf_idx is not None and leaf_idx > best_leaf_idx):
+                best_ratio, best_leaf_idx = ratio, leaf_idx
+        return best_ratio, best_leaf_idx
+
+    def get_best_leaf_idx(self, text: str) -> Optional[int]:
+        """
+        Returns the index of the leaf section most similar to the text (see :py:meth:`match`)
+        or None if the template has no leaf sections.
+        """
+        return self.match(text)[1]
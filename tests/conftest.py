@@ -0,0 +1,55 @@
+import os
+import sys
+
+import pytest
+
+# the tests check the working tree, not the installed package; the fixtures are generated by the benchmark generators
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'benchmarks'))
+
+from synthetic import GOST_TEMPLATE, make_collection, make_docx  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def template() -> dict:
+    return GOST_TEMPLATE
+
+
+@pytest.fixture(scope='session')
+def nlp():
+    from srsparser import LanguageProcessor
+
+    return LanguageProcessor(init_pullenti=False)
+
+
+@pytest.fixture(scope='session')
+def pullenti_nlp():
+    from srsparser import LanguageProcessor
+
+    return LanguageProcessor(keywords_cache_size=100)
+
+
+@pytest.fixture(scope='session')
+def collection():
+    return make_collection(20, sentences_per_section=4)
+
+
+@pytest.fixture(scope='session')
+def docx_paths(tmp_path_factory):
+    """
+    Synthetic .docx technical assignments: plain, table-heavy and with large tables.
+    """
+    tmp_dir = tmp_path_factory.mktemp('docx')
+    parameters = [
+        {'paragraphs_per_section': 3, 'table_density': 0.0},
+        {'paragraphs_per_section': 3, 'table_density': 0.2},
+        {'paragraphs_per_section': 2, 'table_density': 0.9},
+        {'paragraphs_per_section': 2, 'table_density': 0.5, 'table_rows': 8, 'table_cols': 4},
+    ]
+    paths = []
+    for seed, kwargs in enumerate(parameters):
+        path = str(tmp_dir / f'document_{seed}.docx')
+        make_docx(path, GOST_TEMPLATE, seed=seed, **kwargs)
+        paths.append(path)
+    return paths
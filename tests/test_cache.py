@@ -0,0 +1,199 @@
+import copy
+import io
+
+from srsparser import LRUCache, Parser, SQLiteCache, configs, get_hash, get_stream_hash
+
+from synthetic import SENTENCES
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+
+    assert 'b' not in cache
+    assert cache.items() == [('a', 1), ('c', 3)]
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert cache.get('b') is None
+    assert cache.misses == 1
+
+
+def test_lru_cache_disabled():
+    cache = LRUCache(0)
+    cache.put('a', 1)
+    assert len(cache) == 0
+    assert cache.get('a') is None
+
+
+def test_lru_cache_save_load(tmp_path):
+    cache = LRUCache()
+    cache.put('слово', ['слово', 'NOUN'])
+    cache.put('и', ['и', 'CONJ'])
+    path = str(tmp_path / 'cache.json')
+    cache.save(path)
+
+    loaded = LRUCache()
+    loaded.load(path)
+    assert loaded.items() == cache.items()
+
+
+def test_morph_cache_does_not_change_tokens():
+    from srsparser import LanguageProcessor
+
+    uncached = LanguageProcessor(init_pullenti=False, morph_cache_size=0)
+    cached = LanguageProcessor(init_pullenti=False, morph_cache_size=10)
+    for part_of_speech in ('', 'NOUN'):
+        for sentence in SENTENCES:
+            expected = uncached.tokenize(sentence, part_of_speech)
+            assert cached.tokenize(sentence, part_of_speech) == expected
+            # the second time the words are analyzed from the cache
+            assert cached.tokenize(sentence, part_of_speech) == expected
+
+    assert len(uncached.morph_cache) == 0
+    assert len(cached.morph_cache) == 10
+    assert cached.morph_cache.hits > 0
+
+
+def test_morph_cache_save_load(tmp_path):
+    from srsparser import LanguageProcessor
+
+    path = str(tmp_path / 'morph_cache.json')
+    nlp = LanguageProcessor(init_pullenti=False, morph_cache_path=path)
+    expected = [nlp.tokenize(sentence) for sentence in SENTENCES]
+    nlp.save_morph_cache()
+
+    loaded = LanguageProcessor(init_pullenti=False, morph_cache_path=path)
+    assert len(loaded.morph_cache) == len(nlp.morph_cache)
+    assert [loaded.tokenize(sentence) for sentence in SENTENCES] == expected
+    assert loaded.morph_cache.misses == 0
+
+
+def test_sqlite_cache_persists_entries(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    cache = SQLiteCache(path, maxsize=2)
+    cache.put('a', {'name': 'a'})
+    cache.put('b', [1, 2])
+    assert cache.get('a') == {'name': 'a'}
+    cache.put('c', 'c')
+    assert 'b' not in cache
+
+    reopened = SQLiteCache(path)
+    assert reopened.get('a') == {'name': 'a'}
+    assert reopened.get('c') == 'c'
+    assert len(reopened) == 2
+
+
+def test_stream_hash_restores_position(tmp_path):
+    content = bytes(range(256)) * 100
+    path = str(tmp_path / 'file.bin')
+    with open(path, 'wb') as file:
+        file.write(content)
+
+    assert get_stream_hash(path, block_size=1000) == get_hash(content)
+    file = io.BytesIO(content)
+    file.seek(10)
+    assert get_stream_hash(file, block_size=7) == get_hash(content[10:])
+    assert file.tell() == 10
+
+
+def test_parse_docx_cache(template, docx_paths, monkeypatch):
+    cache = LRUCache()
+    parser = Parser(template, cache=cache)
+    expected = Parser(template).parse_docx(docx_paths[0])
+
+    assert parser.parse_docx(docx_paths[0]) == expected
+    assert cache.misses == 1
+    with open(docx_paths[0], 'rb') as file:
+        assert parser.parse_docx(file) == expected
+        assert file.tell() == 0
+        content = file.read()
+    assert parser.parse_docx(content) == expected
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    # the cached structures are not shared by the results
+    parser.parse_docx(docx_paths[0])['name'] = 'changed'
+    assert parser.parse_docx(docx_paths[0]) == expected
+
+    # the structure depends on the matching settings
+    monkeypatch.setattr(configs, 'MIN_SIMILARITY_RATIO', 0.9)
+    parser.parse_docx(docx_paths[0])
+    assert cache.misses == 2
+    monkeypatch.setattr(configs, 'NUMBERING_PATTERN', r'^(\d[.) ])+')
+    parser.parse_docx(docx_paths[0])
+    assert cache.misses == 3
+
+
+def test_heading_cache_save_load(template, docx_paths, tmp_path):
+    path = str(tmp_path / 'heading_cache.json')
+    parser = Parser(template, heading_cache_path=path)
+    expected = [parser.parse_docx(docx_path) for docx_path in docx_paths[:2]]
+    parser.save_heading_cache()
+
+    loaded = Parser(template, heading_cache_path=path)
+    assert loaded.heading_cache.items() == parser.heading_cache.items()
+    assert [loaded.parse_docx(docx_path) for docx_path in docx_paths[:2]] == expected
+    assert loaded.heading_cache.misses == 0
+
+
+def test_heading_cache_invalidation(template, docx_paths, tmp_path, monkeypatch):
+    path = str(tmp_path / 'heading_cache.json')
+    parser = Parser(template)
+    parser.parse_docx(docx_paths[0])
+    parser.save_heading_cache(path)
+
+    # the matching is saved for another template
+    other_template = copy.deepcopy(template)
+    other_template['children'][0]['name'] += ' системы'
+    other = Parser(other_template)
+    assert not other.load_heading_cache(path)
+    assert len(other.heading_cache) == 0
+
+    # the matching is saved for another MIN_SIMILARITY_RATIO
+    monkeypatch.setattr(configs, 'MIN_SIMILARITY_RATIO', 0.9)
+    other = Parser(template)
+    assert not other.load_heading_cache(path)
+    assert len(other.heading_cache) == 0
+
+    # the cache of the parser is cleared when MIN_SIMILARITY_RATIO changes
+    expected = Parser(template, heading_cache_size=0).parse_docx(docx_paths[0])
+    assert parser.parse_docx(docx_paths[0]) == expected
+    assert parser.heading_cache_ratio == 0.9
+    other.parse_docx(docx_paths[0])
+    assert parser.heading_cache.items() == other.heading_cache.items()
+
+
+def test_results_cache_is_keyed_by_collection_order(collection, monkeypatch):
+    from srsparser import LanguageProcessor, language_processor
+
+    fingerprints = []
+    get_collection_fingerprint = language_processor.get_collection_fingerprint
+
+    def get_collection_fingerprint_counted(records):
+        fingerprints.append(len(records))
+        return get_collection_fingerprint(records)
+
+    monkeypatch.setattr(language_processor, 'get_collection_fingerprint', get_collection_fingerprint_counted)
+    uncached = LanguageProcessor(init_pullenti=False)
+    cached = LanguageProcessor(init_pullenti=False, results_cache=LRUCache())
+    keywords = ['СИСТЕМА', 'ПОДСИСТЕМА ОПЕРАТИВНОГО УЧЕТА', 'ОРГАНИЗАЦИЯ']
+    for nlp in (uncached, cached):
+        monkeypatch.setattr(nlp, 'get_structure_keywords_pullenti', lambda *args: keywords)
+
+    # a repeated document name: the first object in the collection order is used
+    duplicate = {'name': collection[0]['name'], 'structure': collection[1]['structure']}
+    document_name = collection[0]['name']
+    results = []
+    for documents in (collection + [duplicate], [duplicate] + collection, collection + [duplicate]):
+        fingerprints.clear()
+        expected = uncached.get_structure_rationized_keywords(documents, document_name)
+        assert cached.get_structure_rationized_keywords(documents, document_name) == expected
+        # the collection is hashed once for the keywords and the pairs
+        assert len(fingerprints) == 1
+
+        expected = uncached.get_structure_tf_idf_pairs(documents, document_name)
+        assert cached.get_structure_tf_idf_pairs(iter(documents), document_name) == expected
+        results.append(expected)
+    assert results[0] != results[1]
+    assert (cached.results_cache.hits, cached.results_cache.misses) == (4, 4)
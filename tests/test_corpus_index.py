@@ -0,0 +1,85 @@
+import pytest
+
+from srsparser import CorpusIndex
+
+SECTION_NAMES = ['', 'Требования к системе', 'Общие сведения', 'Требования к видам обеспечения', 'нет такого']
+
+
+@pytest.fixture(scope='module')
+def index(nlp, collection):
+    index = CorpusIndex(nlp)
+    index.add_documents(collection)
+    return index
+
+
+def to_dict(pairs) -> dict:
+    return {word: float(weight) for word, weight in pairs}
+
+
+@pytest.mark.parametrize('smartirs', ['ntc', 'lfc', 'nnu', 'ntn'])
+def test_tf_idf_pairs_are_equal_to_gensim_model(nlp, collection, index, smartirs):
+    for section_name in SECTION_NAMES:
+        for document in collection[:5]:
+            expected = nlp.get_structure_tf_idf_pairs(collection, document['name'], section_name, smartirs=smartirs)
+            pairs = index.get_tf_idf_pairs(document['name'], section_name, smartirs)
+            assert to_dict(pairs) == to_dict(expected)
+            # only the order of the pairs with equal weights may differ
+            assert [weight for _, weight in pairs] == [weight for _, weight in expected]
+
+
+def test_incremental_updates_are_equal_to_rebuilding(nlp, collection):
+    index = CorpusIndex(nlp)
+    index.add_documents(collection[:10])
+    index.remove_document(collection[0]['name'])
+    index.add_documents(collection[10:])
+    index.add_document(collection[0]['name'], collection[0]['structure'])
+
+    rebuilt = CorpusIndex(nlp)
+    rebuilt.add_documents(collection)
+    assert index.dfs == rebuilt.dfs
+    assert index.nnz == rebuilt.nnz
+    assert index.get_fingerprint() == rebuilt.get_fingerprint()
+    for document in collection[:3]:
+        assert index.get_tf_idf_pairs(document['name']) == rebuilt.get_tf_idf_pairs(document['name'])
+
+
+@pytest.mark.parametrize('smartirs', ['ntc', 'nnu'])
+def test_bows_tf_idf_pairs_are_equal_to_adding_document(nlp, collection, smartirs):
+    index = CorpusIndex(nlp)
+    index.add_documents(collection[:15])
+    dfs = {section_name: dict(dfs) for section_name, dfs in index.dfs.items()}
+
+    # a new document and a replaced one
+    for document in (collection[15], collection[0]):
+        bows = index.get_structure_bows(document['structure'])
+        pairs = {section_name: index.get_bows_tf_idf_pairs(bows, section_name, smartirs, document['name'])
+                 for section_name in SECTION_NAMES}
+        assert index.dfs == dfs
+
+        added = CorpusIndex(nlp)
+        added.add_documents(collection[:15])
+        added.add_document_bows(document['name'], bows)
+        for section_name in SECTION_NAMES:
+            assert pairs[section_name] == added.get_tf_idf_pairs(document['name'], section_name, smartirs)
+
+
+def test_save_load(nlp, collection, index, tmp_path):
+    path = str(tmp_path / 'index.json')
+    index.save(path)
+    loaded = CorpusIndex.load(path, nlp)
+
+    assert len(loaded) == len(index)
+    assert loaded.dfs == index.dfs
+    assert loaded.nnz == index.nnz
+    assert loaded.get_fingerprint() == index.get_fingerprint()
+    for document in collection[:3]:
+        for section_name in SECTION_NAMES:
+            assert loaded.get_tf_idf_pairs(document['name'], section_name) == \
+                index.get_tf_idf_pairs(document['name'], section_name)
+
+
+def test_unknown_document(index):
+    with pytest.raises(ValueError):
+        index.get_tf_idf_pairs('missing.docx')
+    with pytest.raises(ValueError):
+        index.remove_document('missing.docx')
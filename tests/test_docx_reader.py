@@ -0,0 +1,36 @@
+import io
+
+from docx import Document
+
+from srsparser import Parser, Profiler
+from srsparser.docx_reader import W_TC, iter_docx_paragraphs
+
+
+def test_iter_docx_paragraphs_is_equal_to_python_docx(template, docx_paths):
+    parser = Parser(template)
+    for path in docx_paths:
+        expected = [(paragraph.text, paragraph._p.getparent().tag == W_TC)
+                    for paragraph in parser.iter_paragraphs(Document(path))]
+        assert list(iter_docx_paragraphs(path)) == expected
+        with open(path, 'rb') as file:
+            assert list(iter_docx_paragraphs(file)) == expected
+    # the last documents contain tables
+    assert any(in_table for _, in_table in expected)
+
+
+def test_streaming_parse_is_equal_to_parse(template, docx_paths):
+    profiler = Profiler()
+    parser = Parser(template, profiler=profiler)
+    for path in docx_paths:
+        expected = parser.parse_docx(path)
+        assert parser.parse_docx(path, streaming=True) == expected
+        with open(path, 'rb') as file:
+            assert parser.parse_docx(io.BytesIO(file.read()), streaming=True) == expected
+
+    # the paragraphs are read one by one while the records are built
+    paragraphs = parser.read_paragraphs(docx_paths[0], streaming=True)
+    assert not isinstance(paragraphs, list)
+    calls = profiler.get_stats()['iter_paragraphs'].calls
+    next(paragraphs)
+    assert profiler.get_stats()['iter_paragraphs'].calls == calls + 1
+    paragraphs.close()
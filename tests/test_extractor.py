@@ -0,0 +1,97 @@
+import json
+import re
+
+import pytest
+
+from srsparser import SectionsTree, get_content, iter_contents, iter_named_contents
+from srsparser.extractor import may_contain_name
+
+STRUCTURE = {
+    'name': 'Техническое задание',
+    'children': [
+        {'name': 'Общие сведения', 'text': 'Полное наименование: «Учет» / "АИС"'},
+        {'name': 'Требования к функциям (задачам)', 'children': [
+            {'name': 'Ввод/вывод данных', 'text': 'Данные вводятся оператором'},
+            {'name': 'Символы 𝔸 и \\ в названии', 'text': 'Текст\nс переводом строки'},
+        ]},
+        {'name': 'Источники разработки', 'text': 'ГОСТ 34.602-89'},
+    ]
+}
+
+SECTION_NAMES = ['', 'Общие сведения', 'Требования к функциям (задачам)', 'Ввод/вывод данных',
+                 'Символы 𝔸 и \\ в названии', 'Источники разработки', 'нет такого', 'Общие']
+
+
+def escape_char(char: str, upper=False) -> str:
+    units = char.encode('utf-16-be')
+    escaped = ''.join(f'\\u{int.from_bytes(units[i:i + 2], "big"):04x}' for i in range(0, len(units), 2))
+    # the hex digits of the escapes in mixed case
+    return re.sub(r'[a-f]', lambda match: match.group().upper() if upper else match.group(), escaped)
+
+
+def dump_partially_escaped(structure: dict) -> str:
+    # every other letter is escaped, the case of the hex digits alternates
+    chars = []
+    letters = 0
+    in_escape = False
+    for char in json.dumps(structure, ensure_ascii=False):
+        if char.isalpha() and not in_escape:
+            letters += 1
+            if letters % 2:
+                char = escape_char(char, upper=letters % 4 == 1)
+        in_escape = char == '\\' and not in_escape
+        chars.append(char)
+    return ''.join(chars)
+
+
+def get_serializations(structure: dict) -> list:
+    escaped = json.dumps(structure)
+    return [
+        json.dumps(structure, ensure_ascii=False),
+        escaped,
+        re.sub(r'\\u([0-9a-f]{4})', lambda match: '\\u' + match.group(1).upper(), escaped),
+        # mixed-case surrogate pairs
+        re.sub(r'\\u([0-9a-f]{4})', lambda match: '\\u' + match.group(1)[:2].upper() + match.group(1)[2:], escaped),
+        # escaped slashes
+        json.dumps(structure, ensure_ascii=False).replace('/', '\\/'),
+        dump_partially_escaped(structure),
+    ]
+
+
+def test_serializations_are_valid():
+    for serialized in get_serializations(STRUCTURE):
+        assert json.loads(serialized) == STRUCTURE
+
+
+@pytest.mark.parametrize('section_name', SECTION_NAMES)
+def test_get_content_is_equal_to_sections_tree(section_name):
+    expected = SectionsTree(STRUCTURE).get_content(section_name)
+    assert get_content(STRUCTURE, section_name) == expected
+    assert get_content(SectionsTree(STRUCTURE), section_name) == expected
+    for serialized in get_serializations(STRUCTURE):
+        assert get_content(serialized, section_name) == expected
+        assert get_content(serialized.encode('utf-8'), section_name) == expected
+
+
+@pytest.mark.parametrize('section_name', SECTION_NAMES)
+def test_iter_contents_is_equal_to_sections_tree(collection, section_name):
+    records = [{'name': 'document', 'structure': STRUCTURE}] + collection[:5]
+    expected = [SectionsTree(record['structure']).get_content(section_name) for record in records]
+    assert list(iter_contents(records, section_name)) == expected
+
+    for serialize in (json.dumps, lambda record: json.dumps(record, ensure_ascii=False).replace('/', '\\/'),
+                      dump_partially_escaped):
+        serialized = [serialize(record) for record in records]
+        assert list(iter_contents(serialized, section_name)) == expected
+        assert list(iter_contents([record.encode('utf-8') for record in serialized], section_name)) == expected
+        assert list(iter_named_contents(serialized, section_name)) == \
+            [(record['name'], content) for record, content in zip(records, expected)]
+
+
+def test_may_contain_name_rejects_missing_names():
+    for serialized in get_serializations(STRUCTURE):
+        for data in (serialized, serialized.encode('utf-8')):
+            assert may_contain_name(data, 'Ввод/вывод данных')
+            assert not may_contain_name(data, 'нет такого')
+            # the name is a part of a string, not a string
+            assert not may_contain_name(data, 'Общие')
@@ -0,0 +1,183 @@
+import json
+import random
+
+import numpy
+import pytest
+from numpy import around
+
+from srsparser import LanguageProcessor, SectionsTree, configs
+
+from synthetic import SENTENCES
+
+
+def get_tf_idf_pairs_like_baseline(nlp, documents, part_of_speech='', smartirs='ntc'):
+    # TF-IDF pairs as they were built before the sparse matrix: from the gensim model, document by document
+    from gensim.corpora.dictionary import Dictionary
+    from gensim.models.tfidfmodel import TfidfModel
+
+    tokenized = [nlp.tokenize(document, part_of_speech) for document in documents]
+    dictionary = Dictionary(tokenized)
+    bow_corpus = [dictionary.doc2bow(doc, allow_update=True) for doc in tokenized]
+    tf_idf = TfidfModel(bow_corpus, smartirs=smartirs)
+
+    tf_idf_weights = []
+    for structure in tf_idf[bow_corpus]:
+        structure.sort(key=lambda item: item[1], reverse=True)
+        tf_idf_weights.append([[dictionary[id], numpy.float64(around(freq, decimals=3))] for id, freq in structure])
+    return tf_idf_weights
+
+
+@pytest.fixture(scope='module')
+def text() -> str:
+    # sentences separated by dots, semicolons, newlines and repeated spaces
+    rnd = random.Random(0)
+    separators = ['. ', '.\n', ';\n', '\n\n', '.  ', '... ', ' ;', '.\n  ']
+    return ''.join(rnd.choice(SENTENCES) + rnd.choice(separators) for _ in range(300))
+
+
+@pytest.fixture(scope='module')
+def contents(collection):
+    return [SectionsTree(document['structure']).get_content() for document in collection]
+
+
+@pytest.mark.parametrize('part_of_speech,smartirs', [('', 'ntc'), ('NOUN', 'ntc'), ('', 'lfc'), ('', 'nnu')])
+def test_tf_idf_pairs_are_equal_to_baseline(nlp, contents, part_of_speech, smartirs):
+    expected = get_tf_idf_pairs_like_baseline(nlp, contents, part_of_speech, smartirs)
+    assert nlp.get_tf_idf_pairs(contents, part_of_speech, smartirs) == expected
+
+
+def test_tf_idf_matrix(nlp, contents):
+    expected = get_tf_idf_pairs_like_baseline(nlp, contents)
+    matrix, vocabulary = nlp.get_tf_idf_matrix(contents)
+    assert matrix.shape == (len(contents), len(vocabulary))
+    for row, pairs in enumerate(expected):
+        dense = matrix.getrow(row).toarray()[0]
+        assert {vocabulary[i]: dense[i] for i in numpy.flatnonzero(dense)} == dict(pairs)
+
+    top_matrix, _ = nlp.get_tf_idf_matrix(contents, top_k=3)
+    assert all(count <= 3 for count in numpy.diff(top_matrix.indptr))
+
+
+def test_get_keywords_pullenti_is_a_static_method(pullenti_nlp):
+    keywords = LanguageProcessor.get_keywords_pullenti(SENTENCES[0])
+    assert keywords
+    assert pullenti_nlp.get_keywords_pullenti(SENTENCES[0]) == keywords
+    assert pullenti_nlp.get_cached_keywords_pullenti(SENTENCES[0]) == keywords
+
+
+def test_keywords_batch_analyzes_repeated_texts_once(pullenti_nlp, monkeypatch):
+    analyzed = []
+    get_keywords_pullenti = LanguageProcessor.get_keywords_pullenti
+
+    def get_keywords_pullenti_counted(text):
+        analyzed.append(text)
+        return get_keywords_pullenti(text)
+
+    monkeypatch.setattr(LanguageProcessor, 'get_keywords_pullenti', staticmethod(get_keywords_pullenti_counted))
+    texts = SENTENCES[1:4] * 3
+    expected = [get_keywords_pullenti(text) for text in texts]
+
+    nlp = LanguageProcessor(init_pullenti=False)
+    assert nlp.get_keywords_pullenti_batch(texts) == expected
+    assert sorted(analyzed) == sorted(SENTENCES[1:4])
+
+    analyzed.clear()
+    nlp = LanguageProcessor(init_pullenti=False, keywords_cache_size=10)
+    assert nlp.get_keywords_pullenti_batch(texts) == expected
+    assert nlp.get_keywords_pullenti_batch(texts) == expected
+    assert len(analyzed) == 3
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 100, 1000, 100000])
+def test_iter_sentences_is_equal_to_sentenize(nlp, text, chunk_size):
+    expected = nlp.sentenize(text)
+    assert len(expected) > 200
+    assert list(nlp.iter_sentences(text, chunk_size=chunk_size)) == expected
+    assert list(nlp.iter_sentences(text.splitlines(keepends=True), chunk_size=chunk_size)) == expected
+
+
+def test_iter_sentences_bounds_text_without_sentence_boundaries(nlp, monkeypatch):
+    import rusenttokenize
+
+    segmented_lengths = []
+    ru_sent_tokenize = rusenttokenize.ru_sent_tokenize
+
+    def ru_sent_tokenize_counted(text):
+        segmented_lengths.append(len(text))
+        return ru_sent_tokenize(text)
+
+    monkeypatch.setattr(rusenttokenize, 'ru_sent_tokenize', ru_sent_tokenize_counted)
+    text = ' '.join(SENTENCES[0] for _ in range(200))
+    sentences = list(nlp.iter_sentences(text, chunk_size=1000, max_tail_length=2000))
+
+    assert ' '.join(sentences) == text
+    assert max(segmented_lengths) <= 3000
+    # every character is segmented a bounded number of times
+    assert sum(segmented_lengths) <= 4 * len(text)
+
+
+def test_rationize_keywords_aggregations(nlp):
+    pairs = [['система', numpy.float64(0.5)], ['учёт', numpy.float64(0.2)], ['система', numpy.float64(0.1)]]
+    keywords = ['СИСТЕМА УЧЕТА', 'ОРГАНИЗАЦИЯ']
+    expected = {'sum': 0.7, 'mean': 0.35, 'max': 0.5}
+    for aggregation in configs.KEYPHRASE_AGGREGATIONS:
+        keywords_with_ratios = nlp.rationize_keywords(keywords, pairs, aggregation)
+        assert [keyword for keyword, _ in keywords_with_ratios] == ['СИСТЕМА УЧЕТА']
+        assert keywords_with_ratios[0][1] == pytest.approx(expected[aggregation])
+    with pytest.raises(ValueError):
+        nlp.rationize_keywords(keywords, pairs, 'median')
+
+
+@pytest.mark.parametrize('part_of_speech', ['', 'NOUN', 'VERB'])
+def test_tokenize_is_equal_to_word_list_methods(nlp, part_of_speech):
+    from gensim.utils import simple_preprocess
+
+    for sentence in SENTENCES:
+        words = nlp.remove_ru_stop_words(simple_preprocess(sentence, min_len=2, max_len=50, deacc=True))
+        assert nlp.get_words(sentence) == words
+        lemmas = nlp.lemmatize(words)
+        assert lemmas == [nlp.get_normal_form(word) for word in words]
+        if part_of_speech:
+            lemmas = nlp.exclude_all_except(lemmas, part_of_speech)
+        assert nlp.tokenize(sentence, part_of_speech) == lemmas
+
+
+@pytest.mark.parametrize('threshold,top_k', [(None, None), (0.2, None), (None, 2), (0.1, 3)])
+def test_similarity_matrix_is_equal_to_strings_similarity(nlp, template, threshold, top_k):
+    from synthetic import get_leaf_names
+
+    queries = SENTENCES + ['Требования к системе', '', 'Требования к системе']
+    candidates = get_leaf_names(template) + ['Требования', 'система']
+    matrix = nlp.similarity_matrix(queries, candidates, threshold, top_k).toarray()
+    assert matrix.shape == (len(queries), len(candidates))
+
+    for row, query in enumerate(queries):
+        ratios = [nlp.strings_similarity(query, candidate) for candidate in candidates]
+        kept = [column for column, ratio in enumerate(ratios) if ratio > 0 and (threshold is None or ratio >= threshold)]
+        if top_k is not None:
+            # of the equal ratios, the ones of the earlier candidates are preferred
+            kept = sorted(sorted(kept, key=lambda column: -ratios[column])[:top_k])
+        expected = [ratios[column] if column in kept else 0.0 for column in range(len(candidates))]
+        assert list(matrix[row]) == pytest.approx(expected, abs=0)
+
+
+def test_structures_similarities_are_dense_cosines(nlp, collection, contents):
+    section_name = 'Требования к системе'
+    similarities = nlp.get_structures_similarities(collection, section_name)
+    assert similarities.shape == (len(collection), len(collection))
+    assert numpy.allclose(similarities, similarities.T)
+
+    section_contents = [SectionsTree(document['structure']).get_content(section_name) for document in collection]
+    matrix, _ = nlp.get_tf_idf_matrix(section_contents, decimals=None)
+    dense = matrix.toarray()
+    norms = numpy.linalg.norm(dense, axis=1)
+    nonzero = norms > 0
+    assert nonzero.any()
+    dense[nonzero] /= norms[nonzero, None]
+    assert similarities == pytest.approx(dense @ dense.T)
+    assert numpy.diag(similarities)[nonzero] == pytest.approx(1.0)
+
+    # the JSON representations of the objects
+    records = [json.dumps(document, ensure_ascii=False) for document in collection]
+    assert nlp.get_structures_similarities(records, section_name) == pytest.approx(similarities)
+    assert nlp.get_structures_similarities(collection).shape == (len(contents), len(contents))
@@ -0,0 +1,26 @@
+import numpy
+from scipy.sparse import csr_matrix
+
+from srsparser.matrices import get_binary_cosine_similarities, get_binary_matrix
+
+
+def test_binary_cosine_similarities_are_equal_to_python_ratios():
+    # the set sizes whose products have square roots that differ in numpy.sqrt and in `x ** 0.5`
+    sizes = [(23, 127), (1, 2921), (3, 5), (7, 11)]
+    vocabulary = {}
+    token_sets = [set(range(size)) for size, _ in sizes]
+    other_sets = [set(range(3)) | set(range(1000, 1000 + other_size - 3)) for _, other_size in sizes]
+    other = get_binary_matrix([{str(token) for token in tokens} for tokens in other_sets], vocabulary)
+    # tokens missing in `other` are skipped, but they are counted in the sizes
+    matrix = get_binary_matrix([{str(token) for token in tokens} for tokens in token_sets], vocabulary, extend=False)
+
+    similarities = get_binary_cosine_similarities(matrix, numpy.array([len(s) for s in token_sets], dtype=float),
+                                                  other, numpy.array([len(s) for s in other_sets], dtype=float))
+    assert isinstance(similarities, csr_matrix)
+    dense = similarities.toarray()
+    for row, tokens in enumerate(token_sets):
+        for column, other_tokens in enumerate(other_sets):
+            common = len(tokens & other_tokens)
+            expected = common / float((len(tokens) * len(other_tokens)) ** 0.5) if common else 0.0
+            assert dense[row, column] == expected
+    assert dense[0, 0] == 3 / (23 * 127) ** 0.5 != 3 / numpy.sqrt(23 * 127)
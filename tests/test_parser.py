@@ -0,0 +1,211 @@
+import re
+
+import pytest
+from docx import Document
+
+from srsparser import MultiTemplateParser, Parser, SectionsTree, configs
+
+from synthetic import make_docx
+
+TEST_PROGRAM_TEMPLATE = {
+    'name': 'Программа и методика испытаний',
+    'children': [
+        {'name': 'Объект испытаний', 'text': ''},
+        {'name': 'Цель испытаний', 'text': ''},
+        {'name': 'Требования к программе', 'text': ''},
+        {'name': 'Средства и порядок испытаний', 'text': ''},
+        {'name': 'Общие сведения', 'text': ''},
+    ]
+}
+
+
+def get_cell_texts(doc) -> list:
+    # texts of all cells of all tables in the order the rule before the table cells index compared them
+    return [cell.text for table in doc.tables for row in table.rows for cell in row.cells]
+
+
+def is_table_element_by_cells(paragraph, cell_texts: list) -> bool:
+    # the rule before the table cells index: every cell of every table is compared with the paragraph
+    text = paragraph.text.strip()
+    for cell_text in cell_texts:
+        if cell_text.strip() == text:
+            return True
+    return False
+
+
+def parse_like_baseline(parser: Parser, path: str) -> dict:
+    """
+    Parses the document like the parser before the shared paragraph pre-pass: each strategy reads the paragraphs
+    itself, every paragraph is compared with every leaf section by strings_similarity and each found heading is
+    assigned to the last of the most similar leaf sections.
+    """
+    nlp = parser.nlp
+    doc = Document(path)
+    sections_tree = SectionsTree(parser.template)
+    leaves = sections_tree.get_leaf_sections()
+    cell_texts = get_cell_texts(doc)
+
+    def is_heading(text: str) -> bool:
+        return any(nlp.strings_similarity(leaf.name, text) >= configs.MIN_SIMILARITY_RATIO for leaf in leaves)
+
+    def fill_tree(sections: dict):
+        for heading, text in sections.items():
+            max_ratio = 0
+            text_parent = None
+            for leaf in leaves:
+                ratio = nlp.strings_similarity(leaf.name, heading)
+                if ratio >= max_ratio:
+                    max_ratio = ratio
+                    text_parent = leaf
+            if text_parent is not None:
+                text_parent.text = text.strip()
+
+    paragraphs = [(paragraph.text, is_table_element_by_cells(paragraph, cell_texts))
+                  for paragraph in parser.iter_paragraphs(doc)]
+
+    sections = {}
+    for text, in_table in paragraphs:
+        section = text.split(':', 1)
+        if len(section) > 1 and is_heading(section[0]) and not in_table and section[0] and section[1]:
+            sections[section[0]] = section[1].strip()
+    fill_tree(sections)
+
+    sections = {}
+    heading_text = ''
+    heading_paragraphs = []
+    for text, in_table in paragraphs:
+        if is_heading(text) and not in_table:
+            if heading_text and heading_paragraphs:
+                sections[heading_text] = ' '.join(heading_paragraphs)
+            heading_text = re.sub(configs.NUMBERING_PATTERN, '', text).strip()
+            heading_paragraphs.clear()
+        elif len(text) > 1:
+            paragraph = re.sub(configs.NUMBERING_PATTERN, '', text).strip()
+            if nlp.punct_at_end_pattern.match(paragraph) is None:
+                paragraph += '.'
+            heading_paragraphs.append(paragraph)
+    sections[heading_text] = ' '.join(heading_paragraphs)
+    fill_tree(sections)
+
+    return sections_tree.to_dict()
+
+
+@pytest.fixture(scope='module')
+def parser(template):
+    return Parser(template)
+
+
+def test_table_cells_index_classifies_paragraphs_like_cells_scan(parser, docx_paths):
+    for path in docx_paths:
+        doc = Document(path)
+        table_cells = parser.get_table_cells(doc)
+        cell_texts = get_cell_texts(doc)
+        paragraphs = list(parser.iter_paragraphs(doc))
+        assert paragraphs
+        for paragraph in paragraphs:
+            assert parser.is_table_element(paragraph, table_cells) == is_table_element_by_cells(paragraph, cell_texts)
+
+
+def test_table_cells_index_with_nested_tables_and_whitespaces(parser, tmp_path):
+    doc = Document()
+    doc.add_paragraph('Общие сведения')
+    doc.add_paragraph('  Значение  ')
+    table = doc.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = 'Значение'
+    table.cell(0, 1).text = ' Срок исполнения '
+    table.cell(1, 0).merge(table.cell(1, 1)).text = 'Объединенная ячейка'
+    nested = table.cell(0, 0).add_table(rows=1, cols=2)
+    nested.cell(0, 0).text = 'Вложенная ячейка'
+    doc.add_paragraph('Срок исполнения')
+    doc.add_paragraph('Вложенная ячейка')
+    path = str(tmp_path / 'tables.docx')
+    doc.save(path)
+
+    doc = Document(path)
+    table_cells = parser.get_table_cells(doc)
+    cell_texts = get_cell_texts(doc)
+    classes = [(paragraph.text, parser.is_table_element(paragraph, table_cells))
+               for paragraph in parser.iter_paragraphs(doc)]
+    assert classes == [(paragraph.text, is_table_element_by_cells(paragraph, cell_texts))
+                       for paragraph in parser.iter_paragraphs(doc)]
+    assert ('  Значение  ', True) in classes
+    assert ('Вложенная ячейка', False) in classes
+
+
+def test_parse_docx_is_equal_to_baseline(parser, docx_paths):
+    for path in docx_paths:
+        expected = parse_like_baseline(parser, path)
+        assert SectionsTree(expected).get_content()
+        assert parser.parse_docx(path) == expected
+        # the second time the headings are matched from the heading cache
+        assert parser.parse_docx(path) == expected
+
+
+def test_parse_docx_without_heading_cache_is_equal_to_baseline(template, docx_paths):
+    parser = Parser(template, heading_cache_size=0)
+    for path in docx_paths[:2]:
+        assert parser.parse_docx(path) == parse_like_baseline(parser, path)
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_parse_many_reports_errors_per_document(parser, docx_paths, tmp_path, ordered):
+    broken_path = str(tmp_path / 'broken.docx')
+    with open(broken_path, 'w', encoding='utf-8') as file:
+        file.write('not a .docx document')
+    paths = [docx_paths[0], broken_path, str(tmp_path / 'missing.docx'), docx_paths[1]]
+
+    results = list(parser.parse_many(paths, workers=2, ordered=ordered, chunksize=2))
+    if ordered:
+        assert [result.path for result in results] == paths
+    results = {result.path: result for result in results}
+    assert len(results) == len(paths)
+
+    for path in (docx_paths[0], docx_paths[1]):
+        assert results[path].error is None
+        assert results[path].structure == parser.parse_docx(path)
+    for path in (broken_path, str(tmp_path / 'missing.docx')):
+        result = results[path]
+        assert result.structure is None
+        assert isinstance(result.error, str) and result.error_type in result.error
+        assert 'Traceback' in result.traceback
+
+
+def test_parse_many_reads_paths_lazily(parser, docx_paths):
+    consumed = []
+
+    def iter_paths():
+        for i in range(100):
+            consumed.append(i)
+            yield docx_paths[0]
+
+    results = parser.parse_many(iter_paths(), workers=2, max_pending=2)
+    assert next(results).error is None
+    results.close()
+    assert len(consumed) <= 3
+
+
+def test_multi_template_parse_docx_is_equal_to_parser(template, docx_paths, tmp_path):
+    templates = {'technical assignment': template, 'test program': TEST_PROGRAM_TEMPLATE}
+    multi_parser = MultiTemplateParser(templates)
+    parsers = {name: Parser(template) for name, template in templates.items()}
+
+    test_program_path = str(tmp_path / 'test_program.docx')
+    make_docx(test_program_path, TEST_PROGRAM_TEMPLATE, paragraphs_per_section=2, table_density=0.0)
+    for path, best_name in [(docx_paths[0], 'technical assignment'), (docx_paths[1], 'technical assignment'),
+                            (test_program_path, 'test program')]:
+        matches = multi_parser.parse_docx(path)
+        assert sorted(match.template_name for match in matches) == sorted(templates)
+        coverages = [match.coverage for match in matches]
+        assert coverages == sorted(coverages, reverse=True)
+        for match in matches:
+            assert match.structure == parsers[match.template_name].parse_docx(path)
+
+        best = multi_parser.parse_best(path)
+        assert best == matches[0]
+        assert best.template_name == best_name
+        assert best.coverage == max(coverages) > 0
+
+
+def test_multi_template_parser_without_templates():
+    with pytest.raises(ValueError):
+        MultiTemplateParser({})
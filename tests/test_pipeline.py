@@ -0,0 +1,75 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from srsparser import CorpusIndex, JsonLinesSink, MemorySink, Parser, Pipeline, Sink
+
+from synthetic import make_docx
+
+
+def test_pipeline_results_are_equal_to_parse(template, docx_paths, tmp_path):
+    parser = Parser(template)
+    with open(docx_paths[1], 'rb') as file:
+        content = file.read()
+    source = [docx_paths[0], content, ('document.docx', open(docx_paths[2], 'rb')), str(tmp_path / 'missing.docx')]
+
+    sink = MemorySink()
+    stats = asyncio.run(Pipeline(template, sink, workers=1).run(source))
+    assert (stats.received, stats.processed, stats.failed, stats.written) == (4, 3, 1, 4)
+
+    results = {result.name: result for result in sink.results}
+    assert results['document_0.docx'].structure == parser.parse_docx(docx_paths[0])
+    assert results['document_1'].structure == parser.parse_docx(docx_paths[1])
+    assert results['document.docx'].structure == parser.parse_docx(docx_paths[2])
+    assert results['missing.docx'].structure is None and results['missing.docx'].error is not None
+
+
+def test_json_lines_sink(template, docx_paths, tmp_path):
+    path = str(tmp_path / 'results.jsonl')
+    asyncio.run(Pipeline(template, JsonLinesSink(path), workers=1).run(docx_paths[:2]))
+    with open(path, encoding='utf-8') as file:
+        records = [json.loads(line) for line in file]
+    assert [record['name'] for record in records] == ['document_0.docx', 'document_1.docx']
+    assert records[0]['structure'] == Parser(template).parse_docx(docx_paths[0])
+
+
+def test_pipeline_keywords_do_not_depend_on_order(template, pullenti_nlp, collection, tmp_path, monkeypatch):
+    # the keyphrases are weighted outside the thread of the event loop
+    threads = set()
+    rationize_keywords = Pipeline._rationize_keywords
+
+    def rationize_keywords_in_thread(pipeline, *args):
+        threads.add(threading.get_ident())
+        return rationize_keywords(pipeline, *args)
+
+    monkeypatch.setattr(Pipeline, '_rationize_keywords', rationize_keywords_in_thread)
+    corpus_index = CorpusIndex(pullenti_nlp)
+    corpus_index.add_documents(collection)
+    fingerprint = corpus_index.get_fingerprint()
+
+    # short documents, since the keywords are extracted by pullenti
+    paths = []
+    for seed in range(2):
+        paths.append(str(tmp_path / f'document_{seed}.docx'))
+        make_docx(paths[-1], template, paragraphs_per_section=1, table_density=0.0, seed=seed)
+
+    keywords = []
+    for order in (paths, paths[::-1]):
+        sink = MemorySink()
+        asyncio.run(Pipeline(template, sink, corpus_index=corpus_index, workers=1).run(order))
+        keywords.append({result.name: result.keywords for result in sink.results})
+    assert keywords[0] == keywords[1]
+    assert all(keywords[0].values())
+    assert corpus_index.get_fingerprint() == fingerprint
+    assert threads and threading.get_ident() not in threads
+
+
+
+def test_sink_without_write_can_not_be_created():
+    class IncompleteSink(Sink):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteSink()
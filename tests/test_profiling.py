@@ -0,0 +1,58 @@
+import pytest
+
+from srsparser import Parser, Profiler
+from srsparser.profiling import NULL_PROFILER, NullProfiler
+
+PARSE_STAGES = ['docx_load', 'iter_paragraphs', 'is_table_element', 'is_heading', 'tokenize', 'morphology', 'fill_tree',
+                'to_dict']
+
+
+def test_parse_docx_stages(template, docx_paths):
+    recorded = []
+    profiler = Profiler(callback=lambda name, seconds: recorded.append((name, seconds)))
+    parser = Parser(template, profiler=profiler)
+    structure = parser.parse_docx(docx_paths[1])
+
+    stats = profiler.get_stats()
+    for name in PARSE_STAGES:
+        assert stats[name].calls > 0
+        assert stats[name].total_time >= 0
+    # the callback is called after each stage
+    assert len(recorded) == sum(stage_stats.calls for stage_stats in stats.values())
+    assert {name for name, _ in recorded} == set(stats)
+    assert all(line.split()[0] in stats for line in profiler.report().splitlines()[1:])
+
+    # profiling does not change the output
+    assert Parser(template).parse_docx(docx_paths[1]) == structure
+    assert Parser(template, profiler=NULL_PROFILER).parse_docx(docx_paths[1]) == structure
+    assert NULL_PROFILER.get_stats() == {}
+
+
+def test_nested_stages():
+    profiler = Profiler()
+    with profiler.stage('outer'):
+        for _ in range(3):
+            with profiler.stage('inner'):
+                pass
+    stats = profiler.get_stats()
+    assert list(stats) == ['inner', 'outer']
+    assert (stats['outer'].calls, stats['inner'].calls) == (1, 3)
+    assert stats['outer'].total_time >= stats['inner'].total_time
+
+    # the stage is recorded if it raises
+    with pytest.raises(ValueError):
+        with profiler.stage('failed'):
+            raise ValueError
+    assert profiler.get_stats()['failed'].calls == 1
+
+    profiler.reset()
+    assert profiler.get_stats() == {}
+
+
+def test_null_profiler():
+    profiler = NullProfiler()
+    assert not profiler.enabled
+    with profiler.stage('tokenize'):
+        pass
+    profiler.record('tokenize', 1.0)
+    assert profiler.get_stats() == {}
@@ -0,0 +1,80 @@
+import copy
+
+import pytest
+
+from srsparser import SectionsTree
+
+STRUCTURE = {
+    'name': 'Техническое задание',
+    'id': 1,
+    'children': [
+        {'name': 'Общие сведения', 'text': 'Полное наименование системы', 'page': 2},
+        {'name': 'Требования к системе', 'children': [
+            {'name': 'Требования к системе в целом', 'children': [
+                {'text': 'Система должна быть надежной', 'name': 'Требования к надежности'},
+                {'name': 'Требования к безопасности', 'text': ''},
+                {'name': 'Общие сведения', 'text': 'Повторное название раздела'},
+            ]},
+            {'name': 'Требования к функциям (задачам)', 'text': 'Учет расчетов'},
+        ]},
+        {'name': 'Источники разработки', 'text': ''},
+    ]
+}
+
+
+def test_dict_round_trip():
+    tree = SectionsTree(copy.deepcopy(STRUCTURE))
+    assert tree.validate()
+    expected = copy.deepcopy(STRUCTURE)
+    del expected['children'][1]['children'][0]['children'][1]
+    del expected['children'][2]
+    structure = tree.to_dict()
+    assert structure == expected
+    # the keys are exported in the original order
+    assert list(structure) == ['name', 'id', 'children']
+    assert list(structure['children'][1]['children'][0]['children'][0]) == ['text', 'name']
+
+    # the tree is not changed by the export
+    assert tree.to_dict() == structure
+    assert SectionsTree(structure).to_dict() == structure
+    assert len(tree.get_all_sections()) == 9
+
+
+def test_extra_keys_are_attributes():
+    tree = SectionsTree(STRUCTURE)
+    root = tree.root
+    assert root.id == 1
+    assert root.attributes == {'id': 1}
+    assert root.children[0].page == 2
+    assert not hasattr(root, 'text')
+    with pytest.raises(AttributeError):
+        root.children[0].missing
+
+    root.attributes['author'] = 'Иванов'
+    assert root.author == 'Иванов'
+    assert tree.to_dict()['author'] == 'Иванов'
+
+
+def test_get_leaf_sections_and_content():
+    tree = SectionsTree(STRUCTURE)
+    assert [leaf.name for leaf in tree.get_leaf_sections()] == [
+        'Общие сведения', 'Требования к надежности', 'Требования к безопасности', 'Общие сведения',
+        'Требования к функциям (задачам)', 'Источники разработки']
+    assert [leaf.name for leaf in tree.get_leaf_sections('Требования к системе в целом')] == [
+        'Требования к надежности', 'Требования к безопасности', 'Общие сведения']
+
+    assert tree.get_content('Требования к системе') == \
+        'Система должна быть надежной. . Повторное название раздела. Учет расчетов'
+    assert tree.get_content() == tree.get_content('Техническое задание')
+    assert tree.get_content('нет такого') == ''
+    assert tree.get_leaf_sections('нет такого') == []
+
+    # of the sections with equal names, the first one in the pre-order is used
+    assert tree.get_content('Общие сведения') == 'Полное наименование системы'
+    assert [section.depth for section in tree.get_all_sections()][:4] == [0, 1, 1, 2]
+
+
+def test_validate():
+    assert not SectionsTree({'name': 'Техническое задание'}).validate()
+    assert not SectionsTree({'name': 'Раздел', 'children': [{'text': 'без названия'}]}).validate()
+    assert not SectionsTree({'name': 'Раздел', 'text': 'текст', 'children': [{'name': 'a', 'text': ''}]}).validate()
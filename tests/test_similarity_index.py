@@ -0,0 +1,105 @@
+import heapq
+import math
+
+import pytest
+
+from srsparser import SimilarityIndex
+
+from synthetic import make_zipf_collection
+
+
+def get_similar_by_all_postings(index: SimilarityIndex, query_name: str, section_name='', top_k=10) -> list:
+    # the search before the impact-ordered postings: all documents sharing words with the query are visited
+    postings = index.postings[section_name]
+    num_docs = len(index.document_names)
+
+    query_weights = {}
+    for token, count in index.bows[section_name][query_name].items():
+        if token in postings:
+            query_weights[token] = (1 + math.log(count)) * math.log(1 + num_docs / len(postings[token]))
+    norm = math.sqrt(sum(weight ** 2 for weight in query_weights.values()))
+    if norm == 0:
+        return []
+
+    scores = {}
+    for token, weight in query_weights.items():
+        weight /= norm
+        for document_name, document_weight in postings[token].items():
+            scores[document_name] = scores.get(document_name, 0.0) + weight * document_weight
+    scores.pop(query_name, None)
+    return heapq.nsmallest(top_k, scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+@pytest.fixture(scope='module')
+def zipf_collection():
+    return make_zipf_collection(300, vocabulary_size=2000, documents_per_topic=20)
+
+
+@pytest.fixture(scope='module')
+def index(nlp, collection):
+    index = SimilarityIndex(nlp, section_names=['', 'Требования к системе'])
+    index.add_documents(collection)
+    return index
+
+
+@pytest.fixture(scope='module')
+def zipf_index(nlp, zipf_collection):
+    index = SimilarityIndex(nlp)
+    index.add_documents(zipf_collection)
+    return index
+
+
+@pytest.mark.parametrize('top_k', [1, 3, 10, 1000])
+def test_get_similar_is_equal_to_visiting_all_postings(index, zipf_index, collection, zipf_collection, top_k):
+    for section_name in index.section_names:
+        for document in collection:
+            expected = get_similar_by_all_postings(index, document['name'], section_name, top_k)
+            assert index.get_similar(document['name'], section_name, top_k) == expected
+
+    for document in zipf_collection[:50]:
+        expected = get_similar_by_all_postings(zipf_index, document['name'], top_k=top_k)
+        assert expected
+        assert zipf_index.get_similar(document['name'], top_k=top_k) == expected
+
+
+def test_get_similar_by_structure(index, collection):
+    document = collection[0]
+    similar = index.get_similar(document['structure'], top_k=5)
+    assert similar[0][0] == document['name']
+    assert similar[1:] == index.get_similar(document['name'], top_k=4)
+    assert index.get_similar(document['name'], top_k=0) == []
+
+
+def test_get_similar_after_updates(nlp, zipf_collection):
+    index = SimilarityIndex(nlp)
+    index.add_documents(zipf_collection[:100])
+    index.get_similar(zipf_collection[0]['name'])
+    for document in zipf_collection[:50]:
+        index.remove_document(document['name'])
+    index.add_documents(zipf_collection[100:200])
+
+    for document in zipf_collection[50:200:10]:
+        expected = get_similar_by_all_postings(index, document['name'])
+        assert index.get_similar(document['name']) == expected
+
+
+def test_save_load(nlp, index, collection, tmp_path):
+    path = str(tmp_path / 'similarity_index.json')
+    index.save(path)
+    loaded = SimilarityIndex.load(path, nlp)
+
+    assert len(loaded) == len(index)
+    assert loaded.bows == index.bows
+    for document in collection[:5]:
+        for section_name in index.section_names:
+            assert loaded.get_similar(document['name'], section_name) == index.get_similar(document['name'],
+                                                                                             section_name)
+            assert loaded.get_duplicates(document['name'], section_name, threshold=0.5) == \
+                index.get_duplicates(document['name'], section_name, threshold=0.5)
+
+
+def test_unknown_document_and_section(index, collection):
+    with pytest.raises(ValueError):
+        index.get_similar('missing.docx')
+    with pytest.raises(ValueError):
+        index.get_similar(collection[0]['name'], 'Общие сведения')
@@ -0,0 +1,61 @@
+import numpy
+import pytest
+
+from srsparser import SectionsTree
+from srsparser.storage import StructureBundle
+
+SECTION_NAMES = ['', 'Требования к системе', 'Общие сведения', 'нет такого']
+
+
+@pytest.fixture
+def bundle(template, collection, tmp_path):
+    bundle = StructureBundle.save(str(tmp_path / 'structures.bundle'), collection, template)
+    yield bundle
+    bundle.close()
+
+
+def test_save_load(collection, bundle):
+    loaded = StructureBundle(bundle.path)
+    assert loaded.document_names == [document['name'] for document in collection]
+    for document, bundled in zip(collection, loaded):
+        assert bundled['name'] == document['name']
+        assert bundled['structure'].to_dict() == document['structure']
+        for section_name in SECTION_NAMES:
+            assert bundled['structure'].get_content(section_name) == \
+                SectionsTree(document['structure']).get_content(section_name)
+    loaded.close()
+
+
+def test_close_with_section_arrays(bundle, collection):
+    structure = bundle.get_structure(collection[0]['name'])
+    sections = structure.sections
+    names = structure.get_section_names()
+    table = bundle.sections[:10]
+
+    # a view of the section table is still referenced
+    bundle.close()
+    bundle.close()
+    assert bundle.closed
+    assert [bundle.section_names[name_id] for name_id in sections['name']] == names
+    assert len(table) == 10
+    del table
+
+    with pytest.raises(ValueError):
+        structure.get_content()
+    with pytest.raises(ValueError):
+        bundle.get_structure(collection[0]['name'])
+
+
+def test_context_manager(bundle):
+    with StructureBundle(bundle.path) as opened:
+        sections = opened[0]['structure'].sections
+    assert opened.closed
+    assert isinstance(sections, numpy.ndarray) and len(sections) > 0
+
+
+def test_not_a_bundle(tmp_path):
+    for data in (b'', b'not a bundle'):
+        path = tmp_path / 'file.bundle'
+        path.write_bytes(data)
+        with pytest.raises(ValueError):
+            StructureBundle(str(path))
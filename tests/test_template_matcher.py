@@ -0,0 +1,47 @@
+import pytest
+
+from srsparser import SectionsTree, TemplateMatcher, configs
+
+from synthetic import SENTENCES, get_leaf_names
+
+
+def match_by_strings_similarity(nlp, leaf_names: list, text: str):
+    # every leaf section is compared with the text; of the equal ratios, the last leaf section is preferred
+    best_ratio, best_leaf_idx = 0.0, None
+    for leaf_idx, leaf_name in enumerate(leaf_names):
+        ratio = nlp.strings_similarity(leaf_name, text)
+        if ratio >= best_ratio:
+            best_ratio, best_leaf_idx = ratio, leaf_idx
+    return best_ratio, best_leaf_idx
+
+
+@pytest.fixture(scope='module')
+def matcher(nlp, template):
+    return TemplateMatcher(SectionsTree(template), nlp)
+
+
+@pytest.fixture(scope='module')
+def texts(template) -> list:
+    leaf_names = get_leaf_names(template)
+    return (SENTENCES + leaf_names + [f'1.2 {name.upper()}' for name in leaf_names]
+            + [f'{name} и {SENTENCES[0]}' for name in leaf_names[:5]] + ['Требования', 'и', ''])
+
+
+def test_match_is_equal_to_strings_similarity(nlp, template, matcher, texts):
+    leaf_names = get_leaf_names(template)
+    assert [leaf.name for leaf in matcher.leaves] == leaf_names
+    for text in texts:
+        expected = match_by_strings_similarity(nlp, leaf_names, text)
+        assert matcher.match(text) == expected
+        assert matcher.get_best_leaf_idx(text) == expected[1]
+
+
+@pytest.mark.parametrize('min_ratio', [None, 0.3, 0.7, 1.0])
+def test_match_heading_is_equal_to_strings_similarity(nlp, template, matcher, texts, min_ratio):
+    leaf_names = get_leaf_names(template)
+    threshold = configs.MIN_SIMILARITY_RATIO if min_ratio is None else min_ratio
+    for text in texts:
+        ratio, leaf_idx = match_by_strings_similarity(nlp, leaf_names, text)
+        expected = (ratio, leaf_idx) if ratio >= threshold and ratio > 0 else (0.0, None)
+        assert matcher.match_heading(text, min_ratio) == expected
+        assert matcher.match_heading_lemmas(set(nlp.tokenize(text)), min_ratio) == expected